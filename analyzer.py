@@ -1,15 +1,46 @@
-import json
-from typing import Dict, List, Optional, Union
-from mavlink_definitions import (
-    MAVLinkDefinitions,
-    MAVLinkMessage,
-    get_all_mavlink_definitions,
+from typing import Dict, List, Optional
+from mavlink_analysis import LinkStatistics, RequestCorrelator, TransferReassembler
+from mavlink_definitions import get_all_mavlink_definitions, get_shared_definitions
+from mavlink_parser import (
+    ByteTimeIndex,
+    MAVLinkPacket,
+    MAVLinkParser,
+    PacketFilter,
+    PacketRenderer,
+    PayloadMode,
 )
-from mavlink_parser import MAVLink2Packet, MAVLink2Parser, ParseResult
-from saleae.analyzers import HighLevelAnalyzer, AnalyzerFrame, ChoicesSetting
+from mavlink_parser.filter import parse_id_list, parse_int_list
+from mavlink_parser.signing import (
+    SignatureStatus,
+    SignatureVerifier,
+    parse_signing_keys,
+)
+from saleae.analyzers import (
+    HighLevelAnalyzer,
+    AnalyzerFrame,
+    ChoicesSetting,
+    NumberSetting,
+    StringSetting,
+)
+from saleae.data import GraphTime, GraphTimeDelta
 
 MAVLINK_PACKET_TYPE = "MAVLink"
 MAVLINK_PACKET_FORMAT = "{{data.message}}"
+MAVLINK_SIGNATURE_ERROR_TYPE = "MAVLink signature error"
+MAVLINK_SIGNATURE_ERROR_FORMAT = "{{data.message}} ({{data.signature}} signature)"
+SIGNATURE_ERRORS = (SignatureStatus.INVALID, SignatureStatus.REPLAYED)
+MAVLINK_STATISTICS_TYPE = "MAVLink statistics"
+MAVLINK_STATISTICS_FORMAT = (
+    "{{data.stream}}: {{data.rate}}, {{data.bandwidth}}, {{data.drop_rate}} lost"
+)
+MAVLINK_REQUEST_TYPE = "MAVLink request"
+MAVLINK_REQUEST_FORMAT = "{{data.request}} {{data.kind}} {{data.round_trip}}"
+MAVLINK_TRANSFER_TYPE = "MAVLink transfer"
+MAVLINK_TRANSFER_FORMAT = (
+    "{{data.transfer}} {{data.result}}: {{data.received}} in {{data.duration}}"
+)
+MAVLINK_DEFINITIONS_TYPE = "MAVLink definitions"
+MAVLINK_DEFINITIONS_FORMAT = "{{data.conflicts}}"
 
 
 mavlink_definitions = sorted(get_all_mavlink_definitions())
@@ -20,18 +51,93 @@ class MAVLinkAnalyzer(HighLevelAnalyzer):
     definitions_setting = ChoicesSetting(
         label="Definitions File", choices=[NONE_SETTING] + mavlink_definitions
     )
+    additional_definitions_setting = ChoicesSetting(
+        label="Additional Definitions File",
+        choices=[NONE_SETTING] + mavlink_definitions,
+    )
+    payload_setting = ChoicesSetting(
+        label="Payload", choices=[mode.value for mode in PayloadMode]
+    )
+    include_messages_setting = StringSetting(label="Only Messages (ids or names)")
+    exclude_messages_setting = StringSetting(label="Skip Messages (ids or names)")
+    include_systems_setting = StringSetting(label="Only System IDs")
+    include_components_setting = StringSetting(label="Only Component IDs")
+    signing_keys_setting = StringSetting(
+        label="Signing Keys (hex or passphrases, empty to skip verification)"
+    )
+    statistics_setting = NumberSetting(
+        label="Statistics Interval (s), 0 to disable", min_value=0, max_value=3600
+    )
+    request_timeout_setting = NumberSetting(
+        label="Request Timeout (s), 0 to disable matching", min_value=0, max_value=60
+    )
+    transfer_timeout_setting = NumberSetting(
+        label="Transfer Idle Timeout (s), 0 to disable summaries",
+        min_value=0,
+        max_value=600,
+    )
     result_types: Dict[str, Dict[str, str]] = {
-        MAVLINK_PACKET_TYPE: {"format": MAVLINK_PACKET_FORMAT}
+        MAVLINK_PACKET_TYPE: {"format": MAVLINK_PACKET_FORMAT},
+        MAVLINK_SIGNATURE_ERROR_TYPE: {"format": MAVLINK_SIGNATURE_ERROR_FORMAT},
+        MAVLINK_STATISTICS_TYPE: {"format": MAVLINK_STATISTICS_FORMAT},
+        MAVLINK_REQUEST_TYPE: {"format": MAVLINK_REQUEST_FORMAT},
+        MAVLINK_TRANSFER_TYPE: {"format": MAVLINK_TRANSFER_FORMAT},
+        MAVLINK_DEFINITIONS_TYPE: {"format": MAVLINK_DEFINITIONS_FORMAT},
     }
 
     def __init__(self):
+        # The first dialect takes precedence over the additional one
+        dialects = list(
+            dict.fromkeys(
+                str(setting)
+                for setting in (
+                    self.definitions_setting,
+                    self.additional_definitions_setting,
+                )
+                if str(setting) != NONE_SETTING
+            )
+        )
         self.definitions = (
-            None
-            if str(self.definitions_setting) == NONE_SETTING
-            else MAVLinkDefinitions(str(self.definitions_setting))
+            get_shared_definitions(dialects, lazy=True) if dialects else None
+        )
+        # Conflicts between the dialects are shown once, on the first frame
+        self.conflicts_reported = self.definitions is None
+        packet_filter = PacketFilter(
+            include_messages=parse_id_list(str(self.include_messages_setting)),
+            exclude_messages=parse_id_list(str(self.exclude_messages_setting)),
+            include_systems=parse_int_list(str(self.include_systems_setting)),
+            include_components=parse_int_list(
+                str(self.include_components_setting)
+            ),
+        )
+        signing_keys = parse_signing_keys(str(self.signing_keys_setting))
+        self.parser = MAVLinkParser(
+            self.definitions,
+            packet_filter=packet_filter,
+            signature_verifier=(
+                SignatureVerifier(signing_keys) if signing_keys else None
+            ),
         )
-        self.parser = MAVLink2Parser(self.definitions)
-        self.packet_start = None
+        self.renderer = PacketRenderer(
+            self.definitions, PayloadMode(str(self.payload_setting))
+        )
+        statistics_interval = float(self.statistics_setting or 0)  # type: ignore
+        # Packets skipped by a message filter show up as lost in the statistics
+        self.statistics = (
+            LinkStatistics(summary_interval=statistics_interval)
+            if statistics_interval > 0
+            else None
+        )
+        request_timeout = float(self.request_timeout_setting or 0)  # type: ignore
+        self.correlator = (
+            RequestCorrelator(request_timeout) if request_timeout > 0 else None
+        )
+        transfer_timeout = float(self.transfer_timeout_setting or 0)  # type: ignore
+        self.reassembler = (
+            TransferReassembler(transfer_timeout) if transfer_timeout > 0 else None
+        )
+        self.byte_times = ByteTimeIndex()
+        self.time_base: Optional[GraphTime] = None
 
     def decode(self, frame: AnalyzerFrame):
         def get_data() -> bytes:
@@ -39,42 +145,99 @@ class MAVLinkAnalyzer(HighLevelAnalyzer):
 
         frames: List[AnalyzerFrame] = list()
         data = get_data()
-        for byte in data:
-            result = self.parser.parse_byte(byte)
-            if result == ParseResult.PACKET_STARTED:
-                self.packet_start = frame.start_time  # type: ignore
-            elif isinstance(result, MAVLink2Packet):
-                frame = self._generate_frame(result, self.packet_start, frame.end_time)  # type: ignore
-                frames.append(frame)
+        time_base = self.time_base
+        if time_base is None:
+            time_base = self.time_base = frame.start_time  # type: ignore
+        if not self.conflicts_reported:
+            self.conflicts_reported = True
+            frames.extend(self._generate_conflicts(frame))
+        self.byte_times.add(
+            self.parser.position,
+            len(data),
+            float(frame.start_time - time_base),  # type: ignore
+            float(frame.end_time - time_base),  # type: ignore
+        )
 
-        return frames
+        for packet in self.parser.parse_buffer(data):
+            start, end = self.byte_times.span(packet.offset, len(packet.raw))
+            start_time = time_base + GraphTimeDelta(second=start)
+            end_time = time_base + GraphTimeDelta(second=end)
+            frames.append(self._generate_frame(packet, start_time, end_time))
+            if self.statistics is not None:
+                frames.extend(
+                    self._generate_statistics(packet, end, start_time, end_time)
+                )
+            if self.correlator is not None:
+                frames.extend(
+                    self._generate_correlations(packet, end, start_time, end_time)
+                )
+            if self.reassembler is not None:
+                frames.extend(
+                    self._generate_transfers(packet, end, start_time, end_time)
+                )
 
-    def _packet_to_data(
-        self, packet: MAVLink2Packet, message: Optional[MAVLinkMessage]
-    ):
-        data: Dict[str, Union[str, int]] = {}
-        data["message"] = (
-            message.name if message is not None else f"id({packet.message_id})"
+        pending_offset = self.parser.pending_offset
+        self.byte_times.discard_before(
+            self.parser.position if pending_offset is None else pending_offset
         )
-        route = f"{packet.system_id}:{packet.component_id}"
-        if "target_system" in packet.fields and "target_component" in packet.fields:
-            route = f"{route} -> {packet.fields['target_system']}:{packet.fields['target_component']}"
-        data["route"] = route
-        data["system_id"] = str(packet.system_id)
-        data["component_id"] = str(packet.component_id)
-        data["payload"] = json.dumps(packet.fields)
-        return data
+        return frames
+
+    def _generate_conflicts(self, frame: AnalyzerFrame) -> List[AnalyzerFrame]:
+        assert self.definitions is not None
+        conflicts = self.definitions.conflicts
+        if not conflicts:
+            return []
+        data = {"conflicts": "; ".join(map(str, conflicts))}
+        return [
+            AnalyzerFrame(
+                MAVLINK_DEFINITIONS_TYPE, frame.start_time, frame.end_time, data
+            )
+        ]
+
+    def _generate_statistics(
+        self, packet: MAVLinkPacket, time: float, start_time, end_time  # type: ignore
+    ) -> List[AnalyzerFrame]:
+        assert self.statistics is not None
+        self.statistics.add(packet, time)
+        summaries = self.statistics.poll_summary(time, self.renderer.message_name)
+        if summaries is None:
+            return []
+        return [
+            AnalyzerFrame(MAVLINK_STATISTICS_TYPE, start_time, end_time, data)
+            for data in summaries
+        ]
+
+    def _generate_correlations(
+        self, packet: MAVLinkPacket, time: float, start_time, end_time  # type: ignore
+    ) -> List[AnalyzerFrame]:
+        assert self.correlator is not None
+        return [
+            AnalyzerFrame(
+                MAVLINK_REQUEST_TYPE, start_time, end_time, correlation.summary()
+            )
+            for correlation in self.correlator.add(packet, time)
+        ]
+
+    def _generate_transfers(
+        self, packet: MAVLinkPacket, time: float, start_time, end_time  # type: ignore
+    ) -> List[AnalyzerFrame]:
+        assert self.reassembler is not None
+        return [
+            AnalyzerFrame(
+                MAVLINK_TRANSFER_TYPE, start_time, end_time, transfer.summary()
+            )
+            for transfer in self.reassembler.add(packet, time)
+        ]
 
     def _generate_frame(
-        self, packet: MAVLink2Packet, start_time, end_time  # type: ignore
+        self, packet: MAVLinkPacket, start_time, end_time  # type: ignore
     ) -> AnalyzerFrame:
-        message = (
-            None
-            if self.definitions is None
-            else self.definitions.get_message(packet.message_id)
-        )
-        data = self._packet_to_data(packet, message)
+        data = self.renderer.render(packet)
 
-        format = MAVLINK_PACKET_TYPE
+        format = (
+            MAVLINK_SIGNATURE_ERROR_TYPE
+            if packet.signature_status in SIGNATURE_ERRORS
+            else MAVLINK_PACKET_TYPE
+        )
 
         return AnalyzerFrame(format, start_time, end_time, data)  # type: ignore
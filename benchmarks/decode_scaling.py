@@ -0,0 +1,54 @@
+"""Measures offline decoding throughput against the number of worker processes.
+
+A synthetic capture of the given size is written to a temporary file and
+decoded to /dev/null with 1, 2, 4, ... jobs up to the CPU count, both split
+into file chunks and through the framing pipeline.
+
+    python -m benchmarks.decode_scaling [size in MB] [batch size]
+"""
+
+import os
+import sys
+import tempfile
+
+from mavlink_parser.cli import DecodeOptions, decode_file, pipeline_decode_file
+from mavlink_parser.pipeline import DEFAULT_BATCH_SIZE
+from mavlink_samples import STREAM
+
+DEFAULT_SIZE_MB = 32
+
+
+def job_counts():
+    cpu_count = os.cpu_count() or 1
+    jobs = 1
+    while jobs < cpu_count:
+        yield jobs
+        jobs *= 2
+    yield cpu_count
+
+
+def main(size_mb: int, batch_size: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.bin")
+        with open(path, "wb") as file:
+            file.write(STREAM * (size_mb * 1024 * 1024 // len(STREAM) + 1))
+
+        options = DecodeOptions("common.xml")
+        size = os.path.getsize(path)
+        baseline = None
+        for jobs in job_counts():
+            chunk_size = max(1024 * 1024, size // (jobs * 4))
+            with open(os.devnull, "w") as output:
+                result = decode_file(path, output, options, jobs, chunk_size)
+            baseline = baseline or result.seconds
+            print(f"chunks   {result}, speedup {baseline / result.seconds:.2f}x")
+            with open(os.devnull, "w") as output:
+                result = pipeline_decode_file(path, output, options, jobs, batch_size)
+            print(f"pipeline {result}, speedup {baseline / result.seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE_MB,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_SIZE,
+    )
@@ -0,0 +1,54 @@
+"""Compares cold, warm and lazy startup of MAVLinkDefinitions.
+
+Cold startup parses the XML files, warm startup loads the binary cache and
+lazy startup only indexes the files, then builds the HEARTBEAT message.
+
+    python -m benchmarks.definitions_load [dialect.xml ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from mavlink_definitions import MAVLinkDefinitions, get_all_mavlink_definitions
+
+DEFAULT_DIALECTS = ["common.xml", "ardupilotmega.xml", "all.xml"]
+REPEATS = 5
+
+
+def measure(filename: str, cache_path: Optional[str], lazy: bool = False) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        definitions = MAVLinkDefinitions(filename, cache_path, lazy=lazy)
+        definitions.get_message("HEARTBEAT")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(dialects: List[str]):
+    available = set(get_all_mavlink_definitions())
+    print(
+        f"{'dialect':<24}{'cold, ms':>12}{'warm, ms':>12}{'lazy, ms':>12}"
+        f"{'speedup':>10}"
+    )
+    with tempfile.TemporaryDirectory() as cache_path:
+        for dialect in dialects:
+            if dialect not in available:
+                print(f"{dialect:<24}{'missing':>12}")
+                continue
+            cold = measure(dialect, None)
+            MAVLinkDefinitions(dialect, cache_path).init()
+            warm = measure(dialect, cache_path)
+            lazy = measure(dialect, None, lazy=True)
+            size = os.path.getsize(os.path.join(cache_path, f"{dialect}.pickle"))
+            print(
+                f"{dialect:<24}{cold * 1000:>12.2f}{warm * 1000:>12.2f}"
+                f"{lazy * 1000:>12.2f}{cold / warm:>9.1f}x  ({size} bytes cached)"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_DIALECTS)
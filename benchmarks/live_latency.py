@@ -0,0 +1,99 @@
+"""Measures latency from UDP datagram receipt to packet delivery to a consumer.
+
+A sender thread sends synthetic telemetry, one packet per datagram, to a
+local MAVLinkDatagramProtocol. A fast consumer decodes every packet and
+records its latency, while a slow consumer with a short queue shows that
+dropping its oldest packets keeps the fast one unaffected.
+
+    python -m benchmarks.live_latency [packet count] [packets per second]
+"""
+
+import asyncio
+import itertools
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkDatagramProtocol, PacketBroadcaster
+
+from benchmarks.streams import create_generator
+
+DEFAULT_PACKETS = 20000
+DEFAULT_RATE = 5000
+SLOW_QUEUE_SIZE = 64
+SLOW_DELAY = 0.001
+
+
+def send(frames: List[bytes], address: Tuple[str, int], rate: float) -> None:
+    interval = 1 / rate
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+        start = time.perf_counter()
+        for index, frame in enumerate(frames):
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sender.sendto(frame, address)
+
+
+async def measure(frames: List[bytes], rate: float):
+    loop = asyncio.get_running_loop()
+    definitions = MAVLinkDefinitions()
+    definitions.init()
+    broadcaster = PacketBroadcaster()
+    fast = broadcaster.subscribe()
+    slow = broadcaster.subscribe(SLOW_QUEUE_SIZE)
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: MAVLinkDatagramProtocol(broadcaster, definitions),
+        local_addr=("127.0.0.1", 0),
+    )
+
+    latencies: List[float] = []
+
+    async def consume_fast():
+        async for received, packet in fast:
+            packet.fields.to_dict()  # type: ignore
+            latencies.append(loop.time() - received)
+
+    async def consume_slow():
+        async for _ in slow:
+            await asyncio.sleep(SLOW_DELAY)
+
+    consumers = [
+        asyncio.ensure_future(consume_fast()),
+        asyncio.ensure_future(consume_slow()),
+    ]
+    address = transport.get_extra_info("sockname")
+    sender = threading.Thread(target=send, args=(frames, address, rate))
+    sender.start()
+    await loop.run_in_executor(None, sender.join)
+    # Let the last datagrams arrive before closing
+    await asyncio.sleep(0.1)
+    transport.close()
+    await asyncio.gather(*consumers)
+    return latencies, slow.dropped
+
+
+def main(packet_count: int, rate: float):
+    generator = create_generator(MAVLinkDefinitions(), noise_ratio=0)
+    frames = [frame for _, frame in itertools.islice(generator.packets(), packet_count)]
+    latencies, slow_dropped = asyncio.run(measure(frames, rate))
+
+    microseconds = sorted(latency * 1e6 for latency in latencies)
+    quantiles = statistics.quantiles(microseconds, n=100)
+    print(f"{len(latencies)} of {packet_count} packets at {rate:.0f}/s")
+    print(
+        f"latency us: p50 {quantiles[49]:.0f}, p90 {quantiles[89]:.0f},"
+        f" p99 {quantiles[98]:.0f}, max {microseconds[-1]:.0f}"
+    )
+    print(f"slow consumer dropped {slow_dropped} packets")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PACKETS,
+        float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RATE,
+    )
@@ -0,0 +1,115 @@
+"""Reports memory held per parsed packet, now and with the legacy layout.
+
+The legacy layout is the one packets had before they were slotted: an
+instance dict, an empty fields dict of their own, and bytearray copies of the
+frame, payload and signature, the lazy fields holding the payload copy.
+
+    python -m benchmarks.packet_memory [packet count]
+"""
+
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Optional, TypeVar, Union
+
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Packet, MAVLink2Parser, MessageDecoder
+from mavlink_parser.parse_field import FieldValue
+from mavlink_samples import STREAM
+
+DEFAULT_PACKETS = 60000
+
+T = TypeVar("T")
+
+
+class LegacyFields:
+    """Lazy fields as they were before packets kept a single raw frame."""
+
+    def __init__(self, decoder: MessageDecoder, payload: bytearray):
+        self._decoder = decoder
+        self._payload = payload
+        self._fields: Optional[Dict[str, FieldValue]] = None
+
+
+class LegacyPacket:
+    """A MAVLink 2 packet as it was stored before packets were slotted."""
+
+    def __init__(self):
+        self.raw: bytearray = bytearray()
+        self.offset: int = 0
+        self.payload_length: int = 0
+        self.sequence: int = 0
+        self.system_id: int = 0
+        self.component_id: int = 0
+        self.message_id: int = 0
+        self.payload: bytearray = bytearray()
+        self.checksum: int = 0
+        self.checksum_valid: Optional[bool] = None
+        self.fields: Union[Dict[str, FieldValue], LegacyFields] = {}
+        self.incompatibility: int = 0
+        self.compatibility: int = 0
+        self.signature: bytearray = bytearray()
+
+
+def legacy_packet(
+    packet: MAVLink2Packet, decoders: Dict[int, MessageDecoder]
+) -> LegacyPacket:
+    legacy = LegacyPacket()
+    legacy.raw = bytearray(packet.raw)
+    legacy.offset = packet.offset
+    legacy.payload_length = packet.payload_length
+    legacy.sequence = packet.sequence
+    legacy.system_id = packet.system_id
+    legacy.component_id = packet.component_id
+    legacy.message_id = packet.message_id
+    legacy.payload = bytearray(packet.payload)
+    legacy.checksum = packet.checksum
+    legacy.checksum_valid = packet.checksum_valid
+    legacy.incompatibility = packet.incompatibility
+    legacy.compatibility = packet.compatibility
+    legacy.signature = bytearray(packet.signature)
+    decoder = decoders.get(packet.message_id)
+    if decoder is not None:
+        legacy.fields = LegacyFields(decoder, legacy.payload)
+    return legacy
+
+
+def measure(build: Callable[[], List[T]]) -> float:
+    """Bytes still allocated per item after build returns."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(items)
+
+
+def main(packet_count: int):
+    definitions = MAVLinkDefinitions()
+    definitions.init()
+    parser = MAVLink2Parser(definitions)
+    parser.feed(STREAM)
+    repeats = max(1, packet_count // len(parser.feed(STREAM)))
+
+    def parse() -> List[MAVLink2Packet]:
+        packets: List[MAVLink2Packet] = []
+        for _ in range(repeats):
+            packets.extend(parser.parse_buffer(STREAM))
+        return packets
+
+    packets = parse()
+    decoders = {
+        message.id: MessageDecoder(definitions, message)
+        for message in map(definitions.get_message, {p.message_id for p in packets})
+        if message is not None
+    }
+
+    current = measure(parse)
+    legacy = measure(lambda: [legacy_packet(packet, decoders) for packet in packets])
+
+    print(f"packets:          {len(packets)}")
+    print(f"bytes per packet: {current:.1f}")
+    print(f"legacy layout:    {legacy:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PACKETS)
@@ -0,0 +1,66 @@
+"""Measures frames per second of analyzer frame data rendering per payload mode.
+
+Every packet is parsed fresh for each mode, so lazy field decoding needed by
+the mode is included in the measurement.
+
+    python -m benchmarks.render [packet count]
+"""
+
+import json
+import sys
+import time
+from typing import Dict, List
+
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkPacket, MAVLinkParser, PacketRenderer, PayloadMode
+from mavlink_samples import STREAM
+
+DEFAULT_PACKETS = 60000
+
+
+def legacy_render(definitions: MAVLinkDefinitions, packet: MAVLinkPacket) -> Dict:
+    """Frame data as the analyzer rendered it before PacketRenderer."""
+    message = definitions.get_message(packet.message_id)
+    fields = packet.fields
+    data = {}
+    data["message"] = (
+        message.name if message is not None else f"id({packet.message_id})"
+    )
+    route = f"{packet.system_id}:{packet.component_id}"
+    if "target_system" in fields and "target_component" in fields:
+        route = f"{route} -> {fields['target_system']}:{fields['target_component']}"
+    data["route"] = route
+    data["system_id"] = str(packet.system_id)
+    data["component_id"] = str(packet.component_id)
+    data["payload"] = json.dumps(dict(packet.fields))
+    return data
+
+
+def parse(definitions: MAVLinkDefinitions, repeats: int) -> List[MAVLinkPacket]:
+    parser = MAVLinkParser(definitions)
+    return parser.feed(STREAM * repeats)
+
+
+def main(packet_count: int):
+    definitions = MAVLinkDefinitions()
+    repeats = max(1, packet_count // len(parse(definitions, 1)))
+
+    packets = parse(definitions, repeats)
+    start = time.perf_counter()
+    for packet in packets:
+        legacy_render(definitions, packet)
+    elapsed = time.perf_counter() - start
+    print(f"{'legacy json.dumps':<20}{len(packets) / elapsed:>12.0f} frames/s")
+
+    for mode in PayloadMode:
+        renderer = PacketRenderer(definitions, mode)
+        packets = parse(definitions, repeats)
+        start = time.perf_counter()
+        for packet in packets:
+            renderer.render(packet)
+        elapsed = time.perf_counter() - start
+        print(f"{mode.value:<20}{len(packets) / elapsed:>12.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PACKETS)
@@ -0,0 +1,115 @@
+"""Synthetic MAVLink capture streams for benchmarks.
+
+Three vehicles send a typical telemetry mix and a ground station sends
+heartbeats and commands. The second vehicle signs its packets and bursts of
+noise are injected between packets.
+
+    python -m benchmarks.streams capture.bin [size in MB]
+"""
+
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser.generator import StreamGenerator, TrafficSource
+
+VEHICLE_SYSTEM_IDS = [1, 2, 3]
+SIGNED_SYSTEM_IDS = [2]
+GCS_SYSTEM_ID = 255
+GCS_COMPONENT_ID = 190
+SIGNING_KEY = bytes(range(32))
+NOISE_RATIO = 0.02
+DEFAULT_SIZE_MB = 256
+# Fixed capture start, so signed streams are reproducible
+START_TIME = 1700000000.0
+
+HEARTBEAT = {
+    "type": "MAV_TYPE_QUADROTOR",
+    "autopilot": "MAV_AUTOPILOT_ARDUPILOTMEGA",
+    "base_mode": ["MAV_MODE_FLAG_CUSTOM_MODE_ENABLED", "MAV_MODE_FLAG_SAFETY_ARMED"],
+    "custom_mode": 4,
+    "system_status": "MAV_STATE_ACTIVE",
+    "mavlink_version": 3,
+}
+
+
+def vehicle_sources(system_id: int) -> List[TrafficSource]:
+    key = SIGNING_KEY if system_id in SIGNED_SYSTEM_IDS else None
+    rates: List[Tuple[str, float, Dict[str, Any]]] = [
+        ("HEARTBEAT", 1, HEARTBEAT),
+        (
+            "SYS_STATUS",
+            2,
+            {"load": 250, "voltage_battery": 15800, "battery_remaining": 87},
+        ),
+        (
+            "ATTITUDE",
+            25,
+            {"time_boot_ms": 123456, "roll": 0.01, "pitch": -0.02, "yaw": 1.5},
+        ),
+        ("VIBRATION", 5, {"vibration_x": 0.3, "vibration_y": 0.2, "vibration_z": 0.5}),
+        ("BATTERY_STATUS", 1, {"voltages": [4000] * 4, "battery_remaining": 87}),
+        (
+            "STATUSTEXT",
+            0.2,
+            {"severity": "MAV_SEVERITY_INFO", "text": "EKF3 IMU0 is using GPS"},
+        ),
+    ]
+    return [
+        TrafficSource(message, rate, fields, system_id, 1, key)
+        for message, rate, fields in rates
+    ]
+
+
+def gcs_sources() -> List[TrafficSource]:
+    return [
+        TrafficSource(
+            "HEARTBEAT",
+            1,
+            {"type": "MAV_TYPE_GCS", "autopilot": "MAV_AUTOPILOT_INVALID"},
+            GCS_SYSTEM_ID,
+            GCS_COMPONENT_ID,
+        ),
+        TrafficSource(
+            "COMMAND_LONG",
+            0.5,
+            {"target_system": 1, "target_component": 1, "command": 512, "param1": 33},
+            GCS_SYSTEM_ID,
+            GCS_COMPONENT_ID,
+        ),
+    ]
+
+
+def create_generator(
+    definitions: MAVLinkDefinitions, seed: int = 0, noise_ratio: float = NOISE_RATIO
+) -> StreamGenerator:
+    sources = gcs_sources()
+    for system_id in VEHICLE_SYSTEM_IDS:
+        sources.extend(vehicle_sources(system_id))
+    return StreamGenerator(definitions, sources, noise_ratio, seed, START_TIME)
+
+
+def build_stream(
+    definitions: MAVLinkDefinitions,
+    size: int,
+    seed: int = 0,
+    noise_ratio: float = NOISE_RATIO,
+) -> bytes:
+    """Returns a stream of at least size bytes."""
+    return create_generator(definitions, seed, noise_ratio).generate(size)
+
+
+def main(path: str, size_mb: int):
+    generator = create_generator(MAVLinkDefinitions())
+    start = time.perf_counter()
+    with open(path, "wb") as file:
+        written = generator.write(file, size_mb * 1024 * 1024)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{written / 1e6:.1f} MB in {elapsed:.2f} s: {written / 1e6 / elapsed:.1f} MB/s"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SIZE_MB)
@@ -0,0 +1,206 @@
+"""Reproducible benchmark suite, results are written as JSON.
+
+Cases run on a synthetic stream built with a fixed seed:
+
+- framing: parse_buffer over 64 KB chunks, fields are left undecoded
+- decode: framing plus decoding of every packet's fields
+- signatures: framing with signature verification of the signed packets
+- analyzer: the work of MAVLinkAnalyzer.decode, one byte per call with the
+  byte time index and full frame data rendering
+- definitions_cold / definitions_warm: loading definitions from XML and
+  from the disk cache
+
+    python -m benchmarks.suite [--size MB] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json [--output new.json]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Optional
+
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import (
+    ByteTimeIndex,
+    LazyFields,
+    MAVLinkParser,
+    PacketRenderer,
+    PayloadMode,
+    SignatureVerifier,
+)
+
+from .streams import SIGNING_KEY, build_stream
+
+RESULTS_VERSION = 1
+DEFAULT_SIZE_MB = 4
+DEFAULT_REPEATS = 3
+DEFINITIONS = "common.xml"
+CHUNK_SIZE = 64 * 1024
+# The analyzer feeds one byte per call, so it runs on a part of the stream
+ANALYZER_FRACTION = 8
+
+Result = Dict[str, float]
+
+
+def framing(definitions: MAVLinkDefinitions, stream: bytes) -> int:
+    parser = MAVLinkParser(definitions)
+    packets = 0
+    for start in range(0, len(stream), CHUNK_SIZE):
+        for _ in parser.parse_buffer(stream[start : start + CHUNK_SIZE]):
+            packets += 1
+    return packets
+
+
+def decode(definitions: MAVLinkDefinitions, stream: bytes) -> int:
+    parser = MAVLinkParser(definitions)
+    packets = 0
+    for start in range(0, len(stream), CHUNK_SIZE):
+        for packet in parser.parse_buffer(stream[start : start + CHUNK_SIZE]):
+            if isinstance(packet.fields, LazyFields):
+                packet.fields.to_dict()
+            packets += 1
+    return packets
+
+
+def signatures(definitions: MAVLinkDefinitions, stream: bytes) -> int:
+    parser = MAVLinkParser(
+        definitions, signature_verifier=SignatureVerifier([SIGNING_KEY])
+    )
+    packets = 0
+    for start in range(0, len(stream), CHUNK_SIZE):
+        for _ in parser.parse_buffer(stream[start : start + CHUNK_SIZE]):
+            packets += 1
+    return packets
+
+
+def analyzer(definitions: MAVLinkDefinitions, stream: bytes) -> int:
+    parser = MAVLinkParser(definitions)
+    renderer = PacketRenderer(definitions, PayloadMode.FULL)
+    byte_times = ByteTimeIndex()
+    packets = 0
+    for offset in range(len(stream)):
+        byte_time = offset * 1e-4
+        byte_times.add(parser.position, 1, byte_time, byte_time + 1e-4)
+        for packet in parser.parse_buffer(stream[offset : offset + 1]):
+            byte_times.span(packet.offset, len(packet.raw))
+            renderer.render(packet)
+            packets += 1
+        pending_offset = parser.pending_offset
+        byte_times.discard_before(
+            parser.position if pending_offset is None else pending_offset
+        )
+    return packets
+
+
+def measure_stream(
+    case: Callable[[MAVLinkDefinitions, bytes], int],
+    definitions: MAVLinkDefinitions,
+    stream: bytes,
+    repeats: int,
+) -> Result:
+    best = float("inf")
+    packets = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        packets = case(definitions, stream)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "seconds": best,
+        "bytes": len(stream),
+        "packets": packets,
+        "bytes_per_second": len(stream) / best,
+        "packets_per_second": packets / best,
+    }
+
+
+def measure_definitions(cache_path: Optional[str], repeats: int) -> Result:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        MAVLinkDefinitions(DEFINITIONS, cache_path).init()
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": best}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(size: int, seed: int, repeats: int) -> Dict:
+    definitions = MAVLinkDefinitions(DEFINITIONS)
+    stream = build_stream(definitions, size, seed)
+    results = {
+        "framing": measure_stream(framing, definitions, stream, repeats),
+        "decode": measure_stream(decode, definitions, stream, repeats),
+        "signatures": measure_stream(signatures, definitions, stream, repeats),
+        "analyzer": measure_stream(
+            analyzer, definitions, stream[: len(stream) // ANALYZER_FRACTION], 1
+        ),
+        "definitions_cold": measure_definitions(None, repeats),
+    }
+    with tempfile.TemporaryDirectory() as cache_path:
+        MAVLinkDefinitions(DEFINITIONS, cache_path).init()
+        results["definitions_warm"] = measure_definitions(cache_path, repeats)
+    return {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "stream": {"size": len(stream), "seed": seed},
+        "results": results,
+    }
+
+
+def print_results(report: Dict, baseline: Optional[Dict]):
+    print(f"{'case':<20}{'MB/s':>10}{'packets/s':>12}{'ms':>10}{'change':>10}")
+    for name, result in report["results"].items():
+        line = f"{name:<20}"
+        if "bytes_per_second" in result:
+            line += f"{result['bytes_per_second'] / 1e6:>10.2f}"
+            line += f"{result['packets_per_second']:>12.0f}"
+        else:
+            line += f"{'':>22}"
+        line += f"{result['seconds'] * 1000:>10.1f}"
+        previous = None if baseline is None else baseline["results"].get(name)
+        if previous is not None:
+            line += f"{previous['seconds'] / result['seconds']:>9.2f}x"
+        print(line)
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    arguments.add_argument("--size", type=int, default=DEFAULT_SIZE_MB, help="MB")
+    arguments.add_argument("--seed", type=int, default=0)
+    arguments.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    arguments.add_argument("--output", help="file to write JSON results to")
+    arguments.add_argument("--compare", help="JSON results to compare with")
+    args = arguments.parse_args(argv)
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    report = run(args.size * 1024 * 1024, args.seed, args.repeats)
+    print_results(report, baseline)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,25 @@
+from .correlator import Correlation, CorrelationKind, RequestCorrelator
+from .reassembly import (
+    FtpReassembler,
+    MissionReassembler,
+    ParamReassembler,
+    Transfer,
+    TransferReassembler,
+)
+from .statistics import LinkStatistics, MessageStatistics, StreamStatistics
+from .window import WindowedCounter
+
+__all__ = [
+    "Correlation",
+    "CorrelationKind",
+    "FtpReassembler",
+    "RequestCorrelator",
+    "LinkStatistics",
+    "MessageStatistics",
+    "MissionReassembler",
+    "ParamReassembler",
+    "StreamStatistics",
+    "Transfer",
+    "TransferReassembler",
+    "WindowedCounter",
+]
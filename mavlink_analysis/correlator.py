@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from mavlink_parser import MAVLinkPacket
+
+PARAM_REQUEST_READ = 20
+PARAM_VALUE = 22
+PARAM_SET = 23
+COMMAND_INT = 75
+COMMAND_LONG = 76
+COMMAND_ACK = 77
+
+REQUEST_NAMES = {
+    PARAM_REQUEST_READ: "PARAM_REQUEST_READ",
+    PARAM_SET: "PARAM_SET",
+    COMMAND_INT: "COMMAND_INT",
+    COMMAND_LONG: "COMMAND_LONG",
+}
+COMMAND_FIELDS = ("target_system", "target_component", "command")
+PARAM_REQUEST_FIELDS = ("target_system", "target_component", "param_id", "param_index")
+PARAM_VALUE_FIELDS = ("param_id", "param_index", "param_value")
+ACK_FIELDS = ("command", "result")
+# Command acknowledgements that are followed by a final one
+IN_PROGRESS_RESULTS = ("MAV_RESULT_IN_PROGRESS", 5)
+# Requests sent to this component are answered by any component of the target
+BROADCAST_COMPONENT = 0
+
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_MAX_PENDING = 1024
+
+RequestKey = Tuple[int, int, Hashable]
+
+
+class CorrelationKind(Enum):
+    RESPONSE = "response"
+    TIMEOUT = "timeout"
+    # Dropped to stay within the pending request limit
+    EVICTED = "evicted"
+
+
+class PendingRequest:
+    __slots__ = (
+        "message_id",
+        "system_id",
+        "component_id",
+        "subject",
+        "first_time",
+        "time",
+        "last_activity",
+        "retries",
+    )
+
+    def __init__(self, packet: MAVLinkPacket, subject: str, time: float):
+        self.message_id = packet.message_id
+        self.system_id = packet.system_id
+        self.component_id = packet.component_id
+        self.subject = subject
+        self.first_time = time
+        self.time = time
+        # Last transmission or progress report, the timeout counts from it
+        self.last_activity = time
+        self.retries = 0
+
+
+class Correlation:
+    """A request matched with its response, or one that got none in time."""
+
+    __slots__ = ("kind", "request", "target", "time", "result")
+
+    def __init__(
+        self,
+        kind: CorrelationKind,
+        request: PendingRequest,
+        target: Tuple[int, int],
+        time: float,
+        result: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.request = request
+        self.target = target
+        self.time = time
+        self.result = result
+
+    @property
+    def round_trip(self) -> float:
+        """Time from the last transmission of the request."""
+        return self.time - self.request.time
+
+    def summary(self) -> Dict[str, str]:
+        """Renders the correlation into analyzer frame data."""
+        request = self.request
+        data = {
+            "kind": self.kind.value,
+            "request": f"{REQUEST_NAMES[request.message_id]} {request.subject}",
+            "route": (
+                f"{request.system_id}:{request.component_id}"
+                f" -> {self.target[0]}:{self.target[1]}"
+            ),
+            "retries": str(request.retries),
+        }
+        if self.kind == CorrelationKind.RESPONSE:
+            data["round_trip"] = f"{self.round_trip * 1000:.1f} ms"
+            data["result"] = self.result or ""
+        return data
+
+
+class RequestCorrelator:
+    """Matches commands with COMMAND_ACK and parameter requests with PARAM_VALUE.
+
+    Pending requests are kept in insertion order in a hash map keyed by
+    target system, component and command or parameter. Requests older than
+    the timeout are reported as timed out, and the oldest ones are evicted
+    when more than max_pending are waiting, so memory stays bounded.
+    A resent request counts as a retry of the pending one.
+    """
+
+    def __init__(
+        self, timeout: float = DEFAULT_TIMEOUT, max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.pending: "OrderedDict[RequestKey, PendingRequest]" = OrderedDict()
+        self.evicted = 0
+
+    def add(self, packet: MAVLinkPacket, time: float) -> List[Correlation]:
+        """Returns the correlations completed by the packet or expired by now."""
+        correlations = self.expire(time)
+        message_id = packet.message_id
+        if message_id == COMMAND_LONG or message_id == COMMAND_INT:
+            fields = packet.get_fields(COMMAND_FIELDS)
+            if len(fields) == len(COMMAND_FIELDS):
+                command = fields["command"]
+                correlations += self._add_request(
+                    packet, fields, ("command", command), str(command), time
+                )
+        elif message_id == PARAM_REQUEST_READ:
+            fields = packet.get_fields(PARAM_REQUEST_FIELDS)
+            if len(fields) == len(PARAM_REQUEST_FIELDS):
+                index = fields["param_index"]
+                if index >= 0:  # type: ignore
+                    subject = ("param_index", index)
+                else:
+                    subject = ("param_id", fields["param_id"])
+                correlations += self._add_request(
+                    packet, fields, subject, str(subject[1]), time
+                )
+        elif message_id == PARAM_SET:
+            fields = packet.get_fields(PARAM_REQUEST_FIELDS)
+            if "param_id" in fields:
+                subject = ("param_id", fields["param_id"])
+                correlations += self._add_request(
+                    packet, fields, subject, str(subject[1]), time
+                )
+        elif message_id == COMMAND_ACK:
+            fields = packet.get_fields(ACK_FIELDS)
+            if len(fields) == len(ACK_FIELDS):
+                result = fields["result"]
+                final = result not in IN_PROGRESS_RESULTS
+                correlation = self._respond(
+                    packet, [("command", fields["command"])], time, str(result), final
+                )
+                if correlation is not None:
+                    correlations.append(correlation)
+        elif message_id == PARAM_VALUE:
+            fields = packet.get_fields(PARAM_VALUE_FIELDS)
+            if len(fields) == len(PARAM_VALUE_FIELDS):
+                correlation = self._respond(
+                    packet,
+                    [
+                        ("param_id", fields["param_id"]),
+                        ("param_index", fields["param_index"]),
+                    ],
+                    time,
+                    str(fields["param_value"]),
+                    True,
+                )
+                if correlation is not None:
+                    correlations.append(correlation)
+        return correlations
+
+    def expire(self, time: float) -> List[Correlation]:
+        """Reports and drops requests older than the timeout."""
+        correlations = []
+        while self.pending:
+            key, request = next(iter(self.pending.items()))
+            if request.last_activity + self.timeout > time:
+                break
+            del self.pending[key]
+            correlations.append(
+                Correlation(CorrelationKind.TIMEOUT, request, key[:2], time)
+            )
+        return correlations
+
+    def _add_request(
+        self,
+        packet: MAVLinkPacket,
+        fields: Dict,
+        subject: Hashable,
+        description: str,
+        time: float,
+    ) -> List[Correlation]:
+        key = (fields["target_system"], fields["target_component"], subject)
+        evicted = []
+        request = self.pending.pop(key, None)
+        if request is None:
+            request = PendingRequest(packet, description, time)
+            while len(self.pending) >= self.max_pending:
+                old_key, old_request = self.pending.popitem(last=False)
+                evicted.append(
+                    Correlation(CorrelationKind.EVICTED, old_request, old_key[:2], time)
+                )
+            self.evicted += len(evicted)
+        else:
+            request.retries += 1
+            request.time = request.last_activity = time
+        self.pending[key] = request
+        return evicted
+
+    def _respond(
+        self,
+        packet: MAVLinkPacket,
+        subjects: List[Hashable],
+        time: float,
+        result: str,
+        final: bool,
+    ) -> Optional[Correlation]:
+        for subject in subjects:
+            for component_id in (packet.component_id, BROADCAST_COMPONENT):
+                key = (packet.system_id, component_id, subject)
+                request = self.pending.get(key)
+                if request is None:
+                    continue
+                if final:
+                    del self.pending[key]
+                else:
+                    request.last_activity = time
+                    self.pending.move_to_end(key)
+                return Correlation(
+                    CorrelationKind.RESPONSE, request, key[:2], time, result
+                )
+        return None
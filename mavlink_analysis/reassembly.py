@@ -0,0 +1,511 @@
+"""Reassembly of transfers spread over many packets.
+
+Parameter lists, mission uploads and downloads and FTP file reads are
+collected into tables indexed by parameter index, mission sequence number or
+file offset. A summary of each transfer is produced when it completes or
+goes idle.
+"""
+
+import bisect
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
+
+from mavlink_parser import MAVLinkPacket
+
+PARAM_REQUEST_LIST = 21
+PARAM_VALUE = 22
+MISSION_COUNT = 44
+MISSION_ACK = 47
+MISSION_ITEM_INT = 73
+FILE_TRANSFER_PROTOCOL = 110
+
+PARAM_VALUE_FIELDS = ("param_id", "param_value", "param_count", "param_index")
+MISSION_FIELDS = ("target_system", "target_component", "mission_type")
+# PARAM_VALUE sent on a parameter change rather than as part of a list
+UNINDEXED_PARAM = 0xFFFF
+BROADCAST_COMPONENT = 0
+DEFAULT_IDLE_TIMEOUT = 5.0
+
+# FILE_TRANSFER_PROTOCOL: target network, system and component, then the FTP
+# header of seq number, session, opcode, size, req opcode, burst complete,
+# padding and offset, followed by the data
+FTP_TARGET_STRUCT = struct.Struct("<BBB")
+FTP_HEADER_STRUCT = struct.Struct("<HBBBBBBI")
+FTP_HEADER_OFFSET = FTP_TARGET_STRUCT.size
+FTP_DATA_OFFSET = FTP_HEADER_OFFSET + FTP_HEADER_STRUCT.size
+FTP_PAYLOAD_LENGTH = 254
+FTP_FILE_SIZE_STRUCT = struct.Struct("<I")
+FTP_TERMINATE_SESSION = 1
+FTP_OPEN_FILE_RO = 4
+FTP_READ_FILE = 5
+FTP_BURST_READ_FILE = 15
+FTP_ACK = 128
+FTP_NAK = 129
+FTP_ERROR_EOF = 6
+
+Route = Tuple[int, int, int, int]
+
+
+class Transfer:
+    """A completed or abandoned transfer and the data it carried."""
+
+    __slots__ = (
+        "kind",
+        "route",
+        "start_time",
+        "end_time",
+        "expected",
+        "received",
+        "duplicates",
+        "bytes",
+        "result",
+        "data",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        route: Route,
+        start_time: float,
+        end_time: float,
+        expected: int,
+        received: int,
+        duplicates: int,
+        byte_count: int,
+        result: str,
+        data: Any,
+    ):
+        self.kind = kind
+        self.route = route
+        self.start_time = start_time
+        self.end_time = end_time
+        self.expected = expected
+        self.received = received
+        self.duplicates = duplicates
+        self.bytes = byte_count
+        self.result = result
+        self.data = data
+
+    @property
+    def missing(self) -> int:
+        return max(self.expected - self.received, 0)
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    @property
+    def throughput(self) -> float:
+        """Link bytes per second of the packets of the transfer."""
+        return self.bytes / self.duration if self.duration > 0 else 0.0
+
+    def summary(self) -> Dict[str, str]:
+        """Renders the transfer into analyzer frame data."""
+        return {
+            "transfer": self.kind,
+            "route": (
+                f"{self.route[0]}:{self.route[1]} -> {self.route[2]}:{self.route[3]}"
+            ),
+            "result": self.result,
+            "received": f"{self.received}/{self.expected}",
+            "missing": str(self.missing),
+            "duplicates": str(self.duplicates),
+            "duration": f"{self.duration:.3f} s",
+            "throughput": f"{self.throughput:.0f} B/s",
+        }
+
+
+class _TableSession:
+    """Items of a transfer in a table preallocated from the announced count."""
+
+    __slots__ = (
+        "route",
+        "start_time",
+        "last_time",
+        "items",
+        "received",
+        "duplicates",
+        "bytes",
+    )
+
+    def __init__(self, route: Route, count: int, start_time: float):
+        self.route = route
+        self.start_time = start_time
+        self.last_time = start_time
+        self.items: List[Any] = [None] * count
+        self.received = 0
+        self.duplicates = 0
+        self.bytes = 0
+
+    def add(self, index: int, item: Any, length: int, time: float) -> None:
+        if self.items[index] is None:
+            self.received += 1
+        else:
+            self.duplicates += 1
+        self.items[index] = item
+        self.bytes += length
+        self.last_time = time
+
+    @property
+    def complete(self) -> bool:
+        return self.received == len(self.items)
+
+    def finish(self, kind: str, result: str, data: Any) -> Transfer:
+        return Transfer(
+            kind,
+            self.route,
+            self.start_time,
+            self.last_time,
+            len(self.items),
+            self.received,
+            self.duplicates,
+            self.bytes,
+            result,
+            data,
+        )
+
+
+class ParamReassembler:
+    """Collects parameter lists sent as PARAM_VALUE into index tables.
+
+    A list starts at PARAM_REQUEST_LIST, or at the first indexed PARAM_VALUE
+    of a component, and completes when every index has been received.
+    Transfer data maps parameter ids to values in index order.
+    """
+
+    kind = "params"
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.sessions: Dict[Tuple[int, int], _TableSession] = {}
+        self._requests: Dict[Tuple[int, int], Tuple[int, int, float]] = {}
+
+    def add(self, packet: MAVLinkPacket, time: float) -> List[Transfer]:
+        if packet.message_id == PARAM_REQUEST_LIST:
+            targets = packet.get_fields(MISSION_FIELDS[:2])
+            if len(targets) == 2:
+                target = cast(
+                    Tuple[int, int],
+                    (targets["target_system"], targets["target_component"]),
+                )
+                self._requests[target] = (packet.system_id, packet.component_id, time)
+            return []
+        if packet.message_id != PARAM_VALUE:
+            return []
+        fields = packet.get_fields(PARAM_VALUE_FIELDS)
+        if len(fields) != len(PARAM_VALUE_FIELDS):
+            return []
+        index: int = fields["param_index"]  # type: ignore
+        count: int = fields["param_count"]  # type: ignore
+        if index == UNINDEXED_PARAM or index >= count:
+            return []
+
+        transfers = []
+        key = (packet.system_id, packet.component_id)
+        session = self.sessions.get(key)
+        if session is not None and len(session.items) != count:
+            transfers.append(self._finish(key, "restarted"))
+            session = None
+        if session is None:
+            request = self._requests.pop(key, None) or self._requests.pop(
+                (packet.system_id, BROADCAST_COMPONENT), None
+            )
+            requester = (0, 0) if request is None else request[:2]
+            start_time = time if request is None else request[2]
+            session = self.sessions[key] = _TableSession(
+                (key[0], key[1], requester[0], requester[1]), count, start_time
+            )
+        session.add(
+            index, (fields["param_id"], fields["param_value"]), len(packet.raw), time
+        )
+        if session.complete:
+            transfers.append(self._finish(key, "complete"))
+        return transfers
+
+    def expire(self, time: float) -> List[Transfer]:
+        return [
+            self._finish(key, "idle")
+            for key, session in list(self.sessions.items())
+            if session.last_time + self.idle_timeout <= time
+        ]
+
+    def _finish(self, key: Tuple[int, int], result: str) -> Transfer:
+        session = self.sessions.pop(key)
+        params = dict(item for item in session.items if item is not None)
+        return session.finish(self.kind, result, params)
+
+
+class MissionReassembler:
+    """Collects MISSION_ITEM_INT of mission uploads and downloads.
+
+    A transfer starts at MISSION_COUNT and completes at the MISSION_ACK of
+    the receiving side. Transfer data is the list of item fields by sequence
+    number, with None for missing items.
+    """
+
+    kind = "mission"
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.sessions: Dict[Tuple[int, int, int, int, Any], _TableSession] = {}
+
+    def add(self, packet: MAVLinkPacket, time: float) -> List[Transfer]:
+        message_id = packet.message_id
+        if message_id not in (MISSION_COUNT, MISSION_ITEM_INT, MISSION_ACK):
+            return []
+        fields = packet.fields
+        if not fields:
+            return []
+        source = (packet.system_id, packet.component_id)
+        target = cast(
+            Tuple[int, int], (fields["target_system"], fields["target_component"])
+        )
+        mission_type: Any = fields.get("mission_type", 0)
+
+        if message_id == MISSION_COUNT:
+            transfers = []
+            new_key = source + target + (mission_type,)
+            if new_key in self.sessions:
+                transfers.append(self._finish(new_key, "restarted"))
+            self.sessions[new_key] = _TableSession(
+                new_key[:4], fields["count"], time  # type: ignore
+            )
+            self.sessions[new_key].bytes += len(packet.raw)
+            return transfers
+
+        if message_id == MISSION_ITEM_INT:
+            key = self._find(source, target, mission_type)
+            if key is not None:
+                session = self.sessions[key]
+                sequence: int = fields["seq"]  # type: ignore
+                if sequence < len(session.items):
+                    session.add(sequence, dict(fields), len(packet.raw), time)
+            return []
+
+        # The ack goes from the receiver back to the sender of the items
+        key = self._find(target, source, mission_type)
+        if key is None:
+            return []
+        session = self.sessions[key]
+        session.bytes += len(packet.raw)
+        session.last_time = time
+        return [self._finish(key, str(fields["type"]))]
+
+    def expire(self, time: float) -> List[Transfer]:
+        return [
+            self._finish(key, "idle")
+            for key, session in list(self.sessions.items())
+            if session.last_time + self.idle_timeout <= time
+        ]
+
+    def _find(
+        self, sender: Tuple[int, int], receiver: Tuple[int, int], mission_type: Any
+    ) -> Optional[Tuple[int, int, int, int, Any]]:
+        for key in (
+            sender + receiver + (mission_type,),
+            sender + (receiver[0], BROADCAST_COMPONENT, mission_type),
+            (sender[0], BROADCAST_COMPONENT) + receiver + (mission_type,),
+        ):
+            if key in self.sessions:
+                return key  # type: ignore
+        return None
+
+    def _finish(self, key: Tuple[int, int, int, int, Any], result: str) -> Transfer:
+        session = self.sessions.pop(key)
+        return session.finish(self.kind, result, session.items)
+
+
+class _FileSession:
+    """File read into a buffer preallocated from the size in the open reply."""
+
+    __slots__ = (
+        "route",
+        "path",
+        "start_time",
+        "last_time",
+        "data",
+        "ranges",
+        "received",
+        "duplicates",
+        "bytes",
+    )
+
+    def __init__(self, route: Route, path: str, size: int, start_time: float):
+        self.route = route
+        self.path = path
+        self.start_time = start_time
+        self.last_time = start_time
+        self.data = bytearray(size)
+        # Sorted, merged (start, end) ranges of the file received so far
+        self.ranges: List[Tuple[int, int]] = []
+        self.received = 0
+        self.duplicates = 0
+        self.bytes = 0
+
+    def add(self, offset: int, data: memoryview) -> None:
+        end = min(offset + len(data), len(self.data))
+        if end <= offset:
+            return
+        self.data[offset:end] = data[: end - offset]
+        new = end - offset - self._overlap(offset, end)
+        if new == 0:
+            self.duplicates += 1
+        self.received += new
+        self._merge(offset, end)
+
+    def _overlap(self, start: int, end: int) -> int:
+        overlap = 0
+        index = bisect.bisect_left(self.ranges, (start, start))
+        for range_start, range_end in self.ranges[max(index - 1, 0) :]:
+            if range_start >= end:
+                break
+            overlap += max(0, min(end, range_end) - max(start, range_start))
+        return overlap
+
+    def _merge(self, start: int, end: int) -> None:
+        index = bisect.bisect_left(self.ranges, (start, start))
+        if index > 0 and self.ranges[index - 1][1] >= start:
+            index -= 1
+            start = self.ranges[index][0]
+        last = index
+        while last < len(self.ranges) and self.ranges[last][0] <= end:
+            end = max(end, self.ranges[last][1])
+            last += 1
+        self.ranges[index:last] = [(start, end)]
+
+
+class FtpReassembler:
+    """Reassembles files read over FILE_TRANSFER_PROTOCOL.
+
+    The file size from the OpenFileRO reply preallocates the buffer, which
+    ReadFile and BurstReadFile replies fill by offset. A transfer completes
+    when the whole file has arrived, at the end of file reply or when the
+    session is terminated. Transfer data is the file contents.
+    """
+
+    kind = "ftp"
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.sessions: Dict[Tuple[int, int, int, int, int], _FileSession] = {}
+        self._opens: Dict[Route, Tuple[str, float]] = {}
+
+    def add(self, packet: MAVLinkPacket, time: float) -> List[Transfer]:
+        if packet.message_id != FILE_TRANSFER_PROTOCOL or not packet.fields:
+            return []
+        payload = packet.payload
+        if len(payload) < FTP_PAYLOAD_LENGTH:
+            payload = memoryview(
+                bytes(payload) + bytes(FTP_PAYLOAD_LENGTH - len(payload))
+            )
+        _, target_system, target_component = FTP_TARGET_STRUCT.unpack_from(payload)
+        (
+            _,
+            session_id,
+            opcode,
+            size,
+            request_opcode,
+            _,
+            _,
+            offset,
+        ) = FTP_HEADER_STRUCT.unpack_from(payload, FTP_HEADER_OFFSET)
+        data = payload[FTP_DATA_OFFSET : FTP_DATA_OFFSET + size]
+        source = (packet.system_id, packet.component_id)
+        target = (target_system, target_component)
+
+        if opcode == FTP_OPEN_FILE_RO:
+            path = bytes(data).split(b"\x00")[0].decode("utf-8", "replace")
+            self._opens[source + target] = (path, time)
+            return []
+        if opcode == FTP_TERMINATE_SESSION:
+            key = target + source + (session_id,)
+            if key in self.sessions:
+                return [self._finish(key, "terminated", time)]
+            return []
+        if opcode not in (FTP_ACK, FTP_NAK):
+            return []
+
+        # Replies go from the server back to the client
+        key = source + target + (session_id,)
+        session = self.sessions.get(key)
+        if opcode == FTP_ACK and request_opcode == FTP_OPEN_FILE_RO:
+            transfers = []
+            if session is not None:
+                transfers.append(self._finish(key, "restarted", time))
+            path, start_time = self._opens.pop(target + source, ("", time))
+            file_size = FTP_FILE_SIZE_STRUCT.unpack_from(payload, FTP_DATA_OFFSET)[0]
+            self.sessions[key] = _FileSession(
+                source + target, path, file_size, start_time
+            )
+            self.sessions[key].bytes += len(packet.raw)
+            return transfers
+        if session is None:
+            return []
+
+        session.bytes += len(packet.raw)
+        session.last_time = time
+        if opcode == FTP_NAK:
+            if request_opcode in (FTP_READ_FILE, FTP_BURST_READ_FILE):
+                eof = size > 0 and data[0] == FTP_ERROR_EOF
+                return [self._finish(key, "complete" if eof else "failed", time)]
+            return []
+        if request_opcode in (FTP_READ_FILE, FTP_BURST_READ_FILE):
+            session.add(offset, data)
+            if session.received == len(session.data):
+                return [self._finish(key, "complete", time)]
+        return []
+
+    def expire(self, time: float) -> List[Transfer]:
+        return [
+            self._finish(key, "idle", session.last_time)
+            for key, session in list(self.sessions.items())
+            if session.last_time + self.idle_timeout <= time
+        ]
+
+    def _finish(
+        self, key: Tuple[int, int, int, int, int], result: str, time: float
+    ) -> Transfer:
+        session = self.sessions.pop(key)
+        return Transfer(
+            f"{self.kind} {session.path}",
+            session.route,
+            session.start_time,
+            max(time, session.last_time),
+            len(session.data),
+            session.received,
+            session.duplicates,
+            session.bytes,
+            result,
+            bytes(session.data),
+        )
+
+
+class TransferReassembler:
+    """Runs the parameter, mission and FTP reassemblers on one stream."""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.reassemblers: List[
+            Union[ParamReassembler, MissionReassembler, FtpReassembler]
+        ] = [
+            ParamReassembler(idle_timeout),
+            MissionReassembler(idle_timeout),
+            FtpReassembler(idle_timeout),
+        ]
+        self.idle_timeout = idle_timeout
+        self._next_expire = 0.0
+
+    def add(self, packet: MAVLinkPacket, time: float) -> List[Transfer]:
+        transfers = []
+        # Idle sessions are checked about once per idle timeout
+        if time >= self._next_expire:
+            transfers += self.expire(time)
+            self._next_expire = time + self.idle_timeout
+        for reassembler in self.reassemblers:
+            transfers += reassembler.add(packet, time)
+        return transfers
+
+    def expire(self, time: float) -> List[Transfer]:
+        transfers = []
+        for reassembler in self.reassemblers:
+            transfers += reassembler.expire(time)
+        return transfers
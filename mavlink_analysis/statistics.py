@@ -0,0 +1,199 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mavlink_parser import MAVLinkPacket
+
+from .window import WindowedCounter
+
+# Sequence steps of half the counter range or more are taken as reordered or
+# restarted streams rather than loss
+MAX_SEQUENCE_GAP = 128
+# Smoothing of interval jitter, as for interarrival jitter in RFC 3550
+JITTER_GAIN = 1 / 16
+
+StreamKey = Tuple[int, int]
+
+
+class MessageStatistics:
+    """Rate and interval jitter of one message of a stream."""
+
+    __slots__ = ("packets", "window", "last_time", "last_interval", "jitter")
+
+    def __init__(self, buckets: int, bucket_seconds: float):
+        self.packets = 0
+        self.window = WindowedCounter(buckets, bucket_seconds)
+        self.last_time: Optional[float] = None
+        self.last_interval: Optional[float] = None
+        self.jitter = 0.0
+
+    def add(self, time: float) -> None:
+        self.packets += 1
+        self.window.add(time)
+        if self.last_time is not None:
+            interval = time - self.last_time
+            if self.last_interval is not None:
+                deviation = abs(interval - self.last_interval)
+                self.jitter += (deviation - self.jitter) * JITTER_GAIN
+            self.last_interval = interval
+        self.last_time = time
+
+
+class StreamStatistics:
+    """Sequence gaps, rates and link usage of one system and component."""
+
+    __slots__ = (
+        "system_id",
+        "component_id",
+        "packets",
+        "bytes",
+        "lost",
+        "duplicates",
+        "reordered",
+        "last_sequence",
+        "packets_window",
+        "bytes_window",
+        "messages",
+        "_buckets",
+        "_bucket_seconds",
+    )
+
+    def __init__(
+        self, system_id: int, component_id: int, buckets: int, bucket_seconds: float
+    ):
+        self.system_id = system_id
+        self.component_id = component_id
+        self.packets = 0
+        self.bytes = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.last_sequence: Optional[int] = None
+        self.packets_window = WindowedCounter(buckets, bucket_seconds)
+        self.bytes_window = WindowedCounter(buckets, bucket_seconds)
+        self.messages: Dict[int, MessageStatistics] = {}
+        self._buckets = buckets
+        self._bucket_seconds = bucket_seconds
+
+    @property
+    def drop_rate(self) -> float:
+        """Share of packets lost according to sequence numbers."""
+        expected = self.packets + self.lost
+        return self.lost / expected if expected else 0.0
+
+    def add(self, packet: MAVLinkPacket, time: float) -> None:
+        if self.last_sequence is not None:
+            step = (packet.sequence - self.last_sequence) & 0xFF
+            if step == 0:
+                self.duplicates += 1
+            elif step >= MAX_SEQUENCE_GAP:
+                self.reordered += 1
+            else:
+                self.lost += step - 1
+        self.last_sequence = packet.sequence
+
+        length = len(packet.raw)
+        self.packets += 1
+        self.bytes += length
+        self.packets_window.add(time)
+        self.bytes_window.add(time, length)
+        message = self.messages.get(packet.message_id)
+        if message is None:
+            message = self.messages[packet.message_id] = MessageStatistics(
+                self._buckets, self._bucket_seconds
+            )
+        message.add(time)
+
+    def summary(
+        self, time: float, message_name: Callable[[int], str] = str
+    ) -> Dict[str, str]:
+        """Renders the statistics into analyzer frame data."""
+        messages = sorted(
+            self.messages.items(), key=lambda item: item[1].packets, reverse=True
+        )
+        return {
+            "stream": f"{self.system_id}:{self.component_id}",
+            "packets": str(self.packets),
+            "lost": str(self.lost),
+            "drop_rate": f"{self.drop_rate * 100:.1f}%",
+            "rate": f"{self.packets_window.rate(time):.1f}/s",
+            "bandwidth": f"{self.bytes_window.rate(time):.0f} B/s",
+            "messages": ", ".join(
+                f"{message_name(message_id)} {message.window.rate(time):.1f} Hz"
+                f" ±{message.jitter * 1000:.1f} ms"
+                for message_id, message in messages
+            ),
+        }
+
+
+class LinkStatistics:
+    """Streaming statistics of every system and component on a link.
+
+    Rates are averaged over a window of buckets, so memory per stream is
+    constant. When a summary interval is set, poll_summary returns
+    summaries of all streams once per interval.
+    """
+
+    def __init__(
+        self,
+        buckets: int = 10,
+        bucket_seconds: float = 1.0,
+        summary_interval: Optional[float] = None,
+    ):
+        self.buckets = buckets
+        self.bucket_seconds = bucket_seconds
+        self.summary_interval = summary_interval
+        self.streams: Dict[StreamKey, StreamStatistics] = {}
+        self.bytes_window = WindowedCounter(buckets, bucket_seconds)
+        self._next_summary: Optional[float] = None
+
+    def add(self, packet: MAVLinkPacket, time: float) -> None:
+        key = (packet.system_id, packet.component_id)
+        stream = self.streams.get(key)
+        if stream is None:
+            stream = self.streams[key] = StreamStatistics(
+                packet.system_id, packet.component_id, self.buckets, self.bucket_seconds
+            )
+        stream.add(packet, time)
+        self.bytes_window.add(time, len(packet.raw))
+
+    def link_usage(self, time: float) -> float:
+        """Bytes per second of all packets over the window."""
+        return self.bytes_window.rate(time)
+
+    def summaries(
+        self, time: float, message_name: Callable[[int], str] = str
+    ) -> List[Dict[str, str]]:
+        """Summary of the whole link followed by one per stream."""
+        return [self._link_summary(time)] + [
+            self.streams[key].summary(time, message_name)
+            for key in sorted(self.streams)
+        ]
+
+    def _link_summary(self, time: float) -> Dict[str, str]:
+        packets = sum(stream.packets for stream in self.streams.values())
+        lost = sum(stream.lost for stream in self.streams.values())
+        drop_rate = lost / (packets + lost) if packets else 0.0
+        rate = sum(stream.packets_window.rate(time) for stream in self.streams.values())
+        return {
+            "stream": "link",
+            "packets": str(packets),
+            "lost": str(lost),
+            "drop_rate": f"{drop_rate * 100:.1f}%",
+            "rate": f"{rate:.1f}/s",
+            "bandwidth": f"{self.link_usage(time):.0f} B/s",
+            "messages": "",
+        }
+
+    def poll_summary(
+        self, time: float, message_name: Callable[[int], str] = str
+    ) -> Optional[List[Dict[str, str]]]:
+        """Returns summaries when the summary interval has passed."""
+        if self.summary_interval is None:
+            return None
+        if self._next_summary is None:
+            self._next_summary = time + self.summary_interval
+            return None
+        if time < self._next_summary:
+            return None
+        while self._next_summary <= time:
+            self._next_summary += self.summary_interval
+        return self.summaries(time, message_name)
@@ -0,0 +1,50 @@
+from array import array
+from typing import Optional
+
+
+class WindowedCounter:
+    """Sum of amounts added over the last window of time.
+
+    Amounts are kept in a fixed ring of buckets, so memory does not grow with
+    the number of additions. Amounts older than the window are dropped.
+    """
+
+    __slots__ = ("bucket_seconds", "_counts", "_bucket", "_first_time")
+
+    def __init__(self, buckets: int = 10, bucket_seconds: float = 1.0):
+        if buckets <= 0 or bucket_seconds <= 0:
+            raise ValueError(f"Invalid window buckets={buckets} of {bucket_seconds}s")
+        self.bucket_seconds = bucket_seconds
+        self._counts = array("d", [0.0]) * buckets
+        self._bucket: Optional[int] = None
+        self._first_time = 0.0
+
+    def add(self, time: float, amount: float = 1.0) -> None:
+        bucket = int(time // self.bucket_seconds)
+        if self._bucket is None:
+            self._first_time = time
+        self._advance(bucket)
+        assert self._bucket is not None
+        if bucket > self._bucket - len(self._counts):
+            self._counts[bucket % len(self._counts)] += amount
+
+    def total(self, time: float) -> float:
+        self._advance(int(time // self.bucket_seconds))
+        return sum(self._counts)
+
+    def rate(self, time: float) -> float:
+        """Amount per second over the window or the time since the first add."""
+        total = self.total(time)
+        assert self._bucket is not None
+        window_start = (self._bucket - len(self._counts) + 1) * self.bucket_seconds
+        elapsed = time - max(window_start, self._first_time)
+        return total / elapsed if elapsed > 0 else 0.0
+
+    def _advance(self, bucket: int) -> None:
+        if self._bucket is None:
+            self._bucket = bucket
+            return
+        steps = min(bucket - self._bucket, len(self._counts))
+        for step in range(1, steps + 1):
+            self._counts[(self._bucket + step) % len(self._counts)] = 0.0
+        self._bucket = max(self._bucket, bucket)
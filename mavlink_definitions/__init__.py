@@ -1,11 +1,15 @@
 from .definitions import MAVLinkDefinitions
+from .merge import DefinitionConflict
 from .types import MAVLinkEnum, MAVLinkMessage, MAVLinkMessageField
 from .parser import get_all_mavlink_definitions
+from .registry import get_shared_definitions
 
 __all__ = [
+    "DefinitionConflict",
     "MAVLinkDefinitions",
     "MAVLinkEnum",
     "MAVLinkMessage",
     "MAVLinkMessageField",
     "get_all_mavlink_definitions",
+    "get_shared_definitions",
 ]
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import pickle
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .parser import MAVLINK_DEFINITION_PATH
+from .types import MAVLinkEnum, MAVLinkMessage
+
+MAVLINK_DEFINITION_CACHE_PATH = os.environ.get(
+    "MAVLINK_DEFINITIONS_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "logic2-mavlink"),
+)
+CACHE_VERSION = 2
+
+SourcesState = Dict[str, Tuple[int, int]]
+Definitions = Tuple[List[MAVLinkMessage], List[MAVLinkEnum]]
+
+
+def get_sources_state(filenames: Iterable[str]) -> SourcesState:
+    state: SourcesState = {}
+    for filename in filenames:
+        stat = os.stat(os.path.join(MAVLINK_DEFINITION_PATH, filename))
+        state[filename] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def load_definitions(filename: str, cache_path: str) -> Optional[Definitions]:
+    """Loads parsed definitions of a dialect, None if the cache is missing or stale."""
+    try:
+        with open(_cache_file(filename, cache_path), "rb") as file:
+            version, sources, messages, enums = pickle.loads(file.read())
+        if version != CACHE_VERSION or get_sources_state(sources) != sources:
+            return None
+    except Exception:
+        return None
+    return messages, enums
+
+
+def store_definitions(
+    filename: str,
+    cache_path: str,
+    sources: Iterable[str],
+    messages: List[MAVLinkMessage],
+    enums: List[MAVLinkEnum],
+) -> None:
+    """Stores parsed definitions, a cache that can't be written is skipped."""
+    cache_file = _cache_file(filename, cache_path)
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        data = (CACHE_VERSION, get_sources_state(sources), messages, enums)
+        os.makedirs(cache_path, exist_ok=True)
+        with open(temp_file, "wb") as file:
+            file.write(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass
+
+
+def _cache_file(filename: str, cache_path: str) -> str:
+    """Returns a file directly in cache_path, also for paths to dialects.
+
+    Dialects outside the definitions directory are told apart by a hash of
+    their resolved path.
+    """
+    name = os.path.basename(filename)
+    if name != filename:
+        path = os.path.realpath(os.path.join(MAVLINK_DEFINITION_PATH, filename))
+        digest = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+        name = f"{name}-{digest}"
+    return os.path.join(cache_path, f"{name}.pickle")
@@ -1,34 +1,139 @@
-from typing import Dict, Union
-from .parser import MAVLINK_DEFINITION_DEFAULT, MAVLinkDefinitionsParser
+from typing import Dict, List, Optional, Sequence, Union
+from .cache import (
+    MAVLINK_DEFINITION_CACHE_PATH,
+    Definitions,
+    load_definitions,
+    store_definitions,
+)
+from .index import MAVLinkDefinitionsFileIndex, MAVLinkDefinitionsIndex
+from .merge import DefinitionConflict, merge_definitions, merge_indexes
+from .parser import (
+    MAVLINK_DEFINITION_DEFAULT,
+    MAVLinkDefinitionsFile,
+    MAVLinkDefinitionsParser,
+)
 from .types import MAVLinkEnum, MAVLinkMessage
 
 
 class MAVLinkDefinitions:
-    def __init__(self, filename: str = MAVLINK_DEFINITION_DEFAULT):
+    """Messages and enums of a dialect and its includes.
+
+    Several dialects can be given in order of precedence and are merged into
+    one index. Messages an earlier dialect defines differently are listed in
+    conflicts. Enums are merged entry by entry, and listed when an entry
+    clashes with one of an earlier dialect.
+
+    In lazy mode the files are only scanned for element offsets, and a
+    message or enum is parsed the first time it is asked for. The binary
+    cache is not used then.
+    """
+
+    def __init__(
+        self,
+        filename: Union[str, Sequence[str]] = MAVLINK_DEFINITION_DEFAULT,
+        cache_path: Optional[str] = MAVLINK_DEFINITION_CACHE_PATH,
+        files: Optional[Dict[str, MAVLinkDefinitionsFile]] = None,
+        lazy: bool = False,
+        file_indexes: Optional[Dict[str, MAVLinkDefinitionsFileIndex]] = None,
+    ):
         self._initialized = False
-        self._messages: Dict[Union[int, str], MAVLinkMessage] = {}
-        self._enums: Dict[str, MAVLinkEnum] = {}
-        self.filename = filename
+        self._messages: Dict[Union[int, str], Optional[MAVLinkMessage]] = {}
+        self._enums: Dict[str, Optional[MAVLinkEnum]] = {}
+        self._index: Optional[MAVLinkDefinitionsIndex] = None
+        self.filenames = (filename,) if isinstance(filename, str) else tuple(filename)
+        if not self.filenames:
+            raise ValueError("No definitions file specified")
+        self.filename = self.filenames[0]
+        self._conflicts: List[DefinitionConflict] = []
+        self.cache_path = cache_path
+        self.lazy = lazy
+        self._files = files
+        self._file_indexes = file_indexes
 
     def init(self):
         self._ensure_initialized()
 
+    @property
+    def conflicts(self) -> List[DefinitionConflict]:
+        self._ensure_initialized()
+        return self._conflicts
+
     def get_message(self, idOrName: Union[int, str]):
         self._ensure_initialized()
-        return self._messages.get(idOrName, None)
+        if self._index is None or idOrName in self._messages:
+            return self._messages.get(idOrName, None)
+        return self._build_message(idOrName)
 
     def get_enum(self, name: str):
         self._ensure_initialized()
-        return self._enums.get(name, None)
+        if self._index is None or name in self._enums:
+            return self._enums.get(name, None)
+        index = self._index
+        location = index.enums.get(name)
+        enum = None if location is None else index.build_enum(location)
+        # Shared definitions are looked up from several threads, setdefault
+        # keeps the first result of concurrent lookups
+        return self._enums.setdefault(name, enum)
+
+    def _build_message(self, idOrName: Union[int, str]) -> Optional[MAVLinkMessage]:
+        index = self._index
+        assert index is not None
+        location = (
+            index.message_ids.get(idOrName)
+            if isinstance(idOrName, int)
+            else index.message_names.get(idOrName)
+        )
+        message = None if location is None else index.build_message(location)
+        return self._messages.setdefault(idOrName, message)
 
     def _ensure_initialized(self):
         if self._initialized:
             return
 
-        parser = MAVLinkDefinitionsParser()
-        parser.parse(self.filename)
-        messages_by_id = {message.id: message for message in parser.messages}
-        messages_by_name = {message.name: message for message in parser.messages}
+        if self.lazy:
+            files = {} if self._file_indexes is None else self._file_indexes
+            indexes = []
+            for filename in self.filenames:
+                index = MAVLinkDefinitionsIndex(files)
+                index.index(filename)
+                indexes.append((filename, index))
+            if len(indexes) == 1:
+                self._index = indexes[0][1]
+            else:
+                self._index, self._conflicts = merge_indexes(indexes, files)
+            self._initialized = True
+            return
+
+        if len(self.filenames) == 1:
+            messages, enums = self._load(self.filename)
+        else:
+            (messages, enums), self._conflicts = merge_definitions(
+                [(filename, self._load(filename)) for filename in self.filenames]
+            )
+
+        messages_by_id = {message.id: message for message in messages}
+        messages_by_name = {message.name: message for message in messages}
         self._messages = {**messages_by_id, **messages_by_name}
-        self._enums = {enum.name: enum for enum in parser.enums}
+        self._enums = {enum.name: enum for enum in enums}
         self._initialized = True
+
+    def _load(self, filename: str) -> Definitions:
+        cached = (
+            None
+            if self.cache_path is None
+            else load_definitions(filename, self.cache_path)
+        )
+        if cached is not None:
+            return cached
+
+        parser = MAVLinkDefinitionsParser(self._files)
+        parser.parse(filename)
+        if self.cache_path is not None:
+            store_definitions(
+                filename,
+                self.cache_path,
+                parser.parsed_files,
+                parser.messages,
+                parser.enums,
+            )
+        return parser.messages, parser.enums
@@ -0,0 +1,128 @@
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+from xml.etree import ElementTree
+
+from .parser import MAVLINK_DEFINITION_PATH, parse_enum_element, parse_message_element
+from .types import MAVLinkEnum, MAVLinkMessage
+
+# Comments are matched first, so elements commented out are skipped
+ELEMENT_PATTERN = re.compile(
+    rb"<!--.*?-->"
+    rb"|<(?P<tag>message|enum)\b(?P<attributes>[^>]*)>"
+    rb"|<include>(?P<include>[^<]*)</include>",
+    re.DOTALL,
+)
+ATTRIBUTE_PATTERN = re.compile(rb'(\w+)\s*=\s*"([^"]*)"')
+END_TAGS = {b"message": b"</message>", b"enum": b"</enum>"}
+
+# File name, start and end offset of an element
+Location = Tuple[str, int, int]
+
+
+class MAVLinkDefinitionsFileIndex:
+    """Byte offsets of the messages and enums of a single definitions file."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.data = b""
+        self.includes: List[str] = []
+        self.messages: List[Tuple[int, str, int, int]] = []
+        self.enums: List[Tuple[str, int, int]] = []
+
+
+def index_file(filename: str) -> MAVLinkDefinitionsFileIndex:
+    """Scans a definitions file for elements without building an XML tree."""
+    with open(os.path.join(MAVLINK_DEFINITION_PATH, filename), "rb") as file:
+        data = file.read()
+    index = MAVLinkDefinitionsFileIndex(filename)
+    index.data = data
+    for match in ELEMENT_PATTERN.finditer(data):
+        if match["include"] is not None:
+            index.includes.append(match["include"].strip().decode("utf-8"))
+            continue
+        tag = match["tag"]
+        if tag is None:
+            continue
+        start = match.start()
+        end = data.find(END_TAGS[tag], match.end())
+        if end < 0:
+            raise ValueError(f"Unclosed {tag.decode()} at offset={start} in {filename}")
+        end += len(END_TAGS[tag])
+        attributes = dict(ATTRIBUTE_PATTERN.findall(match["attributes"]))
+        name = attributes[b"name"].decode("utf-8")
+        if tag == b"message":
+            index.messages.append((int(attributes[b"id"]), name, start, end))
+        else:
+            index.enums.append((name, start, end))
+    return index
+
+
+class MAVLinkDefinitionsIndex:
+    """Locations of the messages and enums of a dialect and its includes.
+
+    Like MAVLinkDefinitionsParser, a later definition of an id or name
+    replaces an earlier one. Messages and enums are built from their XML
+    only when asked for.
+    """
+
+    def __init__(self, files: Optional[Dict[str, MAVLinkDefinitionsFileIndex]] = None):
+        """files holds already indexed files, shared between dialects."""
+        self._files = {} if files is None else files
+        self._indexed_files: Set[str] = set()
+        self.message_ids: Dict[int, Location] = {}
+        self.message_names: Dict[str, Location] = {}
+        self.enums: Dict[str, Location] = {}
+        # Built objects, so lookups by id and by name share one message. The
+        # lock makes concurrent first lookups build an element only once.
+        self._built: Dict[Location, Union[MAVLinkMessage, MAVLinkEnum]] = {}
+        self._lock = threading.Lock()
+
+    def index(self, filename: str) -> None:
+        if filename in self._indexed_files:
+            return
+        self._indexed_files.add(filename)
+        file = self._files.get(filename)
+        if file is None:
+            file = self._files[filename] = index_file(filename)
+        for include in file.includes:
+            self.index(include)
+        for id, name, start, end in file.messages:
+            location = (filename, start, end)
+            self.message_ids[id] = location
+            self.message_names[name] = location
+        for name, start, end in file.enums:
+            self.enums[name] = (filename, start, end)
+
+    def build_message(self, location: Location) -> MAVLinkMessage:
+        return self._build(location, parse_message_element)  # type: ignore
+
+    def build_enum(self, location: Location) -> MAVLinkEnum:
+        return self._build(location, parse_enum_element)  # type: ignore
+
+    def set_enum(self, location: Location, enum: MAVLinkEnum) -> None:
+        """Makes build_enum return enum, merged from several dialects."""
+        with self._lock:
+            self._built[location] = enum
+
+    def _build(
+        self,
+        location: Location,
+        parse: Callable[[ElementTree.Element], Union[MAVLinkMessage, MAVLinkEnum]],
+    ) -> Union[MAVLinkMessage, MAVLinkEnum]:
+        built = self._built.get(location)
+        if built is not None:
+            return built
+        with self._lock:
+            built = self._built.get(location)
+            if built is None:
+                built = self._built[location] = parse(self._element(location))
+            return built
+
+    def element_data(self, location: Location) -> bytes:
+        filename, start, end = location
+        return self._files[filename].data[start:end]
+
+    def _element(self, location: Location) -> ElementTree.Element:
+        return ElementTree.fromstring(self.element_data(location))
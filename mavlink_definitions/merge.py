@@ -0,0 +1,211 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+from .cache import Definitions
+from .index import Location, MAVLinkDefinitionsFileIndex, MAVLinkDefinitionsIndex
+from .types import MAVLinkEnum, MAVLinkMessage
+
+
+class DefinitionConflict:
+    """A message or enum defined differently by two merged dialects.
+
+    The definition of the earlier dialect is kept, the other one is dropped.
+    For enums only the clashing entries are dropped.
+    """
+
+    __slots__ = ("kind", "key", "dialect", "conflicting_dialect")
+
+    def __init__(
+        self, kind: str, key: Hashable, dialect: str, conflicting_dialect: str
+    ):
+        self.kind = kind
+        self.key = key
+        self.dialect = dialect
+        self.conflicting_dialect = conflicting_dialect
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.kind} {self.key} of {self.conflicting_dialect} conflicts with "
+            f"{self.dialect}, using {self.dialect}"
+        )
+
+
+def message_signature(message: MAVLinkMessage) -> Hashable:
+    return (
+        message.id,
+        message.name,
+        tuple(
+            (field.name, field.type, field.enum, field.extension)
+            for field in message.fields
+        ),
+    )
+
+
+def merge_enum(enum: MAVLinkEnum, other: MAVLinkEnum) -> Tuple[MAVLinkEnum, bool]:
+    """Adds the entries of other that enum lacks, enum itself if there are none.
+
+    Also returns whether an entry of other clashes with one of enum, having
+    the same value under another name or the same name with another value.
+    Clashing entries are dropped.
+    """
+    names = set(enum.values.values())
+    added: Dict[int, str] = {}
+    clash = False
+    for value, name in other.values.items():
+        kept = enum.values.get(value)
+        if kept is None and name not in names:
+            added[value] = name
+        elif kept != name:
+            clash = True
+    if not added:
+        return enum, clash
+    merged = MAVLinkEnum()
+    merged.name = enum.name
+    merged.values = {**enum.values, **added}
+    merged.bitmask = enum.bitmask
+    merged.deprecated = enum.deprecated
+    return merged, clash
+
+
+class _Merger:
+    """Keeps the first definition of every key and records differing ones."""
+
+    def __init__(self):
+        self.conflicts: List[DefinitionConflict] = []
+        self._kept: Dict[Tuple[str, Hashable], Tuple[Hashable, str]] = {}
+
+    def conflict(
+        self, kind: str, key: Hashable, signature: Hashable, dialect: str
+    ) -> Optional[DefinitionConflict]:
+        """Returns the conflict with an earlier definition of key, if any."""
+        kept = self._kept.get((kind, key))
+        if kept is None or kept[0] == signature:
+            return None
+        return DefinitionConflict(kind, key, kept[1], dialect)
+
+    def keep(self, kind: str, key: Hashable, signature: Hashable, dialect: str):
+        self._kept.setdefault((kind, key), (signature, dialect))
+
+    def add(
+        self, keys: Sequence[Tuple[str, Hashable]], signature: Hashable, dialect: str
+    ) -> bool:
+        """Returns True when the definition is new under all of its keys.
+
+        A definition conflicting under several keys is reported once.
+        """
+        for kind, key in keys:
+            conflict = self.conflict(kind, key, signature, dialect)
+            if conflict is not None:
+                self.conflicts.append(conflict)
+                return False
+        new = any((kind, key) not in self._kept for kind, key in keys)
+        for kind, key in keys:
+            self.keep(kind, key, signature, dialect)
+        return new
+
+
+class _EnumMerger:
+    """Merges the entries of same-named enums of several dialects.
+
+    Dialects often extend an enum of a shared include, so only entries that
+    clash are conflicts.
+    """
+
+    def __init__(self, conflicts: List[DefinitionConflict]):
+        self.conflicts = conflicts
+        self.enums: Dict[str, Tuple[MAVLinkEnum, str]] = {}
+
+    def add(self, enum: MAVLinkEnum, dialect: str) -> None:
+        kept = self.enums.get(enum.name)
+        if kept is None:
+            self.enums[enum.name] = (enum, dialect)
+            return
+        merged, clash = merge_enum(kept[0], enum)
+        self.enums[enum.name] = (merged, kept[1])
+        if clash:
+            self.conflicts.append(
+                DefinitionConflict("enum", enum.name, kept[1], dialect)
+            )
+
+
+def merge_definitions(
+    dialects: Sequence[Tuple[str, Definitions]],
+) -> Tuple[Definitions, List[DefinitionConflict]]:
+    """Merges parsed dialects in order, earlier dialects take precedence.
+
+    Messages defined identically by several dialects, usually through a
+    shared include, are not conflicts. Enums of the same name are merged
+    entry by entry.
+    """
+    merger = _Merger()
+    enum_merger = _EnumMerger(merger.conflicts)
+    messages: List[MAVLinkMessage] = []
+    for dialect, (dialect_messages, dialect_enums) in dialects:
+        for message in _effective(dialect_messages, lambda item: (item.id, item.name)):
+            keys = [("message id", message.id), ("message name", message.name)]
+            if merger.add(keys, message_signature(message), dialect):
+                messages.append(message)
+        for enum in _effective(dialect_enums, lambda item: (item.name,)):
+            enum_merger.add(enum, dialect)
+    enums = [enum for enum, _ in enum_merger.enums.values()]
+    return (messages, enums), merger.conflicts
+
+
+def merge_indexes(
+    dialects: Sequence[Tuple[str, MAVLinkDefinitionsIndex]],
+    files: Dict[str, MAVLinkDefinitionsFileIndex],
+) -> Tuple[MAVLinkDefinitionsIndex, List[DefinitionConflict]]:
+    """Like merge_definitions for lazily loaded dialects indexed with files.
+
+    Only elements sharing an id or name with a different element of another
+    dialect are built to be compared, so the result matches merge_definitions.
+    """
+    merged = MAVLinkDefinitionsIndex(files)
+    messages: List[Tuple[str, List[Tuple[str, Hashable]], Location]] = []
+    enums: List[Tuple[str, List[Tuple[str, Hashable]], Location]] = []
+    for dialect, index in dialects:
+        names = {location: name for name, location in index.message_names.items()}
+        for id, location in index.message_ids.items():
+            name = names.get(location)
+            if name is not None:
+                keys = [("message id", id), ("message name", name)]
+                messages.append((dialect, keys, location))
+        for name, location in index.enums.items():
+            enums.append((dialect, [("enum", name)], location))
+
+    locations: Dict[Tuple[str, Hashable], Set[Location]] = {}
+    for _, keys, location in messages + enums:
+        for key in keys:
+            locations.setdefault(key, set()).add(location)
+
+    def contested(keys: List[Tuple[str, Hashable]]) -> bool:
+        return any(len(locations[key]) > 1 for key in keys)
+
+    merger = _Merger()
+    for dialect, keys, location in messages:
+        signature: Hashable = location
+        if contested(keys):
+            signature = message_signature(merged.build_message(location))
+        if merger.add(keys, signature, dialect):
+            merged.message_ids[keys[0][1]] = location  # type: ignore
+            merged.message_names[keys[1][1]] = location  # type: ignore
+    enum_merger = _EnumMerger(merger.conflicts)
+    for dialect, keys, location in enums:
+        if not contested(keys):
+            merged.enums.setdefault(keys[0][1], location)  # type: ignore
+            continue
+        enum = merged.build_enum(location)
+        enum_merger.add(enum, dialect)
+        if enum_merger.enums[enum.name][0] is enum:
+            merged.enums[enum.name] = location
+    for name, (enum, _) in enum_merger.enums.items():
+        merged.set_enum(merged.enums[name], enum)
+    return merged, merger.conflicts
+
+
+def _effective(items, keys) -> List:
+    """Items of a dialect not replaced by a later item with one of its keys."""
+    last = {}
+    for item in items:
+        for key in keys(item):
+            last[key] = item
+    return [item for item in items if all(last[key] is item for key in keys(item))]
@@ -1,5 +1,5 @@
 import os
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 from xml.etree import ElementTree
 from .types import MAVLinkEnum, MAVLinkMessage, MAVLinkMessageField
 
@@ -20,87 +20,132 @@ def get_all_mavlink_definitions():
     ]
 
 
+class MAVLinkDefinitionsFile:
+    """Contents of a single definitions file, without its includes."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.includes: List[str] = []
+        self.messages: List[MAVLinkMessage] = []
+        self.enums: List[MAVLinkEnum] = []
+
+
 class MAVLinkDefinitionsParser:
 
-    def __init__(self):
+    def __init__(self, files: Optional[Dict[str, MAVLinkDefinitionsFile]] = None):
+        """files holds already parsed files, shared between parsers to reuse
+        includes common to several dialects. Newly parsed files are added to it.
+        """
         self._parsed_files: Set[str] = set()
+        self._files = {} if files is None else files
         self.messages: List[MAVLinkMessage] = []
         self.enums: List[MAVLinkEnum] = []
 
+    @property
+    def parsed_files(self) -> Set[str]:
+        return set(self._parsed_files)
+
     def parse(self, filename: str):
         if filename in self._parsed_files:
             return
         self._parsed_files.add(filename)
-        self._parse_file(filename)
+        file = self._files.get(filename)
+        if file is None:
+            file = self._parse_file(filename)
+            self._files[filename] = file
+        for include in file.includes:
+            self.parse(include)
+        self.messages.extend(file.messages)
+        self.enums.extend(file.enums)
 
-    def _parse_file(self, filename: str):
+    def _parse_file(self, filename: str) -> MAVLinkDefinitionsFile:
         xml_tree = ElementTree.parse(os.path.join(MAVLINK_DEFINITION_PATH, filename))
         xml = xml_tree.getroot()
         assert xml.tag == "mavlink"
+        file = MAVLinkDefinitionsFile(filename)
         for child in xml:
             if child.tag == "version" or child.tag == "dialect":
                 pass
             elif child.tag == "include":
-                self._parse_include(child)
+                self._parse_include(file, child)
             elif child.tag == "enums":
-                self._parse_enums(child)
+                self._parse_enums(file, child)
             elif child.tag == "messages":
-                self._parse_messages(child)
+                self._parse_messages(file, child)
             else:
                 raise ValueError(f"Unknown tag={child.tag}")
+        return file
 
-    def _parse_include(self, xml: ElementTree.Element) -> None:
+    def _parse_include(
+        self, file: MAVLinkDefinitionsFile, xml: ElementTree.Element
+    ) -> None:
         assert xml.tag == "include"
         if xml.text is None:
             raise ValueError("Include tag has no filename specified")
-        self._parse_file(xml.text)
+        file.includes.append(xml.text)
 
-    def _parse_enums(self, xml: ElementTree.Element) -> None:
+    def _parse_enums(
+        self, file: MAVLinkDefinitionsFile, xml: ElementTree.Element
+    ) -> None:
         assert xml.tag == "enums"
         for child in xml:
-            self._parse_enum(child)
-
-    def _parse_enum(self, xml: ElementTree.Element) -> None:
-        assert xml.tag == "enum"
-        enum = MAVLinkEnum()
-        enum.name = xml.attrib["name"]
-        enum.bitmask = xml.attrib.get("bitmask", None) == "true"
-        self.enums.append(enum)
-        for child in xml:
-            if child.tag == "description":
-                pass
-            elif child.tag == "deprecated":
-                enum.deprecated = True
-            elif child.tag == "entry":
-                enum.values[int(child.attrib["value"])] = child.attrib["name"]
-            else:
-                raise ValueError(f"Unknown tag={child.tag}")
+            self._parse_enum(file, child)
 
-    def _parse_messages(self, xml: ElementTree.Element) -> None:
+    def _parse_enum(
+        self, file: MAVLinkDefinitionsFile, xml: ElementTree.Element
+    ) -> None:
+        file.enums.append(parse_enum_element(xml))
+
+    def _parse_messages(
+        self, file: MAVLinkDefinitionsFile, xml: ElementTree.Element
+    ) -> None:
         assert xml.tag == "messages"
         for child in xml:
-            self._parse_message(child)
-
-    def _parse_message(self, xml: ElementTree.Element) -> None:
-        assert xml.tag == "message"
-        message = MAVLinkMessage()
-        message.id = int(xml.attrib["id"])
-        message.name = xml.attrib["name"]
-        self.messages.append(message)
-        extensions = False
-        for child in xml:
-            if child.tag == "description" or child.tag == "wip":
-                pass
-            elif child.tag == "extensions":
-                extensions = True
-            elif child.tag == "deprecated":
-                message.deprecated = True
-            elif child.tag == "field":
-                field = MAVLinkMessageField()
-                field.name = child.attrib["name"]
-                field.type = child.attrib["type"]
-                field.enum = child.attrib.get("enum", None)
-                field.extension = extensions
-                message.fields.append(field)
-            else:
-                raise ValueError(f"Unknown tag={child.tag}")
+            self._parse_message(file, child)
+
+    def _parse_message(
+        self, file: MAVLinkDefinitionsFile, xml: ElementTree.Element
+    ) -> None:
+        file.messages.append(parse_message_element(xml))
+
+
+def parse_enum_element(xml: ElementTree.Element) -> MAVLinkEnum:
+    assert xml.tag == "enum"
+    enum = MAVLinkEnum()
+    enum.name = xml.attrib["name"]
+    enum.bitmask = xml.attrib.get("bitmask", None) == "true"
+    for child in xml:
+        if child.tag == "description":
+            pass
+        elif child.tag == "deprecated":
+            enum.deprecated = True
+        elif child.tag == "entry":
+            enum.values[int(child.attrib["value"])] = child.attrib["name"]
+        else:
+            raise ValueError(f"Unknown tag={child.tag}")
+    return enum
+
+
+def parse_message_element(xml: ElementTree.Element) -> MAVLinkMessage:
+    assert xml.tag == "message"
+    message = MAVLinkMessage()
+    message.id = int(xml.attrib["id"])
+    message.name = xml.attrib["name"]
+    extensions = False
+    for child in xml:
+        if child.tag == "description" or child.tag == "wip":
+            pass
+        elif child.tag == "extensions":
+            extensions = True
+        elif child.tag == "deprecated":
+            message.deprecated = True
+        elif child.tag == "field":
+            field = MAVLinkMessageField()
+            field.name = child.attrib["name"]
+            field.type = child.attrib["type"]
+            field.enum = child.attrib.get("enum", None)
+            field.extension = extensions
+            message.fields.append(field)
+        else:
+            raise ValueError(f"Unknown tag={child.tag}")
+    return message
@@ -0,0 +1,34 @@
+import threading
+from typing import Dict, Sequence, Tuple, Union
+
+from .definitions import MAVLinkDefinitions
+from .index import MAVLinkDefinitionsFileIndex
+from .parser import MAVLINK_DEFINITION_DEFAULT, MAVLinkDefinitionsFile
+
+_lock = threading.Lock()
+_definitions: Dict[Tuple[Tuple[str, ...], bool], MAVLinkDefinitions] = {}
+_files: Dict[str, MAVLinkDefinitionsFile] = {}
+_file_indexes: Dict[str, MAVLinkDefinitionsFileIndex] = {}
+
+
+def get_shared_definitions(
+    filename: Union[str, Sequence[str]] = MAVLINK_DEFINITION_DEFAULT,
+    lazy: bool = False,
+) -> MAVLinkDefinitions:
+    """Returns definitions of a dialect shared by the whole process.
+
+    The definitions are initialized before being returned and must be treated
+    as read-only. Include files parsed or indexed for one dialect are reused
+    by others. Several dialects are merged once per distinct ordered set.
+    Lazy definitions only index the files, see MAVLinkDefinitions.
+    """
+    filenames = (filename,) if isinstance(filename, str) else tuple(filename)
+    with _lock:
+        definitions = _definitions.get((filenames, lazy))
+        if definitions is None:
+            definitions = MAVLinkDefinitions(
+                filenames, files=_files, lazy=lazy, file_indexes=_file_indexes
+            )
+            definitions.init()
+            _definitions[(filenames, lazy)] = definitions
+        return definitions
@@ -2,6 +2,8 @@ from typing import Dict, List, Optional
 
 
 class MAVLinkMessage:
+    __slots__ = ("id", "name", "fields", "deprecated")
+
     def __init__(self):
         self.id: int = 0
         self.name: str = ""
@@ -10,6 +12,8 @@ class MAVLinkMessage:
 
 
 class MAVLinkMessageField:
+    __slots__ = ("name", "type", "enum", "extension")
+
     def __init__(self):
         self.name: str = ""
         self.type: str = ""
@@ -18,6 +22,8 @@ class MAVLinkMessageField:
 
 
 class MAVLinkEnum:
+    __slots__ = ("name", "values", "bitmask", "deprecated")
+
     def __init__(self):
         self.name: str = ""
         self.values: Dict[int, str] = {}
@@ -1,10 +1,51 @@
-from .base import MAVLinkParserBase, MAVLinkPacket, ParseResult
+from .base import MAVLinkParserBase, MAVLinkPacket, ParseResult, ParserStats
+from .columnar import ColumnarCollector, MessageColumns
+from .checksum import crc_extra, x25_crc
+from .decoder import LazyFields, MessageDecoder
+from .encoder import MAVLink2Encoder, MessageEncoder
+from .filter import PacketFilter
+from .generator import StreamGenerator, TrafficSource
+from .live import (
+    MAVLinkDatagramProtocol,
+    MAVLinkStreamProtocol,
+    PacketBroadcaster,
+    PacketSubscription,
+)
+from .mavlink import MAVLinkParser
+from .mavlink1 import MAVLink1Parser, MAVLink1Packet
 from .mavlink2 import MAVLink2Parser, MAVLink2Packet
+from .render import PacketRenderer, PayloadMode
+from .signing import SignatureStatus, SignatureVerifier
+from .time_index import ByteTimeIndex
 
 __all__ = [
     "MAVLinkParserBase",
     "MAVLinkPacket",
     "ParseResult",
+    "ParserStats",
+    "MAVLinkParser",
+    "MAVLink1Parser",
+    "MAVLink1Packet",
     "MAVLink2Parser",
     "MAVLink2Packet",
+    "MAVLink2Encoder",
+    "MAVLinkDatagramProtocol",
+    "MAVLinkStreamProtocol",
+    "ByteTimeIndex",
+    "ColumnarCollector",
+    "MessageColumns",
+    "MessageDecoder",
+    "MessageEncoder",
+    "PacketBroadcaster",
+    "PacketFilter",
+    "PacketRenderer",
+    "PacketSubscription",
+    "PayloadMode",
+    "SignatureStatus",
+    "SignatureVerifier",
+    "StreamGenerator",
+    "TrafficSource",
+    "LazyFields",
+    "crc_extra",
+    "x25_crc",
 ]
@@ -1,23 +1,109 @@
+import re
 from abc import abstractmethod
+from collections import deque
 from enum import Enum
-from typing import Dict, Optional, TypeVar, Union, Generic, Type
+from types import MappingProxyType
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Sequence,
+    TypeVar,
+    Union,
+    Generic,
+    Type,
+    ClassVar,
+)
 
 from mavlink_definitions import MAVLinkDefinitions
 
-from .parse_field import FieldValue, fields_in_order, parse_field
+from .checksum import x25_crc
+from .decoder import LazyFields, MessageDecoder
+from .filter import PacketFilter
+from .parse_field import FieldValue
+from .signing import SignatureStatus, SignatureVerifier
+
+
+EMPTY_FIELDS: Mapping[str, FieldValue] = MappingProxyType({})
+
+TSelf = TypeVar("TSelf", bound="MAVLinkPacket")
 
 
 class MAVLinkPacket:
+    """A parsed packet.
+
+    The whole frame is kept in raw, payload and the other parts of the frame
+    are memoryview slices of it created on access.
+    """
+
+    __slots__ = (
+        "raw",
+        "offset",
+        "payload_length",
+        "sequence",
+        "system_id",
+        "component_id",
+        "message_id",
+        "checksum",
+        "checksum_valid",
+        "signature_status",
+        "fields",
+    )
+
+    START_BYTE: ClassVar[int]
+    PAYLOAD_OFFSET: ClassVar[int]
+
     def __init__(self):
-        self.raw: bytearray = bytearray()
+        self.raw: bytes = b""
+        self.offset: int = 0
         self.payload_length: int = 0
         self.sequence: int = 0
         self.system_id: int = 0
         self.component_id: int = 0
         self.message_id: int = 0
-        self.payload: bytearray = bytearray()
         self.checksum: int = 0
-        self.fields: Dict[str, FieldValue] = {}
+        self.checksum_valid: Optional[bool] = None
+        self.signature_status: Optional[SignatureStatus] = None
+        self.fields: Mapping[str, FieldValue] = EMPTY_FIELDS
+
+    @property
+    def payload(self) -> memoryview:
+        start = self.PAYLOAD_OFFSET
+        return memoryview(self.raw)[start : start + self.payload_length]
+
+    @property
+    def signature(self) -> memoryview:
+        """Empty unless the frame is signed."""
+        return memoryview(self.raw)[len(self.raw) :]
+
+    @classmethod
+    @abstractmethod
+    def unpack_header(
+        cls: Type[TSelf], buffer: Union[bytes, bytearray], start: int
+    ) -> Optional[TSelf]:
+        """Creates a packet from the header at start, None if it's incomplete."""
+
+    @abstractmethod
+    def frame_length(self) -> int: ...
+
+    def header_valid(self) -> bool:
+        return True
+
+    def unpack_checksum(self, buffer: Union[bytes, bytearray], start: int) -> None:
+        checksum_offset = start + self.PAYLOAD_OFFSET + self.payload_length
+        self.checksum = buffer[checksum_offset] | buffer[checksum_offset + 1] << 8
+
+    def get_fields(self, names: Iterable[str]) -> Dict[str, FieldValue]:
+        """Returns the named fields present in the packet, decoding only them."""
+        fields = self.fields
+        if isinstance(fields, LazyFields):
+            return fields.pick(names)
+        return {name: fields[name] for name in names if name in fields}
 
 
 class ParseResult(Enum):
@@ -25,49 +111,299 @@ class ParseResult(Enum):
     PACKET_STARTED = 2
 
 
-class ParseByteResult(Enum):
-    NONE = 1
-    PACKET_STARTED = 2
-    PACKET_READY = 3
+class ParserStats:
+    __slots__ = (
+        "packets",
+        "checksum_errors",
+        "header_errors",
+        "bytes_skipped",
+        "packets_recovered",
+        "packets_filtered",
+        "signature_errors",
+        "packets_replayed",
+    )
+
+    def __init__(self):
+        self.packets: int = 0
+        self.checksum_errors: int = 0
+        self.header_errors: int = 0
+        self.bytes_skipped: int = 0
+        self.packets_recovered: int = 0
+        self.packets_filtered: int = 0
+        self.signature_errors: int = 0
+        self.packets_replayed: int = 0
 
 
 TPacket = TypeVar("TPacket", bound=MAVLinkPacket)
 
 
 class MAVLinkParserBase(Generic[TPacket]):
+    """Frames packets of one or more protocol versions from a byte stream.
+
+    The packet class to unpack a frame with is chosen by its start byte.
+    """
+
     def __init__(
         self,
-        packet_cls: Type[TPacket],
+        packet_classes: Sequence[Type[TPacket]],
         definitions: Optional[MAVLinkDefinitions] = None,
+        drop_invalid: bool = True,
+        resync: bool = True,
+        packet_filter: Optional[PacketFilter] = None,
+        signature_verifier: Optional[SignatureVerifier] = None,
     ):
         super().__init__()
-        self.packet = packet_cls()
-        self.packet_cls = packet_cls
+        self.packet_classes: Dict[int, Type[TPacket]] = {
+            packet_cls.START_BYTE: packet_cls for packet_cls in packet_classes
+        }
+        self._start_bytes = bytes(self.packet_classes)
+        self._start_pattern: Pattern[bytes] = re.compile(
+            b"[" + re.escape(self._start_bytes) + b"]"
+        )
         self.definitions = definitions
+        self.drop_invalid = drop_invalid
+        self.resync = resync
+        self.packet_filter = (
+            None if packet_filter is None else packet_filter.resolve(definitions)
+        )
+        self.signature_verifier = signature_verifier
+        self.stats = ParserStats()
+        self.position = 0
+        self._buffer = bytearray()
+        self._needed = 0
+        self._resync_end = 0
+        self._ready: Deque[TPacket] = deque()
+        self._decoders: Dict[int, Optional[MessageDecoder]] = {}
+
+    @property
+    def pending_offset(self) -> Optional[int]:
+        """Stream offset of the incomplete packet held by the parser, if any."""
+        if not self._buffer:
+            return None
+        return self.position - len(self._buffer)
 
     def parse_byte(self, byte: int) -> Union[TPacket, ParseResult]:
-        byte_result = self._parse_byte_impl(byte)
-        if byte_result == ParseByteResult.PACKET_STARTED:
-            return ParseResult.PACKET_STARTED
+        """Parses a single byte.
 
-        if byte_result == ParseByteResult.PACKET_READY:
-            self._deserialize_fields()
-            return self.packet
+        Returns PACKET_STARTED for the start byte of a packet and the packet
+        itself for its last byte. Packets recovered by resynchronisation after
+        a rejected frame are returned one per call on the following bytes.
+        """
+        if not self._buffer and byte not in self._start_bytes:
+            self.position += 1
+            self.stats.bytes_skipped += 1
+            return self._ready.popleft() if self._ready else ParseResult.NONE
 
+        started = not self._buffer
+        self._ready.extend(self.parse_buffer(bytes((byte,))))
+        if self._ready:
+            return self._ready.popleft()
+        if started and self._buffer:
+            return ParseResult.PACKET_STARTED
         return ParseResult.NONE
 
-    @abstractmethod
-    def _parse_byte_impl(self, byte: int) -> ParseByteResult: ...
+    def parse_buffer(self, data: bytes) -> Iterator[TPacket]:
+        """Parses a chunk of bytes and yields every packet completed by it.
 
-    def _deserialize_fields(self):
-        if self.definitions is None:
-            return
-        message = self.definitions.get_message(self.packet.message_id)
-        if message is None:
-            return
+        Bytes of a packet that is not complete yet are kept and joined with
+        the data of the next call.
+        """
+        self._buffer += data
+        self.position += len(data)
+        if len(self._buffer) < self._needed:
+            return iter(())
+        return self._parse_buffer_impl()
+
+    def feed(self, data: bytes) -> List[TPacket]:
+        return list(self.parse_buffer(data))
+
+    def unpack_frame(
+        self, raw: bytes, offset: int = 0, checksum_valid: Optional[bool] = None
+    ) -> TPacket:
+        """Rebuilds a packet from a whole frame framed and checked elsewhere."""
+        packet_cls = self.packet_classes.get(raw[0]) if raw else None
+        packet = None if packet_cls is None else packet_cls.unpack_header(raw, 0)
+        if packet is None or packet.frame_length() != len(raw):
+            raise ValueError(f"Invalid frame at offset={offset}")
+        packet.offset = offset
+        packet.raw = raw
+        packet.unpack_checksum(raw, 0)
+        packet.checksum_valid = checksum_valid
+        if checksum_valid is not False:
+            self._deserialize_fields(packet)
+        return packet
+
+    def _parse_buffer_impl(self) -> Iterator[TPacket]:
+        buffer = self._buffer
+        buffer_offset = self.position - len(buffer)
+        packet_classes = self.packet_classes
+        packet_filter = self.packet_filter
+        signature_verifier = self.signature_verifier
+        single_start_byte = len(self._start_bytes) == 1
+        check_hidden = self.resync and self.definitions is not None
+        offset = 0
+        self._needed = 0
+        try:
+            while True:
+                start = self._find_start(buffer, offset, single_start_byte)
+                if start < 0:
+                    self.stats.bytes_skipped += len(buffer) - offset
+                    offset = len(buffer)
+                    return
+                self.stats.bytes_skipped += start - offset
+                offset = start
+
+                packet = packet_classes[buffer[start]].unpack_header(buffer, start)
+                if packet is None:
+                    return
+                end = start + packet.frame_length()
+                if not self._check_header(packet):
+                    self.stats.header_errors += 1
+                    offset = self._reject(buffer_offset, start, end)
+                    continue
+                if len(buffer) < end:
+                    self._needed = end - start
+                    return
+
+                packet.offset = buffer_offset + start
+                packet.unpack_checksum(buffer, start)
+                packet.checksum_valid = self._check_checksum(packet, buffer, start)
+                if packet.checksum_valid is False:
+                    self.stats.checksum_errors += 1
+                    if self.drop_invalid:
+                        offset = self._reject(buffer_offset, start, end)
+                        continue
+                if not packet.checksum_valid and check_hidden:
+                    hidden = self._find_hidden_frame(buffer, start, end)
+                    if hidden is None:
+                        self._needed = len(buffer) - start + 1
+                        return
+                    if hidden >= 0:
+                        offset = self._skip_to(buffer_offset, start, hidden)
+                        continue
+
+                if packet_filter is not None and not packet_filter.accepts(packet):
+                    self.stats.packets_filtered += 1
+                    offset = end
+                    continue
+
+                packet.raw = bytes(buffer[start:end])
+                if packet.checksum_valid is not False:
+                    self._deserialize_fields(packet)
+                    if signature_verifier is not None:
+                        self._verify_signature(signature_verifier, packet)
+                self.stats.packets += 1
+                if packet.offset < self._resync_end:
+                    self.stats.packets_recovered += 1
+                offset = end
+                yield packet
+        finally:
+            del buffer[:offset]
 
-        data = memoryview(self.packet.payload)
-        fields = fields_in_order(message.fields)
-        for field in fields:
-            data, value = parse_field(self.definitions, field, data)
-            self.packet.fields[field.name] = value
+    def _find_start(
+        self, buffer: bytearray, offset: int, single_start_byte: bool
+    ) -> int:
+        if single_start_byte:
+            return buffer.find(self._start_bytes, offset)
+        match = self._start_pattern.search(buffer, offset)
+        return -1 if match is None else match.start()
+
+    def _find_hidden_frame(
+        self, buffer: bytearray, start: int, end: int
+    ) -> Optional[int]:
+        """Returns the start of a frame with a valid checksum inside [start, end).
+
+        A frame of an unknown message can't be checked, and a frame kept
+        despite a bad checksum can't be trusted, so either is only accepted
+        when no verified frame starts inside it. Returns -1 if there is none,
+        None if more data is needed to tell.
+        """
+        single_start_byte = len(self._start_bytes) == 1
+        position = start + 1
+        while True:
+            candidate = self._find_start(buffer, position, single_start_byte)
+            if candidate < 0 or candidate >= end:
+                return -1
+            position = candidate + 1
+            packet = self.packet_classes[buffer[candidate]].unpack_header(
+                buffer, candidate
+            )
+            if packet is None:
+                return None
+            if (
+                self._get_decoder(packet.message_id) is None
+                or not self._check_header(packet)
+            ):
+                continue
+            if len(buffer) < candidate + packet.frame_length():
+                return None
+            packet.unpack_checksum(buffer, candidate)
+            if self._check_checksum(packet, buffer, candidate):
+                return candidate
+
+    def _skip_to(self, buffer_offset: int, start: int, hidden: int) -> int:
+        """Drops an unverified or invalid frame for a verified one inside it."""
+        self.stats.bytes_skipped += hidden - start
+        self._resync_end = max(self._resync_end, buffer_offset + hidden + 1)
+        return hidden
+
+    def _reject(self, buffer_offset: int, start: int, end: int) -> int:
+        """Returns the buffer offset to continue scanning from after a bad frame.
+
+        In resync mode scanning restarts right after the rejected start byte,
+        so a real packet hidden inside the bad frame is still found.
+        """
+        if not self.resync:
+            self.stats.bytes_skipped += end - start
+            return end
+        self._resync_end = max(self._resync_end, buffer_offset + end)
+        self.stats.bytes_skipped += 1
+        return start + 1
+
+    def _check_header(self, packet: TPacket) -> bool:
+        if not packet.header_valid():
+            return False
+        decoder = self._get_decoder(packet.message_id)
+        return decoder is None or packet.payload_length <= decoder.size
+
+    def _check_checksum(
+        self, packet: TPacket, buffer: bytearray, start: int
+    ) -> Optional[bool]:
+        """Returns None when the message is unknown and can't be validated."""
+        decoder = self._get_decoder(packet.message_id)
+        if decoder is None:
+            return None
+        data = buffer[start + 1 : start + packet.PAYLOAD_OFFSET + packet.payload_length]
+        data.append(decoder.crc_extra)
+        return x25_crc(data) == packet.checksum
+
+    def _verify_signature(self, verifier: SignatureVerifier, packet: TPacket):
+        status = packet.signature_status = verifier.verify(packet)
+        if status == SignatureStatus.INVALID:
+            self.stats.signature_errors += 1
+        elif status == SignatureStatus.REPLAYED:
+            self.stats.packets_replayed += 1
+
+    def _get_decoder(self, message_id: int) -> Optional[MessageDecoder]:
+        if message_id in self._decoders:
+            return self._decoders[message_id]
+        message = (
+            None
+            if self.definitions is None
+            else self.definitions.get_message(message_id)
+        )
+        decoder = (
+            None
+            if self.definitions is None or message is None
+            else MessageDecoder(self.definitions, message)
+        )
+        self._decoders[message_id] = decoder
+        return decoder
+
+    def _deserialize_fields(self, packet: TPacket):
+        decoder = self._get_decoder(packet.message_id)
+        if decoder is None:
+            return
+        packet.fields = LazyFields(
+            decoder, packet.raw, packet.PAYLOAD_OFFSET, packet.payload_length
+        )
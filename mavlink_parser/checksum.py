@@ -0,0 +1,39 @@
+import binascii
+from typing import Union
+
+from mavlink_definitions import MAVLinkMessage
+
+from .parse_field import ValueFormat, fields_in_order
+
+# Bit-reversal of every byte value. CRC-16/MCRF4XX (X.25) is the reflected
+# form of the CCITT polynomial that binascii.crc_hqx computes, so the whole
+# buffer can be checked in C by reflecting the input and the result.
+_BIT_REVERSE = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+CRC_INIT = 0xFFFF
+
+
+def _reverse16(value: int) -> int:
+    return _BIT_REVERSE[value & 0xFF] << 8 | _BIT_REVERSE[value >> 8]
+
+
+def x25_crc(data: Union[bytes, bytearray, memoryview], crc: int = CRC_INIT) -> int:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    reflected = data.translate(_BIT_REVERSE)
+    return _reverse16(binascii.crc_hqx(reflected, _reverse16(crc)))
+
+
+def crc_extra(message: MAVLinkMessage) -> int:
+    crc = x25_crc(f"{message.name} ".encode("ascii"))
+    for field in fields_in_order(message.fields):
+        if field.extension:
+            break
+        format = ValueFormat.get(field.type)
+        field_type = field.type.split("[")[0]
+        if field_type == "uint8_t_mavlink_version":
+            field_type = "uint8_t"
+        crc = x25_crc(f"{field_type} {field.name} ".encode("ascii"), crc)
+        if format.is_array or format.is_string:
+            crc = x25_crc(bytes([format.length]), crc)
+    return (crc & 0xFF) ^ (crc >> 8)
@@ -0,0 +1,341 @@
+"""Decodes raw MAVLink byte dumps and tlog files outside Logic 2.
+
+    python -m mavlink_parser capture.bin -d common.xml -f jsonl -o out.jsonl -j 8
+
+Large files are split into chunks decoded in parallel by a process pool.
+Every worker starts parsing some way before its chunk boundary, so its framing
+has settled by the start of the chunk, and reads past the end of its chunk to
+complete the last packet it started.
+Packets are stitched back in order, dropping any overlapping the previous one.
+
+With --batch-size the file is framed sequentially instead, and batches of
+frames are decoded and formatted by the workers, see DecodePipeline.
+"""
+
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum
+from typing import Deque, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from mavlink_definitions import get_shared_definitions
+
+from .base import MAVLinkPacket
+from .decoder import LazyFields
+from .filter import PacketFilter, parse_id_list
+from .mavlink import MAVLinkParser
+from .mavlink2 import MAVLink2Packet
+from .pipeline import DEFAULT_BATCH_SIZE, DecodePipeline, Frame, frame_batches
+from .render import PacketRenderer
+
+# Longest possible frame: signed MAVLink 2 packet with a 255 byte payload
+MAX_FRAME_LENGTH = 280
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+# Bytes parsed ahead of a chunk to settle framing before its first packet
+SYNC_MARGIN = 4 * 1024
+MAX_PENDING_CHUNKS_PER_JOB = 2
+
+CSV_COLUMNS = [
+    "offset",
+    "version",
+    "sequence",
+    "system_id",
+    "component_id",
+    "message_id",
+    "message",
+    "checksum_valid",
+    "fields",
+]
+
+# Start offset, end offset and output line of a decoded packet
+Record = Tuple[int, int, str]
+
+
+class OutputFormat(Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+class DecodeOptions:
+    def __init__(
+        self,
+        definitions: Union[str, Sequence[str], None] = None,
+        output_format: OutputFormat = OutputFormat.JSONL,
+        packet_filter: Optional[PacketFilter] = None,
+    ):
+        self.definitions = definitions
+        self.output_format = output_format
+        self.packet_filter = packet_filter
+
+
+class DecodeResult:
+    def __init__(self, size: int, packets: int, seconds: float, jobs: int):
+        self.size = size
+        self.packets = packets
+        self.seconds = seconds
+        self.jobs = jobs
+
+    def __str__(self) -> str:
+        seconds = max(self.seconds, 1e-9)
+        return (
+            f"{self.size / 1e6:.1f} MB, {self.packets} packets in {seconds:.2f} s"
+            f" with {self.jobs} jobs: {self.size / 1e6 / seconds:.1f} MB/s,"
+            f" {self.packets / seconds:.0f} packets/s"
+        )
+
+
+class _RecordFormatter:
+    def __init__(self, options: DecodeOptions):
+        definitions = (
+            None
+            if options.definitions is None
+            else get_shared_definitions(options.definitions)
+        )
+        self.options = options
+        self.renderer = PacketRenderer(definitions)
+        self.parser = MAVLinkParser(definitions, packet_filter=options.packet_filter)
+        self._csv_buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._csv_buffer, lineterminator="\n")
+
+    def format(self, packet: MAVLinkPacket, offset: int) -> str:
+        fields = packet.fields
+        values = [
+            offset,
+            2 if isinstance(packet, MAVLink2Packet) else 1,
+            packet.sequence,
+            packet.system_id,
+            packet.component_id,
+            packet.message_id,
+            self.renderer.message_name(packet.message_id),
+            packet.checksum_valid,
+            fields.to_dict() if isinstance(fields, LazyFields) else dict(fields),
+        ]
+        if self.options.output_format == OutputFormat.JSONL:
+            return json.dumps(dict(zip(CSV_COLUMNS, values))) + "\n"
+
+        values[-1] = json.dumps(values[-1])
+        self._csv_writer.writerow(values)
+        line = self._csv_buffer.getvalue()
+        self._csv_buffer.seek(0)
+        self._csv_buffer.truncate()
+        return line
+
+
+def iter_records(
+    path: str, start: int, end: int, options: DecodeOptions
+) -> Iterator[Record]:
+    """Decodes packets starting in [start, end) of a file.
+
+    Parsing starts SYNC_MARGIN bytes before start, so a start byte inside
+    a packet crossing the chunk boundary can't throw off the framing of the
+    packets in the chunk.
+    """
+    formatter = _RecordFormatter(options)
+    parser = formatter.parser
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            origin = max(0, start - SYNC_MARGIN)
+            # A frame starting before end may wait for a frame inside it
+            stop = min(end + 2 * MAX_FRAME_LENGTH, len(data))
+            position = origin
+            while position < stop:
+                if position >= end and parser.pending_offset is None:
+                    return
+                block_end = min(position + READ_SIZE, stop)
+                for packet in parser.parse_buffer(data[position:block_end]):
+                    offset = origin + packet.offset
+                    if offset >= end:
+                        return
+                    if offset < start:
+                        continue
+                    line = formatter.format(packet, offset)
+                    yield offset, offset + len(packet.raw), line
+                position = block_end
+
+
+# Options and formatter of a pipeline worker, per thread for thread pools
+_worker = threading.local()
+
+
+def _init_worker(options: DecodeOptions) -> None:
+    _worker.options = options
+
+
+def decode_frames(frames: List[Frame]) -> Tuple[str, int]:
+    """Formats a batch of frames in a pipeline worker, returns the text and count."""
+    formatter = getattr(_worker, "formatter", None)
+    if formatter is None:
+        formatter = _worker.formatter = _RecordFormatter(_worker.options)
+    unpack_frame = formatter.parser.unpack_frame
+    lines = [
+        formatter.format(unpack_frame(raw, offset, checksum_valid), offset)
+        for offset, raw, checksum_valid in frames
+    ]
+    return "".join(lines), len(lines)
+
+
+def decode_chunk(
+    path: str, start: int, end: int, options: DecodeOptions
+) -> List[Record]:
+    return list(iter_records(path, start, end, options))
+
+
+def decode_file(
+    path: str,
+    output: TextIO,
+    options: DecodeOptions,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> DecodeResult:
+    started = time.perf_counter()
+    size = os.path.getsize(path)
+    _write_header(output, options)
+
+    packets = 0
+    if jobs <= 1 or size <= chunk_size:
+        for _, _, line in iter_records(path, 0, size, options):
+            output.write(line)
+            packets += 1
+        return DecodeResult(size, packets, time.perf_counter() - started, 1)
+
+    boundaries = list(range(0, size, chunk_size)) + [size]
+    emitted_end = 0
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            # Decoded chunks are held until written, so only a few are queued
+            if len(pending) >= MAX_PENDING_CHUNKS_PER_JOB * jobs:
+                packets, emitted_end = _write_records(
+                    output, pending.popleft().result(), packets, emitted_end
+                )
+            pending.append(executor.submit(decode_chunk, path, start, end, options))
+        while pending:
+            packets, emitted_end = _write_records(
+                output, pending.popleft().result(), packets, emitted_end
+            )
+    return DecodeResult(size, packets, time.perf_counter() - started, jobs)
+
+
+def _write_records(
+    output: TextIO, records: List[Record], packets: int, emitted_end: int
+) -> Tuple[int, int]:
+    """Writes records not overlapping the previous chunk, returns the new counts."""
+    for offset, end, line in records:
+        if offset < emitted_end:
+            continue
+        output.write(line)
+        emitted_end = end
+        packets += 1
+    return packets, emitted_end
+
+
+def pipeline_decode_file(
+    path: str,
+    output: TextIO,
+    options: DecodeOptions,
+    jobs: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_threads: Optional[bool] = None,
+) -> DecodeResult:
+    """Frames the file sequentially and decodes batches of frames in workers."""
+    started = time.perf_counter()
+    size = os.path.getsize(path)
+    _write_header(output, options)
+
+    definitions = (
+        None
+        if options.definitions is None
+        else get_shared_definitions(options.definitions)
+    )
+    parser = MAVLinkParser(definitions, packet_filter=options.packet_filter)
+    pipeline = DecodePipeline(
+        decode_frames,
+        jobs,
+        use_threads=use_threads,
+        initializer=_init_worker,
+        initargs=(options,),
+    )
+    packets = 0
+    with open(path, "rb") as file:
+        chunks = iter(lambda: file.read(READ_SIZE), b"")
+        for text, count in pipeline.map(frame_batches(parser, chunks, batch_size)):
+            output.write(text)
+            packets += count
+    return DecodeResult(size, packets, time.perf_counter() - started, jobs)
+
+
+def _write_header(output: TextIO, options: DecodeOptions) -> None:
+    if options.output_format == OutputFormat.CSV:
+        csv.writer(output, lineterminator="\n").writerow(CSV_COLUMNS)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = argparse.ArgumentParser(
+        prog="python -m mavlink_parser", description="Decodes raw MAVLink captures."
+    )
+    arguments.add_argument("input", help="raw byte dump or tlog file")
+    arguments.add_argument("-o", "--output", help="output file, stdout by default")
+    arguments.add_argument(
+        "-d",
+        "--definitions",
+        action="append",
+        help="definitions file, e.g. common.xml, repeat to merge dialects",
+    )
+    arguments.add_argument(
+        "-f",
+        "--format",
+        choices=[format.value for format in OutputFormat],
+        default=OutputFormat.JSONL.value,
+    )
+    arguments.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    arguments.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="bytes per job"
+    )
+    arguments.add_argument(
+        "--batch-size",
+        type=int,
+        help="decode in a pipeline, formatting this many packets per job",
+    )
+    arguments.add_argument("--include", default="", help="message ids or names")
+    arguments.add_argument("--exclude", default="", help="message ids or names")
+    args = arguments.parse_args(argv)
+
+    options = DecodeOptions(
+        args.definitions,
+        OutputFormat(args.format),
+        PacketFilter(
+            include_messages=parse_id_list(args.include),
+            exclude_messages=parse_id_list(args.exclude),
+        ),
+    )
+
+    def decode(output: TextIO) -> DecodeResult:
+        if args.batch_size is not None:
+            return pipeline_decode_file(
+                args.input, output, options, args.jobs, args.batch_size
+            )
+        return decode_file(args.input, output, options, args.jobs, args.chunk_size)
+
+    if args.output is None:
+        try:
+            result = decode(sys.stdout)
+        except BrokenPipeError:
+            # Output piped into a command that exited early, e.g. head
+            sys.stderr.close()
+            return 1
+    else:
+        with open(args.output, "w", newline="") as output:
+            result = decode(output)
+    print(result, file=sys.stderr)
+    return 0
@@ -0,0 +1,206 @@
+"""Batch decoding of packets into per message NumPy column arrays.
+
+Payloads of each message id are collected into one contiguous buffer and
+decoded at once with a structured dtype matching the wire layout, instead of
+building a dict of fields for every packet.
+"""
+
+import math
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for columnar export
+    np = None  # type: ignore
+
+from mavlink_definitions import MAVLinkDefinitions, MAVLinkEnum, MAVLinkMessage
+
+from .base import MAVLinkPacket
+from .parse_field import ARRAY_FORMAT, ValueFormat, _bitmask_names, fields_in_order
+
+NUMPY_TYPES = {
+    "uint8_t": "<u1",
+    "uint16_t": "<u2",
+    "uint32_t": "<u4",
+    "uint64_t": "<u8",
+    "int8_t": "<i1",
+    "int16_t": "<i2",
+    "int32_t": "<i4",
+    "int64_t": "<i8",
+    "float": "<f4",
+    "double": "<f8",
+    "uint8_t_mavlink_version": "<u1",
+}
+
+
+def message_dtype(message: MAVLinkMessage) -> "np.dtype":
+    """Packed structured dtype of a message payload in wire order."""
+    _require_numpy()
+    layout: List[Tuple] = []
+    for field in fields_in_order(message.fields):
+        format = ValueFormat.get(field.type)
+        if format.is_string:
+            layout.append((field.name, f"S{format.length}"))
+            continue
+        match = re.match(ARRAY_FORMAT, field.type)
+        base_type = field.type if match is None else match["type"]
+        if format.is_array:
+            layout.append((field.name, NUMPY_TYPES[base_type], (format.length,)))
+        else:
+            layout.append((field.name, NUMPY_TYPES[base_type]))
+    return np.dtype(layout)
+
+
+class MessageColumns:
+    """Decoded packets of one message, one array per header column and field."""
+
+    def __init__(
+        self,
+        message: MAVLinkMessage,
+        timestamp: "np.ndarray",
+        offset: "np.ndarray",
+        sequence: "np.ndarray",
+        system_id: "np.ndarray",
+        component_id: "np.ndarray",
+        fields: Dict[str, "np.ndarray"],
+    ):
+        self.message = message
+        self.timestamp = timestamp
+        self.offset = offset
+        self.sequence = sequence
+        self.system_id = system_id
+        self.component_id = component_id
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.offset)
+
+    def to_dict(self) -> Dict[str, "np.ndarray"]:
+        """Header columns followed by field columns, e.g. for a DataFrame."""
+        columns = {
+            "timestamp": self.timestamp,
+            "offset": self.offset,
+            "sequence": self.sequence,
+            "system_id": self.system_id,
+            "component_id": self.component_id,
+        }
+        columns.update(self.fields)
+        return columns
+
+
+class _MessageBatch:
+    def __init__(self, message: MAVLinkMessage):
+        self.message = message
+        self.dtype = message_dtype(message)
+        self.payloads = bytearray()
+        self.timestamps = array("d")
+        self.offsets = array("q")
+        self.headers = bytearray()
+
+    def add(self, packet: MAVLinkPacket, timestamp: float):
+        payload = packet.payload
+        size = self.dtype.itemsize
+        self.payloads += payload[:size]
+        if len(payload) < size:
+            self.payloads += bytes(size - len(payload))
+        self.timestamps.append(timestamp)
+        self.offsets.append(packet.offset)
+        self.headers += bytes(
+            (packet.sequence, packet.system_id, packet.component_id)
+        )
+
+
+class ColumnarCollector:
+    """Collects packets and decodes them into columns per message id.
+
+    Packets of unknown messages and packets with a bad checksum are skipped.
+    """
+
+    def __init__(self, definitions: MAVLinkDefinitions):
+        _require_numpy()
+        self.definitions = definitions
+        self.packets_skipped = 0
+        self._batches: Dict[int, _MessageBatch] = {}
+
+    @property
+    def message_ids(self) -> List[int]:
+        return sorted(self._batches)
+
+    def add(self, packet: MAVLinkPacket, timestamp: float = math.nan):
+        batch = self._batches.get(packet.message_id)
+        if batch is None:
+            message = self.definitions.get_message(packet.message_id)
+            if message is None or packet.checksum_valid is False:
+                self.packets_skipped += 1
+                return
+            batch = self._batches[packet.message_id] = _MessageBatch(message)
+        elif packet.checksum_valid is False:
+            self.packets_skipped += 1
+            return
+        batch.add(packet, timestamp)
+
+    def extend(
+        self,
+        packets: Iterable[MAVLinkPacket],
+        timestamps: Optional[Iterable[float]] = None,
+    ):
+        if timestamps is None:
+            for packet in packets:
+                self.add(packet)
+        else:
+            for packet, timestamp in zip(packets, timestamps):
+                self.add(packet, timestamp)
+
+    def columns(self, message_id: int, map_enums: bool = False) -> MessageColumns:
+        """Decodes all collected packets of a message.
+
+        Field columns are views into a single structured array. With
+        map_enums, enum fields are replaced by object arrays of value names,
+        looking up each distinct value once per column.
+        """
+        batch = self._batches[message_id]
+        records = np.frombuffer(bytes(batch.payloads), dtype=batch.dtype)
+        headers = np.frombuffer(bytes(batch.headers), dtype=np.uint8).reshape(-1, 3)
+        fields = {name: records[name] for name in batch.dtype.names or ()}
+        if map_enums:
+            for field in batch.message.fields:
+                enum = self.definitions.get_enum(field.enum) if field.enum else None
+                if enum is not None:
+                    fields[field.name] = _map_enum(enum, fields[field.name])
+        return MessageColumns(
+            batch.message,
+            np.frombuffer(batch.timestamps, dtype=np.float64),
+            np.frombuffer(batch.offsets, dtype=np.int64),
+            headers[:, 0],
+            headers[:, 1],
+            headers[:, 2],
+            fields,
+        )
+
+    def all_columns(self, map_enums: bool = False) -> Dict[str, MessageColumns]:
+        """Columns of every collected message keyed by message name."""
+        return {
+            self._batches[message_id].message.name: self.columns(
+                message_id, map_enums
+            )
+            for message_id in self.message_ids
+        }
+
+
+def _map_enum(enum: MAVLinkEnum, column: "np.ndarray") -> "np.ndarray":
+    values, inverse = np.unique(column, return_inverse=True)
+    names = np.empty(len(values), dtype=object)
+    for index, value in enumerate(values.tolist()):
+        names[index] = (
+            list(_bitmask_names(enum, value))
+            if enum.bitmask
+            else enum.values.get(value, value)
+        )
+    return names[inverse.reshape(column.shape)]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for columnar export")
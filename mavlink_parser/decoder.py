@@ -0,0 +1,208 @@
+import struct
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+from mavlink_definitions import (
+    MAVLinkDefinitions,
+    MAVLinkMessage,
+    MAVLinkMessageField,
+)
+
+from .checksum import crc_extra
+from .parse_field import (
+    FieldValue,
+    RawValue,
+    ValueFormat,
+    enum_converter,
+    fields_in_order,
+)
+
+Converter = Callable[[RawValue], FieldValue]
+Payload = Union[bytes, bytearray, memoryview]
+
+
+class MessageDecoder:
+    """Decodes payloads of one message with a single precompiled struct.
+
+    Fields are laid out in wire order. Payloads shorter than the full message
+    are zero-padded, as MAVLink2 truncates trailing zero bytes.
+    """
+
+    def __init__(self, definitions: MAVLinkDefinitions, message: MAVLinkMessage):
+        self.message = message
+        self.crc_extra = crc_extra(message)
+
+        fields = list(fields_in_order(message.fields))
+        formats = [ValueFormat.get(field.type) for field in fields]
+        self.struct = struct.Struct(
+            "<" + "".join(format.raw_format[1:] for format in formats)
+        )
+        self.size = self.struct.size
+        self._padding = bytes(self.size)
+
+        self.names = [field.name for field in fields]
+        self.name_set = frozenset(self.names)
+        self._fields = list(zip(fields, formats))
+        self._field_decoders: Optional[Dict[str, _FieldDecoder]] = None
+        self._has_arrays = any(format.is_array for format in formats)
+        self._layout: List[Tuple[str, int, int]] = []
+        self._converters: List[Tuple[str, Converter]] = []
+        index = 0
+        for field, format in zip(fields, formats):
+            count = format.length if format.is_array else 1
+            self._layout.append((field.name, index, count))
+            index += count
+            converter = _field_converter(definitions, field, format)
+            if converter is not None:
+                self._converters.append((field.name, converter))
+
+    def decode(self, payload: Payload) -> Dict[str, FieldValue]:
+        payload = self._pad(payload)
+        values = self.struct.unpack_from(payload)
+
+        fields: Dict[str, FieldValue]
+        if not self._has_arrays:
+            fields = dict(zip(self.names, values))
+        else:
+            fields = {
+                name: (
+                    values[index]
+                    if count == 1
+                    else list(values[index : index + count])
+                )
+                for name, index, count in self._layout
+            }
+        for name, converter in self._converters:
+            fields[name] = converter(cast(RawValue, fields[name]))
+        return fields
+
+    def decode_fields(
+        self, payload: Payload, names: Iterable[str]
+    ) -> Dict[str, FieldValue]:
+        """Decodes only the named fields, unknown names are skipped."""
+        field_decoders = self._get_field_decoders()
+        payload = self._pad(payload)
+        fields: Dict[str, FieldValue] = {}
+        for name in names:
+            field_decoder = field_decoders.get(name)
+            if field_decoder is not None:
+                fields[name] = field_decoder.decode(payload)
+        return fields
+
+    def _pad(self, payload: Payload) -> Payload:
+        if len(payload) < self.size:
+            return bytes(payload) + self._padding[len(payload) :]
+        return payload
+
+    def _get_field_decoders(self) -> Dict[str, "_FieldDecoder"]:
+        if self._field_decoders is None:
+            converters = dict(self._converters)
+            field_decoders: Dict[str, _FieldDecoder] = {}
+            offset = 0
+            for field, format in self._fields:
+                field_decoder = _FieldDecoder(
+                    offset, format, converters.get(field.name)
+                )
+                field_decoders[field.name] = field_decoder
+                offset += field_decoder.struct.size
+            self._field_decoders = field_decoders
+        return self._field_decoders
+
+
+class _FieldDecoder:
+    def __init__(
+        self, offset: int, format: ValueFormat, converter: Optional[Converter]
+    ):
+        self.offset = offset
+        self.struct = struct.Struct(format.raw_format)
+        self.is_array = format.is_array
+        self.converter = converter
+
+    def decode(self, payload: Payload) -> FieldValue:
+        values = self.struct.unpack_from(payload, self.offset)
+        value: FieldValue = list(values) if self.is_array else values[0]
+        if self.converter is not None:
+            value = self.converter(value)  # type: ignore
+        return value
+
+
+class LazyFields(Mapping[str, FieldValue]):
+    """Packet fields decoded from the payload on first access.
+
+    Names and membership are answered from the message layout without
+    decoding. pick decodes just the requested fields when the whole
+    payload has not been decoded yet.
+    """
+
+    __slots__ = ("_decoder", "_raw", "_start", "_end", "_fields")
+
+    def __init__(self, decoder: MessageDecoder, raw: bytes, start: int, length: int):
+        self._decoder = decoder
+        self._raw = raw
+        self._start = start
+        self._end = start + length
+        self._fields: Optional[Dict[str, FieldValue]] = None
+
+    @property
+    def _payload(self) -> memoryview:
+        return memoryview(self._raw)[self._start : self._end]
+
+    @property
+    def decoded(self) -> bool:
+        return self._fields is not None
+
+    def to_dict(self) -> Dict[str, FieldValue]:
+        if self._fields is None:
+            self._fields = self._decoder.decode(self._payload)
+        return self._fields
+
+    def pick(self, names: Iterable[str]) -> Dict[str, FieldValue]:
+        if self._fields is None:
+            return self._decoder.decode_fields(self._payload, names)
+        return {name: self._fields[name] for name in names if name in self._fields}
+
+    def __getitem__(self, name: str) -> FieldValue:
+        return self.to_dict()[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._decoder.name_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decoder.names)
+
+    def __len__(self) -> int:
+        return len(self._decoder.names)
+
+    def __repr__(self) -> str:
+        return f"LazyFields({self.to_dict()!r})"
+
+
+def _field_converter(
+    definitions: MAVLinkDefinitions,
+    field: MAVLinkMessageField,
+    format: ValueFormat,
+) -> Optional[Converter]:
+    if format.is_string:
+        return _decode_string
+    enum = definitions.get_enum(field.enum) if field.enum else None
+    if enum is None:
+        return None
+    convert = enum_converter(enum)
+    if format.is_array:
+        return lambda values: [convert(value) for value in values]  # type: ignore
+    return convert  # type: ignore
+
+
+def _decode_string(value: RawValue) -> str:
+    assert isinstance(value, bytes)
+    return value.decode("ascii", errors="replace").rstrip("\x00")
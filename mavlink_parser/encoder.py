@@ -0,0 +1,214 @@
+import struct
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from mavlink_definitions import (
+    MAVLinkDefinitions,
+    MAVLinkEnum,
+    MAVLinkMessage,
+    MAVLinkMessageField,
+)
+
+from .checksum import crc_extra, x25_crc
+from .mavlink2 import HEADER_STRUCT, INCOMPAT_FLAG_SIGNED, START_BYTE
+from .parse_field import ValueFormat, fields_in_order
+from .signing import sign_frame, signing_timestamp
+
+Encoder = Callable[[Any], Any]
+
+
+class MessageEncoder:
+    """Packs field values of one message into a payload.
+
+    The inverse of MessageDecoder: accepts the values it produces, so enum
+    names, lists of bitmask flag names and str for char arrays, as well as
+    raw numbers and bytes. Missing fields are zero.
+    """
+
+    def __init__(self, definitions: MAVLinkDefinitions, message: MAVLinkMessage):
+        self.message = message
+        self.crc_extra = crc_extra(message)
+
+        fields = list(fields_in_order(message.fields))
+        formats = [ValueFormat.get(field.type) for field in fields]
+        self.struct = struct.Struct(
+            "<" + "".join(format.raw_format[1:] for format in formats)
+        )
+        self.size = self.struct.size
+        self._fields: List[Tuple[str, int, Optional[Encoder]]] = []
+        self._defaults: List[Any] = []
+        for field, format in zip(fields, formats):
+            count = format.length if format.is_array else 1
+            self._fields.append(
+                (field.name, count, _field_encoder(definitions, field, format))
+            )
+            self._defaults.extend([b"" if format.is_string else 0] * count)
+
+    def encode(self, fields: Mapping[str, Any]) -> bytes:
+        values = list(self._defaults)
+        index = 0
+        for name, count, encoder in self._fields:
+            value = fields.get(name)
+            if value is not None:
+                if encoder is not None:
+                    value = encoder(value)
+                if count == 1:
+                    values[index] = value
+                else:
+                    value = list(value)[:count]
+                    values[index : index + len(value)] = value
+            index += count
+        return self.struct.pack(*values)
+
+
+class MAVLink2Encoder:
+    """Encodes messages into MAVLink 2 frames.
+
+    Payloads are truncated and sequence numbers are counted per system and
+    component. With a signing key, frames are signed with a timestamp that
+    strictly increases per system and component.
+    """
+
+    def __init__(
+        self,
+        definitions: MAVLinkDefinitions,
+        system_id: int = 1,
+        component_id: int = 1,
+        signing_key: Optional[bytes] = None,
+        link_id: int = 0,
+    ):
+        self.definitions = definitions
+        self.system_id = system_id
+        self.component_id = component_id
+        self.signing_key = signing_key
+        self.link_id = link_id
+        self._encoders: Dict[Union[int, str], MessageEncoder] = {}
+        self._sequences: Dict[Tuple[int, int], int] = {}
+        self._timestamps: Dict[Tuple[int, int], int] = {}
+
+    def get_encoder(self, message: Union[int, str]) -> MessageEncoder:
+        encoder = self._encoders.get(message)
+        if encoder is None:
+            definition = self.definitions.get_message(message)
+            if definition is None:
+                raise ValueError(f"Unknown message={message}")
+            encoder = self._encoders[message] = MessageEncoder(
+                self.definitions, definition
+            )
+        return encoder
+
+    def encode(
+        self,
+        message: Union[int, str],
+        fields: Mapping[str, Any],
+        system_id: Optional[int] = None,
+        component_id: Optional[int] = None,
+        timestamp: Optional[int] = None,
+    ) -> bytes:
+        encoder = self.get_encoder(message)
+        system_id = self.system_id if system_id is None else system_id
+        component_id = self.component_id if component_id is None else component_id
+        key = (system_id, component_id)
+        sequence = self._sequences.get(key, 0)
+        self._sequences[key] = (sequence + 1) & 0xFF
+
+        if self.signing_key is not None:
+            if timestamp is None:
+                timestamp = signing_timestamp()
+            timestamp = max(timestamp, self._timestamps.get(key, -1) + 1)
+            self._timestamps[key] = timestamp
+
+        return pack_frame(
+            encoder.message.id,
+            encoder.encode(fields),
+            encoder.crc_extra,
+            sequence,
+            system_id,
+            component_id,
+            self.signing_key,
+            self.link_id,
+            timestamp or 0,
+        )
+
+
+def truncate_payload(payload: bytes) -> bytes:
+    """Strips trailing zero bytes, keeping at least one byte."""
+    return payload.rstrip(b"\x00") or payload[:1]
+
+
+def pack_frame(
+    message_id: int,
+    payload: bytes,
+    extra: int,
+    sequence: int,
+    system_id: int,
+    component_id: int,
+    signing_key: Optional[bytes] = None,
+    link_id: int = 0,
+    timestamp: int = 0,
+    truncate: bool = True,
+) -> bytes:
+    if truncate:
+        payload = truncate_payload(payload)
+    frame = bytearray(
+        HEADER_STRUCT.pack(
+            START_BYTE,
+            len(payload),
+            INCOMPAT_FLAG_SIGNED if signing_key is not None else 0,
+            0,
+            sequence,
+            system_id,
+            component_id,
+            message_id & 0xFFFF,
+            message_id >> 16,
+        )
+    )
+    frame += payload
+    checksum = x25_crc(frame[1:] + bytes((extra,)))
+    frame += checksum.to_bytes(2, "little")
+    if signing_key is not None:
+        frame += sign_frame(signing_key, frame, link_id, timestamp)
+    return bytes(frame)
+
+
+def _field_encoder(
+    definitions: MAVLinkDefinitions,
+    field: MAVLinkMessageField,
+    format: ValueFormat,
+) -> Optional[Encoder]:
+    if format.is_string:
+        return _encode_string
+    enum = definitions.get_enum(field.enum) if field.enum else None
+    if enum is None:
+        return None
+    convert = _enum_encoder(enum)
+    if format.is_array:
+        return lambda values: [convert(value) for value in values]
+    return convert
+
+
+def _enum_encoder(enum: MAVLinkEnum) -> Encoder:
+    values = {name: value for value, name in enum.values.items()}
+
+    def value_of(value: Union[int, str]) -> int:
+        if not isinstance(value, str):
+            return value
+        if value not in values:
+            raise ValueError(f"Unknown {enum.name} value={value}")
+        return values[value]
+
+    if not enum.bitmask:
+        return value_of
+
+    def bitmask_of(value: Any) -> int:
+        if isinstance(value, int):
+            return value
+        result = 0
+        for flag in value:
+            result |= value_of(flag)
+        return result
+
+    return bitmask_of
+
+
+def _encode_string(value: Union[str, bytes]) -> bytes:
+    return value.encode("ascii") if isinstance(value, str) else value
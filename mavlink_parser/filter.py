@@ -0,0 +1,108 @@
+from typing import TYPE_CHECKING, AbstractSet, Iterable, List, Optional, Union
+
+from mavlink_definitions import MAVLinkDefinitions
+
+if TYPE_CHECKING:
+    from .base import MAVLinkPacket
+
+MessageKey = Union[int, str]
+
+
+class PacketFilter:
+    """Selects packets by message, system and component id from their header.
+
+    An include list keeps only the listed values, an exclude list drops them.
+    Messages can be given by id or by name; names are resolved to ids once
+    by resolve.
+    """
+
+    def __init__(
+        self,
+        include_messages: Optional[Iterable[MessageKey]] = None,
+        exclude_messages: Optional[Iterable[MessageKey]] = None,
+        include_systems: Optional[Iterable[int]] = None,
+        exclude_systems: Optional[Iterable[int]] = None,
+        include_components: Optional[Iterable[int]] = None,
+        exclude_components: Optional[Iterable[int]] = None,
+    ):
+        self.include_messages = _to_set(include_messages)
+        self.exclude_messages = _to_set(exclude_messages)
+        self.include_systems = _to_set(include_systems)
+        self.exclude_systems = _to_set(exclude_systems)
+        self.include_components = _to_set(include_components)
+        self.exclude_components = _to_set(exclude_components)
+
+    def resolve(self, definitions: Optional[MAVLinkDefinitions]) -> "PacketFilter":
+        """Returns a filter with message names replaced by their ids."""
+        return PacketFilter(
+            _resolve_messages(definitions, self.include_messages),
+            _resolve_messages(definitions, self.exclude_messages),
+            self.include_systems,
+            self.exclude_systems,
+            self.include_components,
+            self.exclude_components,
+        )
+
+    def accepts(self, packet: "MAVLinkPacket") -> bool:
+        return (
+            _matches(packet.message_id, self.include_messages, self.exclude_messages)
+            and _matches(packet.system_id, self.include_systems, self.exclude_systems)
+            and _matches(
+                packet.component_id, self.include_components, self.exclude_components
+            )
+        )
+
+
+def parse_id_list(text: str) -> Optional[List[MessageKey]]:
+    """Parses a comma separated list of ids and names, None if it's empty."""
+    items = [item.strip() for item in text.split(",")]
+    values: List[MessageKey] = [
+        int(item, 0) if item[0].isdigit() else item for item in items if item
+    ]
+    return values or None
+
+
+def parse_int_list(text: str) -> Optional[List[int]]:
+    """Parses a comma separated list of ids, None if it's empty."""
+    values: List[int] = []
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            values.append(int(item, 0))
+        except ValueError:
+            raise ValueError(f"Invalid id={item}, expected a number") from None
+    return values or None
+
+
+def _to_set(values: Optional[Iterable]) -> Optional[frozenset]:
+    return None if values is None else frozenset(values)
+
+
+def _matches(
+    value: int,
+    include: Optional[AbstractSet],
+    exclude: Optional[AbstractSet],
+) -> bool:
+    if include is not None and value not in include:
+        return False
+    return exclude is None or value not in exclude
+
+
+def _resolve_messages(
+    definitions: Optional[MAVLinkDefinitions],
+    messages: Optional[AbstractSet[MessageKey]],
+) -> Optional[List[int]]:
+    if messages is None:
+        return None
+    ids: List[int] = []
+    for message in messages:
+        if isinstance(message, int):
+            ids.append(message)
+            continue
+        definition = None if definitions is None else definitions.get_message(message)
+        if definition is None:
+            raise ValueError(f"Unknown message={message}")
+        ids.append(definition.id)
+    return ids
@@ -0,0 +1,168 @@
+"""Fast generation of synthetic MAVLink 2 captures.
+
+Frames of every traffic source are built once for all 256 sequence numbers,
+so generating an unsigned packet is a table lookup. Signed packets only add
+the signature.
+"""
+
+import heapq
+import random
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from mavlink_definitions import MAVLinkDefinitions
+
+from .checksum import x25_crc
+from .encoder import MAVLink2Encoder, pack_frame
+from .mavlink2 import INCOMPAT_FLAG_SIGNED
+from .signing import SIGNING_TIMESTAMP_UNITS, sign_frame, signing_timestamp
+
+WRITE_SIZE = 1024 * 1024
+MAX_NOISE_LENGTH = 32
+INCOMPAT_FLAGS_OFFSET = 2
+
+
+class TrafficSource:
+    """One message sent by a system and component at a fixed rate in Hz."""
+
+    def __init__(
+        self,
+        message: Union[int, str],
+        rate: float,
+        fields: Optional[Mapping[str, Any]] = None,
+        system_id: int = 1,
+        component_id: int = 1,
+        signing_key: Optional[bytes] = None,
+        link_id: int = 0,
+    ):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, rate={rate}")
+        self.message = message
+        self.rate = rate
+        self.fields = fields or {}
+        self.system_id = system_id
+        self.component_id = component_id
+        self.signing_key = signing_key
+        self.link_id = link_id
+
+
+class _SourceState:
+    def __init__(self, encoder: MAVLink2Encoder, source: TrafficSource, counter: int):
+        message = encoder.get_encoder(source.message)
+        payload = message.encode(source.fields)
+        self.source = source
+        self.interval = 1 / source.rate
+        self.signing_key = source.signing_key
+        self.counter = counter
+        # Frames for every sequence number, signed ones without the signature
+        self.frames = [
+            pack_frame(
+                message.message.id,
+                payload,
+                message.crc_extra,
+                sequence,
+                source.system_id,
+                source.component_id,
+            )
+            for sequence in range(256)
+        ]
+        if source.signing_key is not None:
+            self.frames = [
+                _set_signed(frame, message.crc_extra) for frame in self.frames
+            ]
+
+
+class StreamGenerator:
+    """Writes time-ordered traffic of several sources as one byte stream.
+
+    Sequence numbers are counted per system and component, as sources of
+    the same component share one counter. Signature timestamps follow the
+    generated time and strictly increase per system and component.
+    """
+
+    def __init__(
+        self,
+        definitions: MAVLinkDefinitions,
+        sources: List[TrafficSource],
+        noise_ratio: float = 0.0,
+        seed: int = 0,
+        start_time: Optional[float] = None,
+    ):
+        encoder = MAVLink2Encoder(definitions)
+        counters: Dict[Tuple[int, int], int] = {}
+        self._states = [
+            _SourceState(
+                encoder,
+                source,
+                counters.setdefault(
+                    (source.system_id, source.component_id), len(counters)
+                ),
+            )
+            for source in sources
+        ]
+        self._counter_count = len(counters)
+        self.noise_ratio = noise_ratio
+        self.seed = seed
+        self.start_time = signing_timestamp(start_time) / SIGNING_TIMESTAMP_UNITS
+
+    def packets(self) -> Iterator[Tuple[float, bytes]]:
+        """Endless (time, frame) pairs in time order, noise as separate items."""
+        rng = random.Random(self.seed)
+        sequences = [0] * self._counter_count
+        timestamps = [-1] * self._counter_count
+        queue = [
+            (rng.random() * state.interval, index)
+            for index, state in enumerate(self._states)
+        ]
+        heapq.heapify(queue)
+        noise_ratio = self.noise_ratio
+
+        while True:
+            time, index = queue[0]
+            state = self._states[index]
+            heapq.heapreplace(queue, (time + state.interval, index))
+
+            counter = state.counter
+            sequence = sequences[counter]
+            sequences[counter] = (sequence + 1) & 0xFF
+            frame = state.frames[sequence]
+            if state.signing_key is not None:
+                timestamp = int((self.start_time + time) * SIGNING_TIMESTAMP_UNITS)
+                timestamp = max(timestamp, timestamps[counter] + 1)
+                timestamps[counter] = timestamp
+                frame += sign_frame(
+                    state.signing_key, frame, state.source.link_id, timestamp
+                )
+            yield time, frame
+
+            if noise_ratio and rng.random() < noise_ratio:
+                yield time, rng.randbytes(rng.randint(1, MAX_NOISE_LENGTH))
+
+    def generate(self, size: int) -> bytes:
+        """Returns a stream of at least size bytes."""
+        stream = bytearray()
+        packets = self.packets()
+        while len(stream) < size:
+            stream += next(packets)[1]
+        return bytes(stream)
+
+    def write(self, file: BinaryIO, size: int) -> int:
+        """Writes at least size bytes and returns the number written."""
+        written = 0
+        block = bytearray()
+        packets = self.packets()
+        while written + len(block) < size:
+            block += next(packets)[1]
+            if len(block) >= WRITE_SIZE:
+                file.write(block)
+                written += len(block)
+                block = bytearray()
+        file.write(block)
+        return written + len(block)
+
+
+def _set_signed(frame: bytes, extra: int) -> bytes:
+    """Sets the signed flag of an unsigned frame and updates its checksum."""
+    signed = bytearray(frame[:-2])
+    signed[INCOMPAT_FLAGS_OFFSET] |= INCOMPAT_FLAG_SIGNED
+    checksum = x25_crc(signed[1:] + bytes((extra,)))
+    return bytes(signed) + checksum.to_bytes(2, "little")
@@ -0,0 +1,198 @@
+"""Asyncio adapters feeding live serial, TCP or UDP MAVLink traffic to consumers.
+
+    broadcaster = PacketBroadcaster()
+    await loop.create_datagram_endpoint(
+        lambda: MAVLinkDatagramProtocol(broadcaster, definitions),
+        local_addr=("0.0.0.0", 14550),
+    )
+    async for received, packet in broadcaster.subscribe():
+        ...
+
+Every subscriber gets the same packet objects, raw frames included, without
+copying, so packets must be treated as read-only. A subscriber that falls
+behind loses its oldest packets instead of slowing down the others.
+"""
+
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Set, Tuple
+
+from mavlink_definitions import MAVLinkDefinitions
+
+from .base import MAVLinkPacket, MAVLinkParserBase
+from .mavlink2 import MAVLink2Parser
+
+DEFAULT_QUEUE_SIZE = 1024
+READ_SIZE = 64 * 1024
+
+# Event loop time when the bytes completing the packet arrived, and the packet
+Delivery = Tuple[float, MAVLinkPacket]
+ParserFactory = Callable[[], MAVLinkParserBase]
+
+
+class PacketSubscription:
+    """Bounded queue of packets for one consumer, dropping the oldest when full."""
+
+    def __init__(self, broadcaster: "PacketBroadcaster", maxsize: int):
+        if maxsize <= 0:
+            raise ValueError(f"Invalid maxsize={maxsize}")
+        self.dropped = 0
+        self.closed = False
+        self._broadcaster = broadcaster
+        self._queue: Deque[Delivery] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __aiter__(self) -> "PacketSubscription":
+        return self
+
+    async def __anext__(self) -> Delivery:
+        try:
+            return await self.get()
+        except EOFError:
+            raise StopAsyncIteration
+
+    async def get(self) -> Delivery:
+        """Waits for the next packet, raises EOFError once closed and drained."""
+        while not self._queue:
+            if self.closed:
+                raise EOFError("Subscription closed")
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    def put(self, delivery: Delivery) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(delivery)
+        self._ready.set()
+
+    def close(self) -> None:
+        """Stops the subscription, packets already queued can still be read."""
+        if self.closed:
+            return
+        self.closed = True
+        self._broadcaster.unsubscribe(self)
+        self._ready.set()
+
+
+class PacketBroadcaster:
+    """Delivers every published packet to all current subscriptions."""
+
+    def __init__(self):
+        self.closed = False
+        self._subscriptions: Set[PacketSubscription] = set()
+
+    def subscribe(self, maxsize: int = DEFAULT_QUEUE_SIZE) -> PacketSubscription:
+        subscription = PacketSubscription(self, maxsize)
+        if self.closed:
+            subscription.close()
+        else:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PacketSubscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, packet: MAVLinkPacket, received: float) -> None:
+        delivery = (received, packet)
+        for subscription in self._subscriptions:
+            subscription.put(delivery)
+
+    def close(self) -> None:
+        """Ends all subscriptions once they are drained."""
+        self.closed = True
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+
+def _parser_factory(
+    definitions: Optional[MAVLinkDefinitions], parser_factory: Optional[ParserFactory]
+) -> ParserFactory:
+    if parser_factory is not None:
+        return parser_factory
+    return lambda: MAVLink2Parser(definitions)
+
+
+class MAVLinkStreamProtocol(asyncio.Protocol):
+    """Parses a byte stream, e.g. a serial port, TCP connection or pipe.
+
+    The broadcaster is closed when the connection is lost.
+    """
+
+    def __init__(
+        self,
+        broadcaster: PacketBroadcaster,
+        definitions: Optional[MAVLinkDefinitions] = None,
+        parser_factory: Optional[ParserFactory] = None,
+    ):
+        self.broadcaster = broadcaster
+        self.parser = _parser_factory(definitions, parser_factory)()
+        self._loop = asyncio.get_running_loop()
+
+    def data_received(self, data: bytes) -> None:
+        received = self._loop.time()
+        publish = self.broadcaster.publish
+        for packet in self.parser.parse_buffer(data):
+            publish(packet, received)
+
+    def eof_received(self) -> None:
+        self.broadcaster.close()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.broadcaster.close()
+
+
+class MAVLinkDatagramProtocol(asyncio.DatagramProtocol):
+    """Parses UDP datagrams with a separate parser per sender address.
+
+    A packet split between datagrams is still joined, as long as the parts
+    come from the same sender.
+    """
+
+    def __init__(
+        self,
+        broadcaster: PacketBroadcaster,
+        definitions: Optional[MAVLinkDefinitions] = None,
+        parser_factory: Optional[ParserFactory] = None,
+    ):
+        self.broadcaster = broadcaster
+        self.parsers: Dict[Tuple, MAVLinkParserBase] = {}
+        self._parser_factory = _parser_factory(definitions, parser_factory)
+        self._loop = asyncio.get_running_loop()
+
+    def datagram_received(self, data: bytes, addr: Tuple) -> None:
+        received = self._loop.time()
+        parser = self.parsers.get(addr)
+        if parser is None:
+            parser = self.parsers[addr] = self._parser_factory()
+        publish = self.broadcaster.publish
+        for packet in parser.parse_buffer(data):
+            publish(packet, received)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.broadcaster.close()
+
+
+async def read_stream(
+    reader: asyncio.StreamReader,
+    broadcaster: PacketBroadcaster,
+    definitions: Optional[MAVLinkDefinitions] = None,
+    parser_factory: Optional[ParserFactory] = None,
+) -> None:
+    """Parses a stream reader until its end, then closes the broadcaster."""
+    loop = asyncio.get_running_loop()
+    parser = _parser_factory(definitions, parser_factory)()
+    publish = broadcaster.publish
+    try:
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                return
+            received = loop.time()
+            for packet in parser.parse_buffer(data):
+                publish(packet, received)
+    finally:
+        broadcaster.close()
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from mavlink_definitions import MAVLinkDefinitions
+from .base import MAVLinkPacket, MAVLinkParserBase
+from .filter import PacketFilter
+from .mavlink1 import MAVLink1Packet
+from .mavlink2 import MAVLink2Packet
+from .signing import SignatureVerifier
+
+
+class MAVLinkParser(MAVLinkParserBase[MAVLinkPacket]):
+    """Parses streams mixing MAVLink 1 and MAVLink 2 packets.
+
+    Yields MAVLink1Packet or MAVLink2Packet depending on the start byte.
+    """
+
+    def __init__(
+        self,
+        definitions: Optional[MAVLinkDefinitions] = None,
+        drop_invalid: bool = True,
+        resync: bool = True,
+        packet_filter: Optional[PacketFilter] = None,
+        signature_verifier: Optional[SignatureVerifier] = None,
+    ):
+        super().__init__(
+            [MAVLink1Packet, MAVLink2Packet],
+            definitions,
+            drop_invalid,
+            resync,
+            packet_filter,
+            signature_verifier,
+        )
@@ -0,0 +1,53 @@
+import struct
+from typing import Optional, Union
+
+from mavlink_definitions import MAVLinkDefinitions
+from .base import MAVLinkPacket, MAVLinkParserBase
+from .filter import PacketFilter
+
+START_BYTE = 0xFE
+HEADER_LENGTH = 6
+CHECKSUM_LENGTH = 2
+
+# magic, length, seq, sys id, comp id, msg id
+HEADER_STRUCT = struct.Struct("<BBBBBB")
+
+
+class MAVLink1Packet(MAVLinkPacket):
+    __slots__ = ()
+
+    START_BYTE = START_BYTE
+    PAYLOAD_OFFSET = HEADER_LENGTH
+
+    @classmethod
+    def unpack_header(
+        cls, buffer: Union[bytes, bytearray], start: int
+    ) -> Optional["MAVLink1Packet"]:
+        if len(buffer) - start < HEADER_LENGTH:
+            return None
+        packet = cls()
+        (
+            _,
+            packet.payload_length,
+            packet.sequence,
+            packet.system_id,
+            packet.component_id,
+            packet.message_id,
+        ) = HEADER_STRUCT.unpack_from(buffer, start)
+        return packet
+
+    def frame_length(self) -> int:
+        return HEADER_LENGTH + self.payload_length + CHECKSUM_LENGTH
+
+
+class MAVLink1Parser(MAVLinkParserBase[MAVLink1Packet]):
+    def __init__(
+        self,
+        definitions: Optional[MAVLinkDefinitions] = None,
+        drop_invalid: bool = True,
+        resync: bool = True,
+        packet_filter: Optional[PacketFilter] = None,
+    ):
+        super().__init__(
+            [MAVLink1Packet], definitions, drop_invalid, resync, packet_filter
+        )
@@ -1,8 +1,9 @@
 import re
 import struct
-from typing import Dict, Iterator, List, Sequence, Tuple, Union
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Sequence, Tuple, Union
 
-from mavlink_definitions import MAVLinkDefinitions, MAVLinkMessageField
+from mavlink_definitions import MAVLinkDefinitions, MAVLinkEnum, MAVLinkMessageField
 
 ARRAY_FORMAT = r"^(?P<type>.+)\[(?P<length>\d+)\]$"
 VALUE_FORMATS = {
@@ -27,6 +28,10 @@ FIELD_ORDER = [
     ["uint8_t", "int8_t", "char"],
 ]
 
+# Distinct (enum, value) pairs of bitmask fields remembered by the decoder.
+# Health and mode masks repeat over a capture, so a small cache covers them.
+BITMASK_CACHE_SIZE = 4096
+
 
 class ValueFormat:
     def __init__(self, raw_format: str, length: int, is_array: bool, is_string: bool):
@@ -91,7 +96,7 @@ def parse_field(
     if format.is_string:
         string_bytes = raw_value[0]
         assert isinstance(string_bytes, bytes)
-        value = string_bytes.decode("ascii").rstrip("\x00")
+        value = string_bytes.decode("ascii", errors="replace").rstrip("\x00")
         return (new_data, value)
     elif format.is_array:
         values = [_unpack_enum(definitions, field, raw) for raw in raw_value]
@@ -124,14 +129,21 @@ def _unpack_enum(
         return raw_value
 
     assert isinstance(raw_value, int)
-    raw_value = int(raw_value)
+    return enum_converter(enum)(int(raw_value))
+
+
+def enum_converter(enum: MAVLinkEnum) -> Callable[[int], UnpackedValue]:
     if not enum.bitmask:
-        return enum.values.get(raw_value, raw_value)
-    else:
-        result: List[Union[str, int]] = []
-        for bit in range(raw_value.bit_length()):
-            bit_value = 1 << bit
-            if raw_value & bit_value:
-                enum_name = enum.values.get(bit_value, bit_value)
-                result.append(enum_name)
-        return result
+        values = enum.values
+        return lambda raw_value: values.get(raw_value, raw_value)
+    return lambda raw_value: list(_bitmask_names(enum, raw_value))
+
+
+@lru_cache(maxsize=BITMASK_CACHE_SIZE)
+def _bitmask_names(enum: MAVLinkEnum, raw_value: int) -> Tuple[Union[str, int], ...]:
+    result = []
+    for bit in range(raw_value.bit_length()):
+        bit_value = 1 << bit
+        if raw_value & bit_value:
+            result.append(enum.values.get(bit_value, bit_value))
+    return tuple(result)
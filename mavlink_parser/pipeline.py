@@ -0,0 +1,102 @@
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .base import MAVLinkParserBase
+
+# Stream offset, whole frame and checksum_valid of a framed packet
+Frame = Tuple[int, bytes, Optional[bool]]
+
+DEFAULT_BATCH_SIZE = 4096
+TResult = TypeVar("TResult")
+
+
+def free_threaded() -> bool:
+    """True on a Python build running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def frame_batches(
+    parser: MAVLinkParserBase,
+    chunks: Iterable[bytes],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[List[Frame]]:
+    """Frames packets from chunks of a stream into batches of batch_size.
+
+    Only framing, checksums and the packet filter of the parser run here;
+    fields are left to whoever rebuilds the packets with unpack_frame.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"Invalid batch_size={batch_size}")
+    batch: List[Frame] = []
+    for chunk in chunks:
+        for packet in parser.parse_buffer(chunk):
+            batch.append((packet.offset, packet.raw, packet.checksum_valid))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+class DecodePipeline(Generic[TResult]):
+    """Runs decode on batches in a worker pool, returning results in order.
+
+    At most max_pending batches are queued or being decoded at a time, so a
+    fast framing stage waits for the workers instead of filling the memory.
+    Workers are processes unless the interpreter is free-threaded, decode
+    and the initializer must then be picklable module level functions.
+    """
+
+    def __init__(
+        self,
+        decode: Callable[[List[Frame]], TResult],
+        jobs: int,
+        max_pending: Optional[int] = None,
+        use_threads: Optional[bool] = None,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple = (),
+    ):
+        if jobs <= 0:
+            raise ValueError(f"Invalid jobs={jobs}")
+        self.decode = decode
+        self.jobs = jobs
+        self.max_pending = 2 * jobs if max_pending is None else max_pending
+        self.use_threads = free_threaded() if use_threads is None else use_threads
+        self.initializer = initializer
+        self.initargs = initargs
+
+    def map(self, batches: Iterable[List[Frame]]) -> Iterator[TResult]:
+        executor: Executor = (
+            ThreadPoolExecutor(
+                self.jobs, initializer=self.initializer, initargs=self.initargs
+            )
+            if self.use_threads
+            else ProcessPoolExecutor(
+                self.jobs, initializer=self.initializer, initargs=self.initargs
+            )
+        )
+        pending: Deque[Future] = deque()
+        try:
+            for batch in batches:
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(self.decode, batch))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
@@ -0,0 +1,100 @@
+import json
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+from mavlink_definitions import MAVLinkDefinitions
+
+from .base import MAVLinkPacket
+from .decoder import LazyFields
+
+TARGET_FIELDS = ("target_system", "target_component")
+
+# Text of every possible system and component id
+ID_STRINGS = [str(value) for value in range(256)]
+
+
+class PayloadMode(Enum):
+    FULL = "full"
+    COMPACT = "compact"
+    OFF = "off"
+
+
+RouteKey = Tuple[int, int, Optional[int], Optional[int]]
+
+
+class PacketRenderer:
+    """Renders packets into the string data of analyzer frames.
+
+    Message names, routes and compact payload templates are built once and
+    cached. FULL renders the payload as JSON, COMPACT as name=value pairs
+    filled into a per-message template, OFF leaves it out.
+    """
+
+    def __init__(
+        self,
+        definitions: Optional[MAVLinkDefinitions],
+        payload_mode: PayloadMode = PayloadMode.FULL,
+    ):
+        self.definitions = definitions
+        self.payload_mode = payload_mode
+        self._json_encoder = json.JSONEncoder(check_circular=False)
+        self._message_names: Dict[int, str] = {}
+        self._templates: Dict[int, str] = {}
+        self._routes: Dict[RouteKey, str] = {}
+
+    def render(self, packet: MAVLinkPacket) -> Dict[str, str]:
+        data = {
+            "message": self.message_name(packet.message_id),
+            "route": "",
+            "system_id": ID_STRINGS[packet.system_id],
+            "component_id": ID_STRINGS[packet.component_id],
+        }
+        if self.payload_mode == PayloadMode.FULL:
+            data["payload"] = self._json_encoder.encode(_to_dict(packet))
+        elif self.payload_mode == PayloadMode.COMPACT:
+            template = self._get_template(packet)
+            data["payload"] = template.format(*_to_dict(packet).values())
+        data["route"] = self.route(packet)
+        if packet.signature_status is not None:
+            data["signature"] = packet.signature_status.value
+        return data
+
+    def message_name(self, message_id: int) -> str:
+        name = self._message_names.get(message_id)
+        if name is None:
+            message = (
+                None
+                if self.definitions is None
+                else self.definitions.get_message(message_id)
+            )
+            name = message.name if message is not None else f"id({message_id})"
+            self._message_names[message_id] = name
+        return name
+
+    def route(self, packet: MAVLinkPacket) -> str:
+        targets = packet.get_fields(TARGET_FIELDS)
+        key: RouteKey = (
+            packet.system_id,
+            packet.component_id,
+            targets.get("target_system"),  # type: ignore
+            targets.get("target_component"),  # type: ignore
+        )
+        route = self._routes.get(key)
+        if route is None:
+            route = f"{key[0]}:{key[1]}"
+            if len(targets) == len(TARGET_FIELDS):
+                route = f"{route} -> {key[2]}:{key[3]}"
+            self._routes[key] = route
+        return route
+
+    def _get_template(self, packet: MAVLinkPacket) -> str:
+        template = self._templates.get(packet.message_id)
+        if template is None:
+            template = " ".join(f"{name}={{}}" for name in packet.fields)
+            self._templates[packet.message_id] = template
+        return template
+
+
+def _to_dict(packet: MAVLinkPacket) -> Dict:
+    fields = packet.fields
+    return fields.to_dict() if isinstance(fields, LazyFields) else dict(fields)
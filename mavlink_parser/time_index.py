@@ -0,0 +1,53 @@
+from array import array
+from typing import Tuple
+
+
+class ByteTimeIndex:
+    """Start and end time of every byte not yet emitted as part of a packet.
+
+    Times are float offsets in seconds from an arbitrary base, stored in flat
+    arrays indexed by stream offset, so no object is kept per byte. Bytes
+    delivered together are spread evenly over the time of their chunk.
+    """
+
+    __slots__ = ("base_offset", "_starts", "_ends")
+
+    def __init__(self):
+        self.base_offset = 0
+        self._starts = array("d")
+        self._ends = array("d")
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def add(self, offset: int, count: int, start: float, end: float) -> None:
+        if count <= 0:
+            return
+        if not self._starts:
+            self.base_offset = offset
+        elif offset != self.base_offset + len(self._starts):
+            raise ValueError(f"Bytes at offset={offset} are not contiguous")
+
+        if count == 1:
+            self._starts.append(start)
+            self._ends.append(end)
+            return
+        step = (end - start) / count
+        self._starts.extend(start + index * step for index in range(count))
+        self._ends.extend(start + index * step for index in range(1, count + 1))
+
+    def span(self, offset: int, length: int) -> Tuple[float, float]:
+        """Returns the start of the first and the end of the last byte."""
+        first = offset - self.base_offset
+        last = first + length - 1
+        if first < 0 or last >= len(self._starts):
+            raise IndexError(f"No times for bytes at offset={offset}")
+        return self._starts[first], self._ends[last]
+
+    def discard_before(self, offset: int) -> None:
+        count = min(offset - self.base_offset, len(self._starts))
+        if count <= 0:
+            return
+        del self._starts[:count]
+        del self._ends[:count]
+        self.base_offset += count
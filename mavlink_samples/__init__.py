@@ -0,0 +1,38 @@
+"""Sample MAVLink 2 frames shared by the tests and benchmarks.
+
+STREAM joins the frames with a few bytes of noise in between.
+"""
+
+BATTERY_STATUS_PACKET = bytearray.fromhex(
+    "fd2900000c01019300000000000000000000ff7fffffffffffffffffffffffffffffffffffffffff0000000000ff00000000066f93"
+)
+
+COMMAND_LONG_PACKET = bytearray.fromhex(
+    "fd200000b0ffbe4c00000000a0400080bb440000000000000000000000000000000000000000b70001be4966"
+)
+
+HEARTBEAT_PACKET = bytearray.fromhex("fd090000cf0101000000040000000a030105037950")
+
+STATUSTEXT_PACKET = bytearray.fromhex(
+    "fd1000000d0101fd0000064172647550696c6f742052656164798f5b"
+)
+
+SYS_STATUS_PACKET = bytearray.fromhex(
+    "fd1f0000d201010100000fdc30130f8020120b8110031a000200730000000000000000000000000060b166"
+)
+
+VIBRATION_PACKET = bytearray.fromhex(
+    "fd1400000b0101f1000003e642000000000080918c3cfa4b3b3c0b44ce3cc4be"
+)
+
+STREAM = (
+    bytes.fromhex("0001022a")
+    + HEARTBEAT_PACKET
+    + SYS_STATUS_PACKET
+    + bytes.fromhex("55aa")
+    + COMMAND_LONG_PACKET
+    + STATUSTEXT_PACKET
+    + BATTERY_STATUS_PACKET
+    + bytes.fromhex("ff")
+    + VIBRATION_PACKET
+)
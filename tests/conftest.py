@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# Keep the definitions cache of test runs out of the user's cache directory.
+# Set before the definitions package is imported, which reads it once.
+_cache_path = tempfile.mkdtemp(prefix="logic2-mavlink-cache-")
+os.environ["MAVLINK_DEFINITIONS_CACHE"] = _cache_path
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_cache_path, ignore_errors=True)
@@ -0,0 +1,173 @@
+import pytest
+from mavlink_analysis import CorrelationKind, RequestCorrelator
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser
+from mavlink_parser.encoder import MAVLink2Encoder
+
+# Command id no MAV_CMD entry uses, shown as a number
+UNNAMED_COMMAND = 65000
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+@pytest.fixture
+def gcs(definitions):
+    return MAVLink2Encoder(definitions, system_id=255, component_id=190)
+
+
+@pytest.fixture
+def vehicle(definitions):
+    return MAVLink2Encoder(definitions, system_id=1, component_id=1)
+
+
+def feed(definitions, correlator, timed_frames):
+    correlations = []
+    for time, frame in timed_frames:
+        for packet in MAVLinkParser(definitions).feed(frame):
+            correlations += correlator.add(packet, time)
+    return correlations
+
+
+def command(encoder, command=UNNAMED_COMMAND, target_component=1):
+    return encoder.encode(
+        "COMMAND_LONG",
+        {"target_system": 1, "target_component": target_component, "command": command},
+    )
+
+
+def ack(encoder, command=UNNAMED_COMMAND, result="MAV_RESULT_ACCEPTED"):
+    return encoder.encode("COMMAND_ACK", {"command": command, "result": result})
+
+
+def test_command_round_trip(definitions, gcs, vehicle):
+    correlator = RequestCorrelator()
+
+    correlations = feed(
+        definitions,
+        correlator,
+        [(0.0, command(gcs)), (0.1, command(gcs)), (0.15, ack(vehicle))],
+    )
+
+    assert len(correlations) == 1
+    correlation = correlations[0]
+    assert correlation.kind == CorrelationKind.RESPONSE
+    assert correlation.round_trip == pytest.approx(0.05)
+    assert correlation.request.retries == 1
+    summary = correlation.summary()
+    assert summary["request"] == "COMMAND_LONG 65000"
+    assert summary["route"] == "255:190 -> 1:1"
+    assert summary["round_trip"] == "50.0 ms"
+    assert summary["result"] == "MAV_RESULT_ACCEPTED"
+    assert not correlator.pending
+
+
+def test_broadcast_and_in_progress(definitions, gcs, vehicle):
+    correlator = RequestCorrelator(timeout=1.0)
+
+    correlations = feed(
+        definitions,
+        correlator,
+        [
+            (0.0, command(gcs, target_component=0)),
+            (0.8, ack(vehicle, result="MAV_RESULT_IN_PROGRESS")),
+            (1.5, ack(vehicle)),
+        ],
+    )
+
+    assert [correlation.result for correlation in correlations] == [
+        "MAV_RESULT_IN_PROGRESS",
+        "MAV_RESULT_ACCEPTED",
+    ]
+    assert correlations[1].round_trip == pytest.approx(1.5)
+
+
+def test_timeout(definitions, gcs, vehicle):
+    correlator = RequestCorrelator(timeout=0.5)
+
+    correlations = feed(
+        definitions,
+        correlator,
+        [
+            (0.0, command(gcs)),
+            (0.2, command(gcs, 400)),
+            (0.6, ack(vehicle, UNNAMED_COMMAND)),
+        ],
+    )
+
+    assert [correlation.kind for correlation in correlations] == [
+        CorrelationKind.TIMEOUT
+    ]
+    assert correlations[0].summary()["request"] == "COMMAND_LONG 65000"
+    expired = correlator.expire(0.7)
+    assert (
+        expired[0].summary()["request"] == "COMMAND_LONG MAV_CMD_COMPONENT_ARM_DISARM"
+    )
+
+
+def test_bounded_pending(definitions, gcs):
+    correlator = RequestCorrelator(timeout=100, max_pending=10)
+
+    correlations = feed(
+        definitions,
+        correlator,
+        [(index * 0.01, command(gcs, index)) for index in range(25)],
+    )
+
+    assert len(correlator.pending) == 10
+    assert correlator.evicted == 15
+    assert {correlation.kind for correlation in correlations} == {
+        CorrelationKind.EVICTED
+    }
+
+
+def test_parameters(definitions, gcs, vehicle):
+    correlator = RequestCorrelator()
+
+    def param_value(name, index):
+        return vehicle.encode(
+            "PARAM_VALUE",
+            {
+                "param_id": name,
+                "param_value": 1.5,
+                "param_count": 3,
+                "param_index": index,
+            },
+        )
+
+    correlations = feed(
+        definitions,
+        correlator,
+        [
+            (
+                0.0,
+                gcs.encode(
+                    "PARAM_REQUEST_READ",
+                    {"target_system": 1, "target_component": 1, "param_index": 2},
+                ),
+            ),
+            (
+                0.1,
+                gcs.encode(
+                    "PARAM_SET",
+                    {
+                        "target_system": 1,
+                        "target_component": 1,
+                        "param_id": "RATE_P",
+                        "param_value": 1.5,
+                    },
+                ),
+            ),
+            (0.2, param_value("RATE_P", 1)),
+            (0.3, param_value("RATE_I", 2)),
+        ],
+    )
+
+    assert [correlation.summary()["request"] for correlation in correlations] == [
+        "PARAM_SET RATE_P",
+        "PARAM_REQUEST_READ 2",
+    ]
+    assert correlations[0].result == "1.5"
+    assert correlations[1].round_trip == pytest.approx(0.3)
@@ -0,0 +1,182 @@
+import struct
+
+import pytest
+from mavlink_analysis import (
+    FtpReassembler,
+    MissionReassembler,
+    ParamReassembler,
+    TransferReassembler,
+)
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser
+from mavlink_parser.encoder import MAVLink2Encoder
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+@pytest.fixture
+def gcs(definitions):
+    return MAVLink2Encoder(definitions, system_id=255, component_id=190)
+
+
+@pytest.fixture
+def vehicle(definitions):
+    return MAVLink2Encoder(definitions, system_id=1, component_id=1)
+
+
+def feed(definitions, reassembler, timed_frames):
+    parser = MAVLinkParser(definitions)
+    transfers = []
+    for time, frame in timed_frames:
+        for packet in parser.feed(frame):
+            transfers += reassembler.add(packet, time)
+    return transfers
+
+
+def param_value(vehicle, index, count=4):
+    return vehicle.encode(
+        "PARAM_VALUE",
+        {
+            "param_id": f"PARAM_{index}",
+            "param_value": float(index),
+            "param_count": count,
+            "param_index": index,
+        },
+    )
+
+
+def test_param_list(definitions, gcs, vehicle):
+    frames = [
+        (0.0, gcs.encode("PARAM_REQUEST_LIST", {"target_system": 1})),
+        (0.1, param_value(vehicle, 0)),
+        (0.2, param_value(vehicle, 2)),
+        (0.3, param_value(vehicle, 2)),
+        (0.4, param_value(vehicle, 1)),
+        (0.5, param_value(vehicle, 3)),
+    ]
+
+    transfers = feed(definitions, ParamReassembler(), frames)
+
+    assert len(transfers) == 1
+    transfer = transfers[0]
+    assert transfer.result == "complete"
+    assert transfer.route == (1, 1, 255, 190)
+    assert transfer.duration == pytest.approx(0.5)
+    assert transfer.duplicates == 1
+    assert transfer.missing == 0
+    assert list(transfer.data) == ["PARAM_0", "PARAM_1", "PARAM_2", "PARAM_3"]
+    assert transfer.data["PARAM_3"] == 3.0
+    assert transfer.summary()["received"] == "4/4"
+
+
+def test_param_list_idle(definitions, vehicle):
+    reassembler = ParamReassembler(idle_timeout=1.0)
+    feed(definitions, reassembler, [(0.0, param_value(vehicle, 0, count=1000))])
+
+    assert reassembler.expire(0.5) == []
+    transfers = reassembler.expire(1.0)
+
+    assert transfers[0].result == "idle"
+    assert transfers[0].missing == 999
+
+
+def test_mission_upload(definitions, gcs, vehicle):
+    target = {"target_system": 1, "target_component": 1}
+    frames = [(0.0, gcs.encode("MISSION_COUNT", dict(target, count=3)))]
+    for sequence in (0, 2):
+        frames.append(
+            (
+                0.1 * (sequence + 1),
+                gcs.encode(
+                    "MISSION_ITEM_INT",
+                    dict(target, seq=sequence, x=sequence * 100, command=16),
+                ),
+            )
+        )
+    frames.append(
+        (
+            0.5,
+            vehicle.encode(
+                "MISSION_ACK",
+                {"target_system": 255, "target_component": 190, "type": 1},
+            ),
+        )
+    )
+
+    transfers = feed(definitions, MissionReassembler(), frames)
+
+    assert len(transfers) == 1
+    transfer = transfers[0]
+    assert transfer.route == (255, 190, 1, 1)
+    assert transfer.result == "MAV_MISSION_ERROR"
+    assert transfer.missing == 1
+    assert transfer.data[1] is None
+    assert transfer.data[2]["x"] == 200
+    assert transfer.duration == pytest.approx(0.5)
+
+
+def ftp(encoder, target, opcode, session=0, offset=0, data=b"", request_opcode=0):
+    header = struct.pack(
+        "<HBBBBBBI", 0, session, opcode, len(data), request_opcode, 0, 0, offset
+    )
+    return encoder.encode(
+        "FILE_TRANSFER_PROTOCOL",
+        {
+            "target_system": target[0],
+            "target_component": target[1],
+            "payload": list(header + data),
+        },
+    )
+
+
+def test_ftp_burst_read(definitions, gcs, vehicle):
+    content = bytes(range(256)) * 3
+    frames = [
+        (0.0, ftp(gcs, (1, 1), 4, data=b"@SYS/params.bin\x00")),
+        (0.1, ftp(vehicle, (255, 190), 128, 3, 0, struct.pack("<I", 768), 4)),
+        (0.2, ftp(gcs, (1, 1), 15, 3)),
+    ]
+    # Bursts in 239 byte chunks, one of them resent
+    for index, offset in enumerate([0, 239, 239, 478, 717]):
+        chunk = content[offset : offset + 239]
+        frames.append(
+            (0.3 + index * 0.1, ftp(vehicle, (255, 190), 128, 3, offset, chunk, 15))
+        )
+
+    transfers = feed(definitions, FtpReassembler(), frames)
+
+    assert len(transfers) == 1
+    transfer = transfers[0]
+    assert transfer.kind == "ftp @SYS/params.bin"
+    assert transfer.result == "complete"
+    assert transfer.data == content
+    assert transfer.duplicates == 1
+    assert transfer.summary()["received"] == "768/768"
+    assert transfer.duration == pytest.approx(0.7)
+
+
+def test_ftp_eof_with_gap(definitions, gcs, vehicle):
+    frames = [
+        (0.0, ftp(gcs, (1, 1), 4, data=b"log.bin")),
+        (0.1, ftp(vehicle, (255, 190), 128, 1, 0, struct.pack("<I", 500), 4)),
+        (0.2, ftp(vehicle, (255, 190), 128, 1, 0, bytes(200), 15)),
+        (0.3, ftp(vehicle, (255, 190), 128, 1, 300, bytes(200), 15)),
+        (0.4, ftp(vehicle, (255, 190), 129, 1, 0, bytes([6]), 15)),
+    ]
+
+    transfers = feed(definitions, FtpReassembler(), frames)
+
+    assert transfers[0].result == "complete"
+    assert transfers[0].missing == 100
+
+
+def test_combined_idle_expiry(definitions, vehicle):
+    reassembler = TransferReassembler(idle_timeout=1.0)
+    frames = [(0.0, param_value(vehicle, 0)), (2.0, param_value(vehicle, 1, 2))]
+
+    transfers = feed(definitions, reassembler, frames)
+
+    assert [transfer.result for transfer in transfers] == ["idle"]
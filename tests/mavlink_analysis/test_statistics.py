@@ -0,0 +1,85 @@
+import pytest
+from mavlink_analysis import LinkStatistics
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser
+from mavlink_parser.encoder import MAVLink2Encoder
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+def packets(definitions, count, message="ATTITUDE", system_id=1):
+    encoder = MAVLink2Encoder(definitions, system_id=system_id)
+    data = b"".join(encoder.encode(message, {"roll": 1.0}) for _ in range(count))
+    return MAVLinkParser(definitions).feed(data)
+
+
+def test_sequence_gaps(definitions):
+    statistics = LinkStatistics()
+    sent = packets(definitions, 300)
+    received = sent[:10] + sent[15:100] + [sent[99]] + sent[100:]
+    for index, packet in enumerate(received):
+        statistics.add(packet, index * 0.1)
+
+    stream = statistics.streams[(1, 1)]
+    assert stream.lost == 5
+    assert stream.duplicates == 1
+    assert stream.reordered == 0
+    assert stream.drop_rate == pytest.approx(5 / 301)
+
+
+def test_reordered(definitions):
+    statistics = LinkStatistics()
+    sent = packets(definitions, 10)
+    for index, packet in enumerate(sent[:5] + [sent[3]] + sent[5:]):
+        statistics.add(packet, index * 0.1)
+
+    stream = statistics.streams[(1, 1)]
+    assert stream.reordered == 1
+
+
+def test_rates_and_jitter(definitions):
+    statistics = LinkStatistics(buckets=5)
+    attitude = packets(definitions, 200)
+    heartbeat = packets(definitions, 20, "HEARTBEAT", system_id=2)
+    for index, packet in enumerate(attitude):
+        # 20 Hz with every other packet 10 ms late
+        statistics.add(packet, index * 0.05 + (index % 2) * 0.01)
+    for index, packet in enumerate(heartbeat):
+        statistics.add(packet, index * 0.5)
+
+    stream = statistics.streams[(1, 1)]
+    message = stream.messages[30]
+    assert stream.packets_window.rate(10) == pytest.approx(20)
+    assert stream.bytes_window.rate(10) == pytest.approx(20 * len(attitude[0].raw))
+    assert message.jitter == pytest.approx(0.02, abs=0.001)
+    assert statistics.link_usage(10) == pytest.approx(
+        20 * len(attitude[0].raw) + 2 * len(heartbeat[0].raw)
+    )
+
+
+def test_poll_summary(definitions):
+    statistics = LinkStatistics(summary_interval=1.0)
+    summaries = []
+    for index, packet in enumerate(packets(definitions, 50)):
+        statistics.add(packet, index * 0.1)
+        summary = statistics.poll_summary(index * 0.1, lambda id: f"id{id}")
+        if summary is not None:
+            summaries.append(summary)
+
+    assert len(summaries) == 4
+    link, stream = summaries[-1]
+    assert link["stream"] == "link"
+    assert stream["stream"] == "1:1"
+    assert stream["drop_rate"] == "0.0%"
+    # 41 packets in the first 4 seconds
+    assert stream["messages"] == "id30 10.2 Hz ±0.0 ms"
+
+
+def test_summaries_off(definitions):
+    statistics = LinkStatistics()
+    statistics.add(packets(definitions, 1)[0], 0.0)
+
+    assert statistics.poll_summary(100.0) is None
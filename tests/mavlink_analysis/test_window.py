@@ -0,0 +1,44 @@
+import pytest
+from mavlink_analysis import WindowedCounter
+
+
+def test_rate_over_window():
+    counter = WindowedCounter(buckets=4, bucket_seconds=0.5)
+    for index in range(40):
+        counter.add(index * 0.1)
+
+    # Buckets from 2.0 s on
+    assert counter.total(3.95) == 20
+    assert counter.rate(3.95) == pytest.approx(20 / 1.95)
+
+
+def test_young_counter_rate():
+    counter = WindowedCounter(buckets=10)
+    counter.add(0.5, 5)
+
+    assert counter.rate(0.5) == 0
+    assert counter.rate(1.5) == 5
+
+
+def test_old_amounts_expire():
+    counter = WindowedCounter(buckets=3)
+    counter.add(0, 7)
+    counter.add(1, 1)
+
+    assert counter.total(2.5) == 8
+    assert counter.total(3.5) == 1
+    assert counter.total(100) == 0
+
+
+def test_late_amounts():
+    counter = WindowedCounter(buckets=3)
+    counter.add(5)
+    counter.add(4)
+    counter.add(1)
+
+    assert counter.total(5) == 2
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        WindowedCounter(buckets=0)
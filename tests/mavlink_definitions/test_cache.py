@@ -0,0 +1,77 @@
+import os
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_definitions import cache
+from mavlink_definitions.cache import load_definitions
+
+
+def test_definitions_cache_created(tmp_path):
+    definitions = MAVLinkDefinitions(cache_path=str(tmp_path))
+    definitions.init()
+
+    assert os.listdir(tmp_path) == ["common.xml.pickle"]
+    cached = load_definitions("common.xml", str(tmp_path))
+    assert cached is not None
+    messages, enums = cached
+    assert any(message.name == "HEARTBEAT" for message in messages)
+    assert any(enum.name == "MAV_TYPE" for enum in enums)
+
+
+def test_definitions_loaded_from_cache(tmp_path, monkeypatch):
+    MAVLinkDefinitions(cache_path=str(tmp_path)).init()
+
+    def fail_parse(self, filename: str):
+        raise AssertionError("definitions parsed instead of loaded from cache")
+
+    monkeypatch.setattr(
+        "mavlink_definitions.definitions.MAVLinkDefinitionsParser.parse", fail_parse
+    )
+    definitions = MAVLinkDefinitions(cache_path=str(tmp_path))
+    message = definitions.get_message("HEARTBEAT")
+    assert message is not None
+    assert message.id == 0
+    assert len(message.fields) == 6
+    enum = definitions.get_enum("MAV_MODE_FLAG")
+    assert enum is not None
+    assert enum.bitmask
+
+
+def test_definitions_cache_stale(tmp_path, monkeypatch):
+    MAVLinkDefinitions(cache_path=str(tmp_path)).init()
+    assert load_definitions("common.xml", str(tmp_path)) is not None
+
+    get_sources_state = cache.get_sources_state
+
+    def touched_sources_state(filenames):
+        state = get_sources_state(filenames)
+        return {name: (mtime + 1, size) for name, (mtime, size) in state.items()}
+
+    monkeypatch.setattr(cache, "get_sources_state", touched_sources_state)
+    assert load_definitions("common.xml", str(tmp_path)) is None
+
+
+def test_definitions_cache_disabled(tmp_path):
+    definitions = MAVLinkDefinitions(cache_path=None)
+
+    assert definitions.get_message("HEARTBEAT") is not None
+    assert os.listdir(tmp_path) == []
+
+
+def test_definitions_cache_for_path(tmp_path):
+    definitions_path = tmp_path / "definitions"
+    definitions_path.mkdir()
+    dialect = definitions_path / "custom.xml"
+    dialect.write_text('<?xml version="1.0"?><mavlink><messages/></mavlink>')
+    cache_path = tmp_path / "cache"
+
+    MAVLinkDefinitions(str(dialect), cache_path=str(cache_path)).init()
+
+    assert os.listdir(definitions_path) == ["custom.xml"]
+    (cached,) = os.listdir(cache_path)
+    assert cached.startswith("custom.xml-") and cached.endswith(".pickle")
+    assert load_definitions(str(dialect), str(cache_path)) == ([], [])
+
+
+def test_tests_use_temporary_cache():
+    assert (
+        cache.MAVLINK_DEFINITION_CACHE_PATH == os.environ["MAVLINK_DEFINITIONS_CACHE"]
+    )
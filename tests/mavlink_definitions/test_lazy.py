@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from mavlink_definitions import MAVLinkDefinitions, get_shared_definitions
+from mavlink_definitions.index import MAVLinkDefinitionsIndex, index_file
+from mavlink_definitions.parser import MAVLinkDefinitionsParser
+
+DIALECT = """<?xml version="1.0"?>
+<mavlink>
+  <include>minimal.xml</include>
+  <enums>
+    <!-- <enum name="COMMENTED_OUT"><entry value="0" name="NONE"/></enum> -->
+    <enum name="LAZY_STATE">
+      <entry value="1" name="LAZY_STATE_ON"/>
+    </enum>
+  </enums>
+  <messages>
+    <message id="0" name="HEARTBEAT_OVERRIDE">
+      <field type="uint8_t" name="type">Type</field>
+    </message>
+    <message id="500" name="LAZY_TEST">
+      <field type="uint16_t" name="value" enum="LAZY_STATE">Value</field>
+    </message>
+  </messages>
+</mavlink>
+"""
+
+
+def as_tuple(value):
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [as_tuple(item) for item in value]
+    return tuple(
+        as_tuple(getattr(value, name)) if name == "fields" else getattr(value, name)
+        for name in type(value).__slots__
+    )
+
+
+def test_lazy_matches_eager():
+    eager = MAVLinkDefinitions("common.xml", cache_path=None)
+    lazy = MAVLinkDefinitions("common.xml", cache_path=None, lazy=True)
+    parser = MAVLinkDefinitionsParser()
+    parser.parse("common.xml")
+
+    for message in parser.messages:
+        assert as_tuple(lazy.get_message(message.id)) == as_tuple(
+            eager.get_message(message.id)
+        )
+        assert as_tuple(lazy.get_message(message.name)) == as_tuple(
+            eager.get_message(message.name)
+        )
+    for enum in parser.enums:
+        assert as_tuple(lazy.get_enum(enum.name)) == as_tuple(eager.get_enum(enum.name))
+
+
+def test_lazy_builds_on_demand():
+    definitions = MAVLinkDefinitions("common.xml", cache_path=None, lazy=True)
+    definitions.init()
+    assert definitions._messages == {}
+
+    heartbeat = definitions.get_message(0)
+    assert heartbeat is not None
+    assert definitions.get_message("HEARTBEAT") is heartbeat
+    assert list(definitions._messages) == [0, "HEARTBEAT"]
+    assert definitions._enums == {}
+
+
+def test_lazy_unknown():
+    definitions = MAVLinkDefinitions("common.xml", cache_path=None, lazy=True)
+
+    assert definitions.get_message(65000) is None
+    assert definitions.get_message("NOT_A_MESSAGE") is None
+    assert definitions.get_enum("NOT_AN_ENUM") is None
+
+
+def test_index_skips_comments_and_overrides_includes(tmp_path):
+    # An absolute path is kept as is when joined with the definitions path
+    dialect = tmp_path / "lazy.xml"
+    dialect.write_text(DIALECT)
+    file_index = index_file(str(dialect))
+    assert [name for name, _, _ in file_index.enums] == ["LAZY_STATE"]
+    assert [(id, name) for id, name, _, _ in file_index.messages] == [
+        (0, "HEARTBEAT_OVERRIDE"),
+        (500, "LAZY_TEST"),
+    ]
+
+    index = MAVLinkDefinitionsIndex()
+    index.index(str(dialect))
+    assert "MAV_TYPE" in index.enums
+    assert "COMMENTED_OUT" not in index.enums
+    assert index.build_message(index.message_ids[0]).name == "HEARTBEAT_OVERRIDE"
+    message = index.build_message(index.message_names["LAZY_TEST"])
+    assert message.fields[0].enum == "LAZY_STATE"
+    assert index.build_enum(index.enums["LAZY_STATE"]).values == {1: "LAZY_STATE_ON"}
+
+
+def test_shared_lazy_definitions():
+    lazy = get_shared_definitions("common.xml", lazy=True)
+
+    assert get_shared_definitions("common.xml", lazy=True) is lazy
+    assert get_shared_definitions("common.xml") is not lazy
+    assert lazy.get_message("HEARTBEAT") is not None
+
+
+def test_lazy_concurrent_first_lookups():
+    definitions = MAVLinkDefinitions("common.xml", cache_path=None, lazy=True)
+    definitions.init()
+    barrier = threading.Barrier(8)
+
+    def lookup(key):
+        barrier.wait()
+        return definitions.get_message(key), definitions.get_enum("MAV_TYPE")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lookup, [0, "HEARTBEAT"] * 4))
+
+    assert all(message is results[0][0] for message, _ in results)
+    assert all(enum is results[0][1] for _, enum in results)
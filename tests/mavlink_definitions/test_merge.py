@@ -0,0 +1,204 @@
+import pytest
+from mavlink_definitions import MAVLinkDefinitions, MAVLinkEnum, get_shared_definitions
+from mavlink_definitions.merge import merge_enum
+
+CUSTOM_DIALECT = """<?xml version="1.0"?>
+<mavlink>
+  <include>minimal.xml</include>
+  <enums>
+    <enum name="MAV_TYPE">
+      <entry value="0" name="MAV_TYPE_GENERIC"/>
+      <entry value="100" name="MAV_TYPE_CUSTOM"/>
+    </enum>
+    <enum name="CUSTOM_STATE">
+      <entry value="1" name="CUSTOM_STATE_ON"/>
+    </enum>
+  </enums>
+  <messages>
+    <message id="0" name="CUSTOM_HEARTBEAT">
+      <field type="uint8_t" name="type">Type</field>
+    </message>
+    <message id="500" name="CUSTOM_STATUS">
+      <field type="uint8_t" name="state" enum="CUSTOM_STATE">State</field>
+    </message>
+  </messages>
+</mavlink>
+"""
+
+
+CLASHING_ENUM_DIALECT = """<?xml version="1.0"?>
+<mavlink>
+  <enums>
+    <enum name="MAV_TYPE">
+      <entry value="2" name="MAV_TYPE_HELICOPTER"/>
+      <entry value="101" name="MAV_TYPE_EXTRA"/>
+    </enum>
+  </enums>
+</mavlink>
+"""
+
+
+MESSAGE_DIALECT = """<?xml version="1.0"?>
+<mavlink>
+  <messages>
+    <message id="42000" name="VENDOR_STATUS">
+      <description>{description}</description>
+      <field type="{type}" name="value">Value</field>
+    </message>
+  </messages>
+</mavlink>
+"""
+
+
+def write_dialect(path, description: str, type: str = "uint8_t") -> str:
+    path.write_text(MESSAGE_DIALECT.format(description=description, type=type))
+    return str(path)
+
+
+@pytest.fixture
+def custom_dialect(tmp_path):
+    # An absolute path is kept as is when joined with the definitions path
+    path = tmp_path / "custom.xml"
+    path.write_text(CUSTOM_DIALECT)
+    return str(path)
+
+
+def conflicts(definitions: MAVLinkDefinitions):
+    return sorted(
+        (conflict.kind, str(conflict.key), conflict.dialect)
+        for conflict in definitions.conflicts
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_earlier_dialect_wins(custom_dialect, lazy):
+    definitions = MAVLinkDefinitions(
+        ["common.xml", custom_dialect], cache_path=None, lazy=lazy
+    )
+
+    assert definitions.get_message(0).name == "HEARTBEAT"
+    assert definitions.get_message("CUSTOM_HEARTBEAT") is None
+    assert definitions.get_message(500).name == "CUSTOM_STATUS"
+    assert definitions.get_message("PARAM_VALUE").id == 22
+    assert definitions.get_enum("CUSTOM_STATE").values == {1: "CUSTOM_STATE_ON"}
+    assert conflicts(definitions) == [("message id", "0", "common.xml")]
+    assert all(
+        conflict.conflicting_dialect == custom_dialect
+        for conflict in definitions.conflicts
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_precedence_follows_order(custom_dialect, lazy):
+    definitions = MAVLinkDefinitions(
+        [custom_dialect, "common.xml"], cache_path=None, lazy=lazy
+    )
+
+    assert definitions.get_message(0).name == "CUSTOM_HEARTBEAT"
+    assert definitions.get_message("HEARTBEAT") is None
+    assert conflicts(definitions) == [("message id", "0", custom_dialect)]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("order", [1, -1])
+def test_merge_extended_enum(custom_dialect, lazy, order):
+    dialects = ["common.xml", custom_dialect][::order]
+    definitions = MAVLinkDefinitions(dialects, cache_path=None, lazy=lazy)
+
+    values = definitions.get_enum("MAV_TYPE").values
+    assert values[0] == "MAV_TYPE_GENERIC"
+    assert values[2] == "MAV_TYPE_QUADROTOR"
+    assert values[100] == "MAV_TYPE_CUSTOM"
+    assert ("enum", "MAV_TYPE") not in [
+        (conflict.kind, conflict.key) for conflict in definitions.conflicts
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_enum_clash(tmp_path, lazy):
+    path = tmp_path / "clash.xml"
+    path.write_text(CLASHING_ENUM_DIALECT)
+
+    definitions = MAVLinkDefinitions(
+        ["common.xml", str(path)], cache_path=None, lazy=lazy
+    )
+
+    values = definitions.get_enum("MAV_TYPE").values
+    assert values[2] == "MAV_TYPE_QUADROTOR"
+    assert values[101] == "MAV_TYPE_EXTRA"
+    assert conflicts(definitions) == [("enum", "MAV_TYPE", "common.xml")]
+
+
+def make_enum(values) -> MAVLinkEnum:
+    enum = MAVLinkEnum()
+    enum.name = "STATE"
+    enum.values = values
+    return enum
+
+
+def test_merge_enum_keeps_inputs():
+    enum = make_enum({0: "STATE_OFF"})
+    other = make_enum({0: "STATE_IDLE", 1: "STATE_ON"})
+
+    merged, clash = merge_enum(enum, other)
+
+    assert merged.values == {0: "STATE_OFF", 1: "STATE_ON"}
+    assert clash
+    assert enum.values == {0: "STATE_OFF"}
+    assert merge_enum(enum, make_enum({0: "STATE_OFF"})) == (enum, False)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_shared_include_is_not_a_conflict(lazy):
+    definitions = MAVLinkDefinitions(
+        ["common.xml", "minimal.xml"], cache_path=None, lazy=lazy
+    )
+
+    assert definitions.conflicts == []
+    assert definitions.get_message("HEARTBEAT") is not None
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_ignores_descriptions(tmp_path, lazy):
+    first = write_dialect(tmp_path / "first.xml", "Status of the vendor")
+    second = write_dialect(tmp_path / "second.xml", "Vendor status, updated")
+
+    definitions = MAVLinkDefinitions([first, second], cache_path=None, lazy=lazy)
+
+    assert definitions.conflicts == []
+    assert definitions.get_message(42000).name == "VENDOR_STATUS"
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_merge_reports_definition_once(tmp_path, lazy):
+    first = write_dialect(tmp_path / "first.xml", "Status")
+    second = write_dialect(tmp_path / "second.xml", "Status", type="uint16_t")
+
+    definitions = MAVLinkDefinitions([first, second], cache_path=None, lazy=lazy)
+
+    assert conflicts(definitions) == [("message id", "42000", first)]
+    assert definitions.get_message("VENDOR_STATUS").fields[0].type == "uint8_t"
+
+
+def test_lazy_merge_builds_only_contested(custom_dialect):
+    definitions = MAVLinkDefinitions(
+        ["common.xml", custom_dialect], cache_path=None, lazy=True
+    )
+    definitions.init()
+
+    assert definitions._index is not None
+    built = sorted(item.name for item in definitions._index._built.values())
+    assert built == ["CUSTOM_HEARTBEAT", "HEARTBEAT", "MAV_TYPE", "MAV_TYPE"]
+
+
+def test_merge_no_dialects():
+    with pytest.raises(ValueError):
+        MAVLinkDefinitions([])
+
+
+def test_shared_merged_definitions():
+    definitions = get_shared_definitions(["common.xml", "minimal.xml"])
+
+    assert get_shared_definitions(("common.xml", "minimal.xml")) is definitions
+    assert get_shared_definitions(["minimal.xml", "common.xml"]) is not definitions
+    assert get_shared_definitions("common.xml") is not definitions
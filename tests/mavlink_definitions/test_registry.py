@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+from mavlink_definitions import get_shared_definitions
+from mavlink_definitions.parser import MAVLinkDefinitionsFile, MAVLinkDefinitionsParser
+
+
+def test_shared_definitions_reused():
+    definitions = get_shared_definitions("common.xml")
+
+    assert get_shared_definitions("common.xml") is definitions
+    assert definitions.get_message("HEARTBEAT") is not None
+
+
+def test_shared_definitions_threads():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(get_shared_definitions, ["common.xml"] * 32))
+
+    assert all(definitions is results[0] for definitions in results)
+
+
+def test_parser_reuses_include_files():
+    files: dict = {}
+    first = MAVLinkDefinitionsParser(files)
+    first.parse("common.xml")
+    assert "minimal.xml" in files
+    assert isinstance(files["minimal.xml"], MAVLinkDefinitionsFile)
+
+    second = MAVLinkDefinitionsParser(files)
+    second.parse("minimal.xml")
+    heartbeat = [message for message in second.messages if message.name == "HEARTBEAT"]
+    assert heartbeat == [
+        message for message in first.messages if message.name == "HEARTBEAT"
+    ]
+    assert second.parsed_files == {"minimal.xml"}
@@ -0,0 +1,13 @@
+from typing import List
+
+from mavlink_parser import MAVLink2Packet, MAVLink2Parser
+
+
+def parse_bytes(parser: MAVLink2Parser, data: bytes) -> List[MAVLink2Packet]:
+    """Feeds data one byte at a time and returns the packets completed."""
+    packets: List[MAVLink2Packet] = []
+    for byte in data:
+        result = parser.parse_byte(byte)
+        if isinstance(result, MAVLink2Packet):
+            packets.append(result)
+    return packets
@@ -1,10 +1,7 @@
 from typing import List, Union
 from mavlink_definitions import MAVLinkDefinitions
 from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult
-
-BATTERY_STATUS_PACKET = bytearray.fromhex(
-    "fd2900000c01019300000000000000000000ff7fffffffffffffffffffffffffffffffffffffffff0000000000ff00000000066f93"
-)
+from mavlink_samples import BATTERY_STATUS_PACKET
 
 
 def test_battery_status_raw():
@@ -0,0 +1,76 @@
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Packet, MAVLink2Parser, crc_extra, x25_crc
+from mavlink_samples import COMMAND_LONG_PACKET, HEARTBEAT_PACKET
+
+
+def corrupt(packet: bytes, index: int) -> bytes:
+    data = bytearray(packet)
+    data[index] ^= 0x01
+    return bytes(data)
+
+
+def test_x25_crc():
+    assert x25_crc(b"123456789") == 0x6F91
+    assert x25_crc(b"6789", x25_crc(b"12345")) == 0x6F91
+
+
+def test_crc_extra():
+    definitions = MAVLinkDefinitions()
+    expected = {
+        "HEARTBEAT": 50,
+        "SYS_STATUS": 124,
+        "COMMAND_LONG": 152,
+        "STATUSTEXT": 83,
+        "BATTERY_STATUS": 154,
+        "VIBRATION": 90,
+    }
+    for name, extra in expected.items():
+        message = definitions.get_message(name)
+        assert message is not None
+        assert crc_extra(message) == extra
+
+
+def test_valid_checksum():
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+    packets = parser.feed(HEARTBEAT_PACKET)
+
+    assert len(packets) == 1
+    assert packets[0].checksum_valid is True
+    assert parser.stats.packets == 1
+    assert parser.stats.checksum_errors == 0
+
+
+def test_invalid_checksum_dropped():
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+    packets = parser.feed(corrupt(HEARTBEAT_PACKET, 12) + COMMAND_LONG_PACKET)
+
+    assert len(packets) == 1
+    assert packets[0].raw == COMMAND_LONG_PACKET
+    assert parser.stats.packets == 1
+    assert parser.stats.checksum_errors == 1
+
+
+def test_invalid_checksum_flagged():
+    parser = MAVLink2Parser(MAVLinkDefinitions(), drop_invalid=False)
+    packets = parser.feed(corrupt(HEARTBEAT_PACKET, 12))
+
+    assert len(packets) == 1
+    assert packets[0].checksum_valid is False
+    assert packets[0].fields == {}
+    assert parser.stats.checksum_errors == 1
+
+
+def test_invalid_checksum_parse_byte():
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+    results = [parser.parse_byte(byte) for byte in corrupt(HEARTBEAT_PACKET, 12)]
+
+    assert not any(isinstance(result, MAVLink2Packet) for result in results)
+    assert parser.stats.checksum_errors == 1
+
+
+def test_unknown_message_not_validated():
+    parser = MAVLink2Parser()
+    packets = parser.feed(corrupt(HEARTBEAT_PACKET, 12))
+
+    assert len(packets) == 1
+    assert packets[0].checksum_valid is None
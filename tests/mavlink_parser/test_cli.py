@@ -0,0 +1,82 @@
+import io
+import json
+
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import StreamGenerator, TrafficSource
+from mavlink_parser.cli import DecodeOptions, OutputFormat, decode_file
+from mavlink_samples import STREAM
+
+
+def decode(path, **kwargs):
+    output = io.StringIO()
+    result = decode_file(str(path), output, **kwargs)
+    return output.getvalue(), result
+
+
+def test_jsonl(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(STREAM)
+
+    text, result = decode(path, options=DecodeOptions("common.xml"))
+
+    records = [json.loads(line) for line in text.splitlines()]
+    assert [record["message_id"] for record in records] == [0, 1, 76, 253, 147, 241]
+    assert records[0]["offset"] == 4
+    assert records[0]["message"] == "HEARTBEAT"
+    assert records[0]["fields"]["custom_mode"] == 4
+    assert result.packets == 6
+
+
+def test_csv(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(STREAM)
+
+    text, _ = decode(path, options=DecodeOptions("common.xml", OutputFormat.CSV))
+
+    lines = text.splitlines()
+    assert lines[0].startswith("offset,version,sequence")
+    assert len(lines) == 7
+
+
+def test_chunks_are_stitched_in_order(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(STREAM * 50)
+    options = DecodeOptions("common.xml")
+
+    sequential, _ = decode(path, options=options)
+    # Chunk boundaries fall inside packets
+    sharded, result = decode(path, options=options, jobs=3, chunk_size=1001)
+
+    assert sharded == sequential
+    assert result.packets == 300
+
+
+@pytest.mark.parametrize("definitions", ["common.xml", None])
+def test_chunks_match_sequential_on_generated_stream(tmp_path, definitions):
+    sources = [
+        TrafficSource("HEARTBEAT", 1, {"custom_mode": 4}),
+        TrafficSource("ATTITUDE", 50, {"roll": 0.5, "yaw": -1.5}),
+        TrafficSource("STATUSTEXT", 2, {"text": "Everything nominal"}, 1, 2),
+        TrafficSource("PARAM_VALUE", 10, {"param_id": "SYSID_THISMAV"}, 2, 1),
+    ]
+    generator = StreamGenerator(MAVLinkDefinitions(), sources, noise_ratio=0.02)
+    path = tmp_path / "capture.bin"
+    path.write_bytes(generator.generate(100000))
+    options = DecodeOptions(definitions)
+
+    sequential, expected = decode(path, options=options)
+    for chunk_size in [997, 1499, 4999]:
+        sharded, result = decode(path, options=options, jobs=2, chunk_size=chunk_size)
+        assert sharded == sequential
+        assert result.packets == expected.packets
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(b"")
+
+    text, result = decode(path, options=DecodeOptions())
+
+    assert text == ""
+    assert result.packets == 0
@@ -0,0 +1,76 @@
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser, MessageDecoder
+from mavlink_samples import STREAM
+
+np = pytest.importorskip("numpy")
+
+from mavlink_parser import ColumnarCollector  # noqa: E402
+from mavlink_parser.columnar import message_dtype  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+def collect(definitions, data: bytes) -> ColumnarCollector:
+    collector = ColumnarCollector(definitions)
+    packets = MAVLinkParser(definitions).feed(data)
+    collector.extend(packets, [float(index) for index in range(len(packets))])
+    return collector
+
+
+def test_dtype_matches_wire_layout(definitions):
+    for message_id in [0, 1, 76, 147, 241, 253]:
+        message = definitions.get_message(message_id)
+        decoder = MessageDecoder(definitions, message)
+        assert message_dtype(message).itemsize == decoder.size
+
+
+def test_columns_match_decoded_fields(definitions):
+    collector = collect(definitions, STREAM * 3)
+    expected = [
+        packet.fields.to_dict()
+        for packet in MAVLinkParser(definitions).feed(STREAM * 3)
+        if packet.message_id == 147
+    ]
+
+    columns = collector.columns(147)
+
+    assert len(columns) == 3
+    assert list(columns.timestamp) == [4.0, 10.0, 16.0]
+    assert columns.system_id.tolist() == [1, 1, 1]
+    assert columns.fields["voltages"].shape == (3, 10)
+    assert columns.fields["voltages"][0].tolist() == expected[0]["voltages"]
+    assert columns.fields["current_consumed"].tolist() == [
+        fields["current_consumed"] for fields in expected
+    ]
+
+
+def test_enum_mapping(definitions):
+    collector = collect(definitions, STREAM * 2)
+
+    raw = collector.columns(0)
+    mapped = collector.columns(0, map_enums=True)
+
+    assert raw.fields["type"].dtype == np.uint8
+    assert mapped.fields["type"].tolist() == ["MAV_TYPE_GROUND_ROVER"] * 2
+    assert mapped.fields["base_mode"][0] == ["MAV_MODE_FLAG_CUSTOM_MODE_ENABLED"]
+
+
+def test_all_columns(definitions):
+    collector = collect(definitions, STREAM)
+
+    columns = collector.all_columns()
+
+    assert list(columns) == [
+        "HEARTBEAT",
+        "SYS_STATUS",
+        "COMMAND_LONG",
+        "BATTERY_STATUS",
+        "VIBRATION",
+        "STATUSTEXT",
+    ]
+    assert columns["STATUSTEXT"].fields["text"][0] == b"ArduPilot Ready"
+    assert collector.packets_skipped == 0
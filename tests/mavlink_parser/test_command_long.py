@@ -1,10 +1,7 @@
 from typing import List, Union
 from mavlink_definitions import MAVLinkDefinitions
 from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult
-
-COMMAND_LONG_PACKET = bytearray.fromhex(
-    "fd200000b0ffbe4c00000000a0400080bb440000000000000000000000000000000000000000b70001be4966"
-)
+from mavlink_samples import COMMAND_LONG_PACKET
 
 
 def test_command_long_raw():
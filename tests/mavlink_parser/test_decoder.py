@@ -0,0 +1,58 @@
+from typing import Dict
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Parser, MessageDecoder
+from mavlink_parser.parse_field import FieldValue, fields_in_order, parse_field
+from mavlink_samples import STREAM
+
+
+def parse_fields(
+    definitions: MAVLinkDefinitions, message_id: int, payload: bytes
+) -> Dict[str, FieldValue]:
+    message = definitions.get_message(message_id)
+    assert message is not None
+    fields: Dict[str, FieldValue] = {}
+    data = memoryview(payload)
+    for field in fields_in_order(message.fields):
+        data, fields[field.name] = parse_field(definitions, field, data)
+    return fields
+
+
+def test_decoder_matches_parse_field():
+    definitions = MAVLinkDefinitions()
+    packets = MAVLink2Parser(definitions).feed(STREAM)
+    assert len(packets) == 6
+
+    for packet in packets:
+        expected = parse_fields(definitions, packet.message_id, packet.payload)
+        assert packet.fields == expected
+        assert list(packet.fields) == list(expected)
+
+
+def test_decoder_pads_truncated_payload():
+    definitions = MAVLinkDefinitions()
+    message = definitions.get_message("BATTERY_STATUS")
+    assert message is not None
+    decoder = MessageDecoder(definitions, message)
+
+    assert decoder.size == 54
+    fields = decoder.decode(bytes.fromhex("0a000000"))
+    assert fields["current_consumed"] == 10
+    assert fields["voltages"] == [0] * 10
+    assert fields["voltages_ext"] == [0] * 4
+    assert fields["charge_state"] == "MAV_BATTERY_CHARGE_STATE_UNDEFINED"
+
+
+def test_decoder_bitmask_results_are_independent():
+    definitions = MAVLinkDefinitions()
+    message = definitions.get_message("HEARTBEAT")
+    assert message is not None
+    decoder = MessageDecoder(definitions, message)
+    payload = bytes.fromhex("040000000a03810503")
+
+    first = decoder.decode(payload)
+    assert first["base_mode"] == [
+        "MAV_MODE_FLAG_CUSTOM_MODE_ENABLED",
+        "MAV_MODE_FLAG_SAFETY_ARMED",
+    ]
+    first["base_mode"].append("MODIFIED")  # type: ignore
+    assert decoder.decode(payload)["base_mode"] == first["base_mode"][:2]
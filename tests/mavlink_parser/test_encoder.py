@@ -0,0 +1,78 @@
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser
+from mavlink_parser.encoder import MAVLink2Encoder, pack_frame, truncate_payload
+from mavlink_parser.signing import compute_signature
+from mavlink_samples import STREAM
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+def test_decoded_fields_encode_to_the_same_frame(definitions):
+    for packet in MAVLinkParser(definitions).feed(STREAM):
+        encoder = MAVLink2Encoder(definitions, packet.system_id, packet.component_id)
+        frame = pack_frame(
+            packet.message_id,
+            encoder.get_encoder(packet.message_id).encode(packet.fields.to_dict()),
+            encoder.get_encoder(packet.message_id).crc_extra,
+            packet.sequence,
+            packet.system_id,
+            packet.component_id,
+        )
+        assert frame == packet.raw
+
+
+def test_encode(definitions):
+    encoder = MAVLink2Encoder(definitions, system_id=3, component_id=7)
+
+    frames = [
+        encoder.encode(
+            "HEARTBEAT",
+            {
+                "type": "MAV_TYPE_QUADROTOR",
+                "base_mode": ["MAV_MODE_FLAG_SAFETY_ARMED"],
+                "mavlink_version": 3,
+            },
+        )
+        for _ in range(2)
+    ]
+    packets = MAVLinkParser(definitions).feed(b"".join(frames))
+
+    assert [packet.sequence for packet in packets] == [0, 1]
+    assert packets[0].system_id == 3
+    assert packets[0].component_id == 7
+    assert packets[0].checksum_valid
+    assert packets[0].fields["type"] == "MAV_TYPE_QUADROTOR"
+    assert packets[0].fields["base_mode"] == ["MAV_MODE_FLAG_SAFETY_ARMED"]
+    assert packets[0].fields["custom_mode"] == 0
+
+
+def test_truncation(definitions):
+    encoder = MAVLink2Encoder(definitions)
+
+    frame = encoder.encode("ATTITUDE", {})
+
+    assert frame[1] == 1
+    assert truncate_payload(bytes(4)) == b"\x00"
+    packet = MAVLinkParser(definitions).feed(frame)[0]
+    assert packet.fields["roll"] == 0.0
+
+
+def test_signing(definitions):
+    key = bytes(range(32))
+    encoder = MAVLink2Encoder(definitions, signing_key=key, link_id=2)
+
+    first = encoder.encode("STATUSTEXT", {"text": "hello"}, timestamp=1000)
+    second = encoder.encode("STATUSTEXT", {"text": "hello"}, timestamp=1000)
+    packets = MAVLinkParser(definitions).feed(first + second)
+
+    assert [packet.fields["text"] for packet in packets] == ["hello", "hello"]
+    signature = packets[0].signature
+    assert signature[0] == 2
+    assert int.from_bytes(signature[1:7], "little") == 1000
+    assert int.from_bytes(packets[1].signature[1:7], "little") == 1001
+    frame = packets[0].raw[: -len(signature)]
+    assert signature[7:] == compute_signature(key, frame, 2, 1000)
@@ -0,0 +1,52 @@
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Parser, PacketFilter
+from mavlink_parser.filter import parse_id_list, parse_int_list
+from mavlink_samples import STREAM
+
+
+def message_ids(packet_filter: PacketFilter):
+    parser = MAVLink2Parser(MAVLinkDefinitions(), packet_filter=packet_filter)
+    return [packet.message_id for packet in parser.feed(STREAM)], parser.stats
+
+
+def test_include_messages():
+    ids, stats = message_ids(PacketFilter(include_messages=["COMMAND_LONG", 253]))
+
+    assert ids == [76, 253]
+    assert stats.packets == 2
+    assert stats.packets_filtered == 4
+
+
+def test_exclude_messages():
+    ids, _ = message_ids(PacketFilter(exclude_messages=["HEARTBEAT", "SYS_STATUS"]))
+
+    assert ids == [76, 253, 147, 241]
+
+
+def test_systems_and_components():
+    ids, _ = message_ids(PacketFilter(include_systems=[255]))
+    assert ids == [76]
+
+    ids, _ = message_ids(PacketFilter(exclude_components=[190]))
+    assert ids == [0, 1, 253, 147, 241]
+
+
+def test_unknown_message_name():
+    with pytest.raises(ValueError):
+        MAVLink2Parser(
+            MAVLinkDefinitions(), packet_filter=PacketFilter(include_messages=["NOPE"])
+        )
+
+
+def test_parse_id_list():
+    assert parse_id_list("") is None
+    assert parse_id_list(" , ") is None
+    assert parse_id_list("COMMAND_LONG, 77,0x4C") == ["COMMAND_LONG", 77, 76]
+
+
+def test_parse_int_list():
+    assert parse_int_list("") is None
+    assert parse_int_list("1, 0xFF,") == [1, 255]
+    with pytest.raises(ValueError, match="Invalid id=GCS"):
+        parse_int_list("1,GCS")
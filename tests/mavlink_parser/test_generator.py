@@ -0,0 +1,56 @@
+import io
+
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser
+from mavlink_parser.generator import StreamGenerator, TrafficSource
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+def test_rates_and_sequences(definitions):
+    generator = StreamGenerator(
+        definitions,
+        [
+            TrafficSource("HEARTBEAT", 1, {"type": "MAV_TYPE_QUADROTOR"}),
+            TrafficSource("ATTITUDE", 10, {"roll": 0.5}),
+            TrafficSource("VIBRATION", 5, system_id=2, signing_key=bytes(32)),
+        ],
+    )
+
+    packets = MAVLinkParser(definitions).feed(generator.generate(10000))
+
+    assert all(packet.checksum_valid for packet in packets)
+    counts = {}
+    for packet in packets:
+        counts[packet.message_id] = counts.get(packet.message_id, 0) + 1
+    assert 9 <= counts[30] / counts[0] <= 11
+    assert 1.5 <= counts[30] / counts[241] <= 2.5
+    # Both messages of system 1 share one sequence counter
+    sequences = [packet.sequence for packet in packets if packet.system_id == 1]
+    assert sequences[:300] == list(range(256)) + list(range(44))
+    signed = [packet for packet in packets if packet.message_id == 241]
+    assert all(len(packet.signature) == 13 for packet in signed)
+    timestamps = [int.from_bytes(p.signature[1:7], "little") for p in signed]
+    assert timestamps == sorted(set(timestamps))
+
+
+def test_write_matches_generate(definitions):
+    sources = [TrafficSource("ATTITUDE", 50), TrafficSource("HEARTBEAT", 1)]
+    output = io.BytesIO()
+
+    written = StreamGenerator(definitions, sources, noise_ratio=0.1).write(
+        output, 5000
+    )
+
+    expected = StreamGenerator(definitions, sources, noise_ratio=0.1).generate(5000)
+    assert written == len(expected)
+    assert output.getvalue() == expected
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        TrafficSource("HEARTBEAT", 0)
@@ -1,8 +1,7 @@
 from typing import List, Union
 from mavlink_definitions import MAVLinkDefinitions
 from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult
-
-HEARTBEAT_PACKET = bytearray.fromhex("fd090000cf0101000000040000000a030105037950")
+from mavlink_samples import HEARTBEAT_PACKET
 
 
 def test_heartbeat_raw():
@@ -0,0 +1,55 @@
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import LazyFields, MAVLink2Parser
+from mavlink_samples import COMMAND_LONG_PACKET, STATUSTEXT_PACKET
+
+
+def test_fields_decoded_on_access():
+    packets = MAVLink2Parser(MAVLinkDefinitions()).feed(COMMAND_LONG_PACKET)
+    assert len(packets) == 1
+    packet = packets[0]
+    fields = packet.fields
+    assert isinstance(fields, LazyFields)
+
+    assert packet.system_id == 0xFF
+    assert "target_system" in fields
+    assert "text" not in fields
+    assert len(fields) == 11
+    assert not fields.decoded
+
+    assert fields["command"] == "MAV_CMD_DO_SET_SERVO"
+    assert fields.decoded
+
+
+def test_get_fields_decodes_only_named():
+    packets = MAVLink2Parser(MAVLinkDefinitions()).feed(COMMAND_LONG_PACKET)
+    packet = packets[0]
+
+    targets = packet.get_fields(["target_system", "target_component", "text"])
+    assert targets == {"target_system": 1, "target_component": 0xBE}
+    assert packet.get_fields(["command", "param1"]) == {
+        "command": "MAV_CMD_DO_SET_SERVO",
+        "param1": 5.0,
+    }
+    assert isinstance(packet.fields, LazyFields)
+    assert not packet.fields.decoded
+
+    assert packet.fields["param2"] == 1500.0
+    assert packet.get_fields(["param2"]) == {"param2": 1500.0}
+
+
+def test_get_fields_truncated_payload():
+    packets = MAVLink2Parser(MAVLinkDefinitions()).feed(STATUSTEXT_PACKET)
+    packet = packets[0]
+
+    assert packet.get_fields(["text", "id", "chunk_seq"]) == {
+        "text": "ArduPilot Ready",
+        "id": 0,
+        "chunk_seq": 0,
+    }
+
+
+def test_get_fields_without_definitions():
+    packets = MAVLink2Parser().feed(COMMAND_LONG_PACKET)
+
+    assert packets[0].fields == {}
+    assert packets[0].get_fields(["target_system"]) == {}
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import socket
+
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import (
+    MAVLink2Parser,
+    MAVLinkDatagramProtocol,
+    MAVLinkStreamProtocol,
+    PacketBroadcaster,
+)
+from mavlink_parser.live import read_stream
+from mavlink_samples import STREAM
+
+MESSAGE_IDS = [0, 1, 76, 253, 147, 241]
+
+
+def frames():
+    return [packet.raw for packet in MAVLink2Parser().feed(STREAM)]
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+
+def test_udp_socket_pair():
+    async def main():
+        loop = asyncio.get_running_loop()
+        broadcaster = PacketBroadcaster()
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: MAVLinkDatagramProtocol(broadcaster, MAVLinkDefinitions()),
+            local_addr=("127.0.0.1", 0),
+        )
+        address = transport.get_extra_info("sockname")
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            raw = frames()
+            # The heartbeat is split over two datagrams
+            sender.sendto(raw[0][:5], address)
+            sender.sendto(raw[0][5:], address)
+            for frame in raw[1:]:
+                sender.sendto(frame, address)
+            received = [await first.get() for _ in raw]
+            assert [(await second.get())[1] for _ in raw] == [
+                packet for _, packet in received
+            ]
+        transport.close()
+        await asyncio.sleep(0)
+        assert [packet async for _, packet in first] == []
+        assert len(protocol.parsers) == 1
+        return received
+
+    received = run(main())
+
+    assert [packet.message_id for _, packet in received] == MESSAGE_IDS
+    assert received[0][1].fields["custom_mode"] == 4
+    assert received[0][1].raw == frames()[0]
+    assert all(isinstance(time, float) for time, _ in received)
+
+
+def test_stream_protocol_pipe():
+    async def main():
+        loop = asyncio.get_running_loop()
+        broadcaster = PacketBroadcaster()
+        subscription = broadcaster.subscribe()
+        read_fd, write_fd = os.pipe()
+        with open(read_fd, "rb", buffering=0) as pipe:
+            await loop.connect_read_pipe(
+                lambda: MAVLinkStreamProtocol(broadcaster), pipe
+            )
+            os.write(write_fd, STREAM[:50])
+            os.write(write_fd, STREAM[50:])
+            os.close(write_fd)
+            return [packet.message_id async for _, packet in subscription]
+
+    assert run(main()) == MESSAGE_IDS
+
+
+def test_read_stream():
+    async def main():
+        reader = asyncio.StreamReader()
+        reader.feed_data(STREAM)
+        reader.feed_eof()
+        broadcaster = PacketBroadcaster()
+        subscription = broadcaster.subscribe()
+        await read_stream(reader, broadcaster)
+        return [packet.message_id async for _, packet in subscription]
+
+    assert run(main()) == MESSAGE_IDS
+
+
+def test_slow_subscriber_drops_oldest():
+    async def main():
+        broadcaster = PacketBroadcaster()
+        slow = broadcaster.subscribe(maxsize=2)
+        fast = broadcaster.subscribe()
+        for index, packet in enumerate(MAVLink2Parser().feed(STREAM)):
+            broadcaster.publish(packet, float(index))
+        broadcaster.close()
+        assert broadcaster.subscribe().closed
+        return (
+            [time async for time, _ in slow],
+            slow.dropped,
+            [time async for time, _ in fast],
+            fast.dropped,
+        )
+
+    slow, slow_dropped, fast, fast_dropped = run(main())
+
+    assert slow == [4.0, 5.0]
+    assert slow_dropped == 4
+    assert fast == [float(index) for index in range(6)]
+    assert fast_dropped == 0
+
+
+def test_unsubscribed_consumer_is_skipped():
+    async def main():
+        broadcaster = PacketBroadcaster()
+        subscription = broadcaster.subscribe()
+        subscription.close()
+        packet = MAVLink2Parser().feed(STREAM)[0]
+        broadcaster.publish(packet, 0.0)
+        assert len(subscription) == 0
+        with pytest.raises(EOFError):
+            await subscription.get()
+
+    run(main())
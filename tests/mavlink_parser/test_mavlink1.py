@@ -0,0 +1,88 @@
+from typing import List, Union
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import (
+    MAVLink1Packet,
+    MAVLink1Parser,
+    MAVLink2Packet,
+    MAVLinkParser,
+    ParseResult,
+)
+from mavlink_samples import COMMAND_LONG_PACKET, HEARTBEAT_PACKET
+
+HEARTBEAT_V1_PACKET = bytearray.fromhex("fe09cf010100040000000a030105032699")
+ATTITUDE_V1_PACKET = bytearray.fromhex(
+    "fe1c2a01011ee8030000000000000000000000000000000000000000803f0000803fb0f2"
+)
+
+
+def test_heartbeat_v1_raw():
+    parser = MAVLink1Parser()
+    results: List[Union[MAVLink1Packet, ParseResult]] = []
+
+    for byte in HEARTBEAT_V1_PACKET:
+        result = parser.parse_byte(byte)
+        results.append(result)
+
+    assert results[0] == ParseResult.PACKET_STARTED
+    assert all(result is ParseResult.NONE for result in results[1:-1])
+    assert isinstance(results[-1], MAVLink1Packet)
+
+    packet = results[-1]
+    assert packet.raw == HEARTBEAT_V1_PACKET
+    assert packet.payload_length == 0x09
+    assert packet.sequence == 0xCF
+    assert packet.system_id == 0x01
+    assert packet.component_id == 0x01
+    assert packet.message_id == 0x00
+    assert packet.payload == bytearray.fromhex("040000000a03010503")
+    assert packet.checksum == 0x9926
+
+
+def test_attitude_v1_fields():
+    parser = MAVLink1Parser(MAVLinkDefinitions())
+    packets = parser.feed(ATTITUDE_V1_PACKET)
+
+    assert len(packets) == 1
+    packet = packets[0]
+    assert packet.checksum_valid is True
+    assert packet.fields["time_boot_ms"] == 1000
+    assert packet.fields["roll"] == 0
+    assert packet.fields["pitchspeed"] == 1.0
+    assert packet.fields["yawspeed"] == 1.0
+
+
+def test_mavlink1_parser_ignores_mavlink2():
+    parser = MAVLink1Parser(MAVLinkDefinitions())
+    packets = parser.feed(HEARTBEAT_PACKET + HEARTBEAT_V1_PACKET)
+
+    assert [packet.raw for packet in packets] == [HEARTBEAT_V1_PACKET]
+
+
+def test_mixed_stream():
+    stream = (
+        HEARTBEAT_V1_PACKET
+        + HEARTBEAT_PACKET
+        + bytes.fromhex("00fe01")
+        + ATTITUDE_V1_PACKET
+        + COMMAND_LONG_PACKET
+    )
+    parser = MAVLinkParser(MAVLinkDefinitions())
+    packets = parser.feed(stream)
+
+    assert [type(packet) for packet in packets] == [
+        MAVLink1Packet,
+        MAVLink2Packet,
+        MAVLink1Packet,
+        MAVLink2Packet,
+    ]
+    assert [packet.message_id for packet in packets] == [0, 0, 30, 76]
+    assert all(packet.checksum_valid for packet in packets)
+    assert packets[0].fields == packets[1].fields
+
+    byte_packets = []
+    byte_parser = MAVLinkParser(MAVLinkDefinitions())
+    for byte in stream:
+        result = byte_parser.parse_byte(byte)
+        if not isinstance(result, ParseResult):
+            byte_packets.append(result)
+    assert [packet.raw for packet in byte_packets] == [packet.raw for packet in packets]
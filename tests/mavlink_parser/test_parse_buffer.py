@@ -0,0 +1,72 @@
+from typing import List
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Parser, MAVLink2Packet
+from mavlink_samples import HEARTBEAT_PACKET, STREAM, SYS_STATUS_PACKET
+
+from .helpers import parse_bytes
+
+
+def parse_chunks(
+    parser: MAVLink2Parser, data: bytes, chunk_size: int
+) -> List[MAVLink2Packet]:
+    packets: List[MAVLink2Packet] = []
+    for start in range(0, len(data), chunk_size):
+        packets.extend(parser.parse_buffer(data[start : start + chunk_size]))
+    return packets
+
+
+def assert_same_packets(actual: List[MAVLink2Packet], expected: List[MAVLink2Packet]):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.offset == e.offset
+        assert a.raw == e.raw
+        assert a.payload_length == e.payload_length
+        assert a.incompatibility == e.incompatibility
+        assert a.compatibility == e.compatibility
+        assert a.sequence == e.sequence
+        assert a.system_id == e.system_id
+        assert a.component_id == e.component_id
+        assert a.message_id == e.message_id
+        assert a.payload == e.payload
+        assert a.checksum == e.checksum
+        assert a.signature == e.signature
+        assert a.fields == e.fields
+
+
+def test_parse_buffer_raw():
+    expected = parse_bytes(MAVLink2Parser(), STREAM)
+    assert len(expected) == 6
+
+    for chunk_size in [1, 2, 3, 7, 10, 64, len(STREAM)]:
+        actual = parse_chunks(MAVLink2Parser(), STREAM, chunk_size)
+        assert_same_packets(actual, expected)
+
+
+def test_parse_buffer_fields():
+    definitions = MAVLinkDefinitions()
+    expected = parse_bytes(MAVLink2Parser(definitions), STREAM)
+
+    for chunk_size in [1, 5, 33, len(STREAM)]:
+        actual = parse_chunks(MAVLink2Parser(definitions), STREAM, chunk_size)
+        assert_same_packets(actual, expected)
+
+
+def test_parse_buffer_keeps_partial_packet():
+    parser = MAVLink2Parser()
+
+    assert parser.feed(HEARTBEAT_PACKET[:5]) == []
+    assert parser.pending_offset == 0
+    packets = parser.feed(HEARTBEAT_PACKET[5:] + SYS_STATUS_PACKET[:1])
+    assert len(packets) == 1
+    assert packets[0].raw == HEARTBEAT_PACKET
+    assert parser.pending_offset == len(HEARTBEAT_PACKET)
+
+
+def test_parse_buffer_skips_noise():
+    parser = MAVLink2Parser()
+
+    assert parser.feed(bytes.fromhex("0001022a")) == []
+    assert parser.pending_offset is None
+    packets = parser.feed(HEARTBEAT_PACKET)
+    assert len(packets) == 1
+    assert packets[0].offset == 4
@@ -0,0 +1,76 @@
+import io
+
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLinkParser
+from mavlink_parser.cli import (
+    DecodeOptions,
+    OutputFormat,
+    decode_file,
+    pipeline_decode_file,
+)
+from mavlink_parser.pipeline import DecodePipeline, frame_batches
+from mavlink_samples import STREAM
+
+
+def test_frame_batches():
+    parser = MAVLinkParser(MAVLinkDefinitions())
+    chunks = [(STREAM * 5)[index : index + 7] for index in range(0, len(STREAM) * 5, 7)]
+
+    batches = list(frame_batches(parser, chunks, batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4] * 7 + [2]
+    offset, raw, checksum_valid = batches[0][0]
+    assert offset == 4
+    assert checksum_valid is True
+    packet = parser.unpack_frame(raw, offset, checksum_valid)
+    assert packet.message_id == 0
+    assert packet.fields["custom_mode"] == 4
+
+
+def test_unpack_frame_invalid():
+    parser = MAVLinkParser(MAVLinkDefinitions())
+    raw = next(frame_batches(parser, [STREAM]))[0][1]
+
+    with pytest.raises(ValueError):
+        parser.unpack_frame(raw[:-1])
+    with pytest.raises(ValueError):
+        parser.unpack_frame(b"")
+
+
+def test_pipeline_keeps_order_and_bounds_pending():
+    produced = []
+
+    def batches():
+        for index in range(20):
+            produced.append(index)
+            yield [(index, b"", None)]
+
+    pipeline = DecodePipeline(
+        lambda batch: batch[0][0], jobs=2, max_pending=3, use_threads=True
+    )
+    results = []
+    for result in pipeline.map(batches()):
+        # The framing stage is never more than max_pending batches ahead
+        assert len(produced) <= len(results) + 4
+        results.append(result)
+
+    assert results == list(range(20))
+
+
+@pytest.mark.parametrize("use_threads", [True, False])
+@pytest.mark.parametrize("output_format", list(OutputFormat))
+def test_pipeline_matches_sequential(tmp_path, use_threads, output_format):
+    path = tmp_path / "capture.bin"
+    path.write_bytes(STREAM * 50)
+    options = DecodeOptions("common.xml", output_format)
+    sequential = io.StringIO()
+    decode_file(str(path), sequential, options)
+
+    pipelined = io.StringIO()
+    result = pipeline_decode_file(
+        str(path), pipelined, options, jobs=2, batch_size=7, use_threads=use_threads
+    )
+
+    assert pipelined.getvalue() == sequential.getvalue()
+    assert result.packets == 300
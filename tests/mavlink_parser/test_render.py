@@ -0,0 +1,50 @@
+import json
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Parser, PacketRenderer, PayloadMode
+from mavlink_samples import COMMAND_LONG_PACKET, HEARTBEAT_PACKET
+
+
+def test_render_full():
+    definitions = MAVLinkDefinitions()
+    packets = MAVLink2Parser(definitions).feed(COMMAND_LONG_PACKET)
+    data = PacketRenderer(definitions).render(packets[0])
+
+    assert data["message"] == "COMMAND_LONG"
+    assert data["route"] == "255:190 -> 1:190"
+    assert data["system_id"] == "255"
+    assert data["component_id"] == "190"
+    assert json.loads(data["payload"]) == dict(packets[0].fields)
+
+
+def test_render_compact():
+    definitions = MAVLinkDefinitions()
+    packets = MAVLink2Parser(definitions).feed(HEARTBEAT_PACKET)
+    data = PacketRenderer(definitions, PayloadMode.COMPACT).render(packets[0])
+
+    assert data["route"] == "1:1"
+    assert data["payload"] == (
+        "custom_mode=4 type=MAV_TYPE_GROUND_ROVER"
+        " autopilot=MAV_AUTOPILOT_ARDUPILOTMEGA"
+        " base_mode=['MAV_MODE_FLAG_CUSTOM_MODE_ENABLED']"
+        " system_status=MAV_STATE_CRITICAL mavlink_version=3"
+    )
+
+
+def test_render_off_skips_decoding():
+    definitions = MAVLinkDefinitions()
+    packets = MAVLink2Parser(definitions).feed(COMMAND_LONG_PACKET)
+    data = PacketRenderer(definitions, PayloadMode.OFF).render(packets[0])
+
+    assert "payload" not in data
+    assert data["route"] == "255:190 -> 1:190"
+    assert not packets[0].fields.decoded  # type: ignore
+
+
+def test_render_unknown_message():
+    packets = MAVLink2Parser().feed(HEARTBEAT_PACKET)
+    renderer = PacketRenderer(None)
+    data = renderer.render(packets[0])
+
+    assert data["message"] == "id(0)"
+    assert data["payload"] == "{}"
+    assert renderer.render(packets[0])["route"] is data["route"]
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import MAVLink2Parser, MAVLinkParser
+from mavlink_samples import COMMAND_LONG_PACKET, HEARTBEAT_PACKET, STREAM
+
+from .helpers import parse_bytes
+
+# Start of a frame of a message missing from the definitions, claiming a
+# payload long enough to swallow the heartbeat behind it
+UNKNOWN_MESSAGE_HEADER = bytes.fromhex("fd2000000001010039300000")
+# Rest of the unknown frame after the heartbeat
+UNKNOWN_MESSAGE_TAIL = bytes(11)
+# Unknown frame ending in the middle of the heartbeat behind it
+SHORT_UNKNOWN_MESSAGE_HEADER = bytes.fromhex("fd0800000001010039300000")
+
+# HEARTBEAT header claiming a payload longer than the message can have
+BAD_LENGTH_HEADER = bytes.fromhex("fd400000000101000000")
+
+
+def test_resync_after_truncated_packet():
+    stream = HEARTBEAT_PACKET[:12] + COMMAND_LONG_PACKET
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+    packets = parser.feed(stream)
+
+    assert len(packets) == 1
+    assert packets[0].raw == COMMAND_LONG_PACKET
+    assert packets[0].offset == 12
+    assert parser.stats.checksum_errors == 1
+    assert parser.stats.packets_recovered == 1
+    assert parser.stats.bytes_skipped == 12
+
+
+def test_resync_after_bad_length():
+    stream = BAD_LENGTH_HEADER + HEARTBEAT_PACKET
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+    packets = parser.feed(stream)
+
+    assert len(packets) == 1
+    assert packets[0].raw == HEARTBEAT_PACKET
+    assert parser.stats.header_errors == 1
+    assert parser.stats.bytes_skipped == len(BAD_LENGTH_HEADER)
+
+
+def test_resync_disabled():
+    stream = HEARTBEAT_PACKET[:12] + COMMAND_LONG_PACKET + HEARTBEAT_PACKET
+    parser = MAVLink2Parser(MAVLinkDefinitions(), resync=False)
+    packets = parser.feed(stream)
+
+    assert [packet.message_id for packet in packets] == [0]
+    assert parser.stats.packets_recovered == 0
+
+
+def test_resync_parse_byte():
+    stream = HEARTBEAT_PACKET[:12] + COMMAND_LONG_PACKET + HEARTBEAT_PACKET
+    expected = MAVLink2Parser(MAVLinkDefinitions()).feed(stream)
+    packets = parse_bytes(MAVLink2Parser(MAVLinkDefinitions()), stream)
+
+    assert [packet.raw for packet in packets] == [packet.raw for packet in expected]
+    assert [packet.message_id for packet in packets] == [76, 0]
+
+
+def test_resync_inside_unknown_message():
+    stream = UNKNOWN_MESSAGE_HEADER + HEARTBEAT_PACKET + UNKNOWN_MESSAGE_TAIL
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+    packets = parser.feed(stream)
+
+    assert [packet.raw for packet in packets] == [HEARTBEAT_PACKET]
+    assert parser.stats.packets_recovered == 1
+    assert parser.stats.bytes_skipped == len(UNKNOWN_MESSAGE_HEADER) + len(
+        UNKNOWN_MESSAGE_TAIL
+    )
+
+
+def test_unknown_message_waits_for_hidden_frame():
+    stream = SHORT_UNKNOWN_MESSAGE_HEADER + HEARTBEAT_PACKET
+    parser = MAVLink2Parser(MAVLinkDefinitions())
+
+    assert parser.feed(stream[:25]) == []
+    assert [packet.raw for packet in parser.feed(stream[25:])] == [HEARTBEAT_PACKET]
+    packets = parse_bytes(MAVLink2Parser(MAVLinkDefinitions()), stream)
+    assert [packet.raw for packet in packets] == [HEARTBEAT_PACKET]
+
+
+@pytest.mark.parametrize("drop_invalid", [True, False])
+@pytest.mark.parametrize("parser_cls", [MAVLink2Parser, MAVLinkParser])
+def test_resync_noisy_stream(parser_cls, drop_invalid):
+    definitions = MAVLinkDefinitions()
+    frames = [packet.raw for packet in MAVLink2Parser(definitions).feed(STREAM)]
+    rng = random.Random(1)
+    stream = bytearray()
+    for _ in range(300):
+        for frame in frames:
+            stream += rng.randbytes(rng.randint(0, 20))
+            stream += frame
+
+    parser = parser_cls(definitions, drop_invalid=drop_invalid)
+    packets = parser.feed(bytes(stream))
+
+    assert [packet.raw for packet in packets if packet.checksum_valid] == (frames * 300)
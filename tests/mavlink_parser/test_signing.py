@@ -0,0 +1,104 @@
+import hashlib
+
+import pytest
+from mavlink_definitions import MAVLinkDefinitions
+from mavlink_parser import (
+    MAVLinkParser,
+    PacketRenderer,
+    SignatureStatus,
+    SignatureVerifier,
+)
+from mavlink_parser.encoder import MAVLink2Encoder
+from mavlink_parser.signing import parse_signing_keys
+from mavlink_samples import HEARTBEAT_PACKET
+
+KEY = bytes(range(32))
+OTHER_KEY = bytes(32)
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    return MAVLinkDefinitions()
+
+
+def signed_frame(definitions, key=KEY, timestamp=1000, system_id=1, link_id=0):
+    encoder = MAVLink2Encoder(
+        definitions, system_id=system_id, signing_key=key, link_id=link_id
+    )
+    return encoder.encode("STATUSTEXT", {"text": "armed"}, timestamp=timestamp)
+
+
+def verify(definitions, data, keys=(KEY,)):
+    parser = MAVLinkParser(
+        definitions, signature_verifier=SignatureVerifier(list(keys))
+    )
+    packets = parser.feed(data)
+    return [packet.signature_status for packet in packets], parser.stats
+
+
+def test_valid_and_replayed(definitions):
+    first = signed_frame(definitions, timestamp=1000)
+    second = signed_frame(definitions, timestamp=1001)
+
+    statuses, stats = verify(definitions, first + second + first)
+
+    assert statuses == [
+        SignatureStatus.VALID,
+        SignatureStatus.VALID,
+        SignatureStatus.REPLAYED,
+    ]
+    assert stats.packets_replayed == 1
+
+
+def test_replay_table_is_per_link_and_system(definitions):
+    data = (
+        signed_frame(definitions, timestamp=1000)
+        + signed_frame(definitions, timestamp=1000, system_id=2)
+        + signed_frame(definitions, timestamp=1000, link_id=1)
+    )
+
+    statuses, _ = verify(definitions, data)
+
+    assert statuses == [SignatureStatus.VALID] * 3
+
+
+def test_invalid_and_unsigned(definitions):
+    data = signed_frame(definitions, key=OTHER_KEY) + HEARTBEAT_PACKET
+
+    statuses, stats = verify(definitions, data)
+
+    assert statuses == [SignatureStatus.INVALID, SignatureStatus.UNSIGNED]
+    assert stats.signature_errors == 1
+
+
+def test_multiple_keys(definitions):
+    data = signed_frame(definitions, key=OTHER_KEY) + signed_frame(
+        definitions, timestamp=2000
+    )
+
+    statuses, _ = verify(definitions, data, keys=(KEY, OTHER_KEY))
+
+    assert statuses == [SignatureStatus.VALID, SignatureStatus.VALID]
+
+
+def test_verification_off(definitions):
+    packets = MAVLinkParser(definitions).feed(signed_frame(definitions))
+
+    assert packets[0].signature_status is None
+    assert "signature" not in PacketRenderer(definitions).render(packets[0])
+
+
+def test_render(definitions):
+    parser = MAVLinkParser(definitions, signature_verifier=SignatureVerifier([KEY]))
+    packets = parser.feed(signed_frame(definitions, key=OTHER_KEY))
+
+    assert PacketRenderer(definitions).render(packets[0])["signature"] == "invalid"
+
+
+def test_parse_signing_keys():
+    assert parse_signing_keys("") == []
+    assert parse_signing_keys(KEY.hex()) == [KEY]
+    assert parse_signing_keys(f" secret , {KEY.hex()}") == [
+        hashlib.sha256(b"secret").digest(),
+        KEY,
+    ]
@@ -1,10 +1,9 @@
 from typing import List, Union
 from mavlink_definitions import MAVLinkDefinitions
-from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult
-
-STATUSTEXT_PACKET = bytearray.fromhex(
-    "fd1000000d0101fd0000064172647550696c6f742052656164798f5b"
-)
+from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult, crc_extra
+from mavlink_parser.encoder import pack_frame
+from mavlink_parser.parse_field import fields_in_order, parse_field
+from mavlink_samples import STATUSTEXT_PACKET
 
 
 def test_statustext_raw():
@@ -50,3 +49,19 @@ def test_statustext_fields():
     assert packet.fields["text"] == "ArduPilot Ready"
     assert packet.fields["id"] == 0
     assert packet.fields["chunk_seq"] == 0
+
+
+def test_statustext_non_ascii():
+    definitions = MAVLinkDefinitions()
+    message = definitions.get_message("STATUSTEXT")
+    assert message is not None
+    # Severity, text and the id and chunk_seq extensions
+    payload = bytes([6]) + "Température".encode("latin-1").ljust(50, b"\0") + bytes(3)
+    frame = pack_frame(message.id, payload, crc_extra(message), 0, 1, 1)
+    packet = MAVLink2Parser(definitions).feed(frame)[0]
+
+    assert packet.fields["text"] == "Temp\ufffdrature"
+    text_field = list(fields_in_order(message.fields))[1]
+    assert text_field.name == "text"
+    _, text = parse_field(definitions, text_field, memoryview(payload)[1:])
+    assert text == "Temp\ufffdrature"
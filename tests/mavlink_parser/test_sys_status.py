@@ -1,10 +1,7 @@
 from typing import List, Union
 from mavlink_definitions import MAVLinkDefinitions
 from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult
-
-SYS_STATUS_PACKET = bytearray.fromhex(
-    "fd1f0000d201010100000fdc30130f8020120b8110031a000200730000000000000000000000000060b166"
-)
+from mavlink_samples import SYS_STATUS_PACKET
 
 
 def test_sys_status_raw():
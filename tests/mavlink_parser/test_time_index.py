@@ -0,0 +1,45 @@
+import pytest
+from mavlink_parser import ByteTimeIndex
+
+
+def test_single_byte_chunks():
+    index = ByteTimeIndex()
+    for offset in range(4):
+        index.add(offset, 1, offset * 1.0, offset * 1.0 + 0.5)
+
+    assert index.span(0, 1) == (0.0, 0.5)
+    assert index.span(1, 3) == (1.0, 3.5)
+
+
+def test_multi_byte_chunk_spread():
+    index = ByteTimeIndex()
+    index.add(10, 4, 2.0, 4.0)
+
+    assert index.span(10, 1) == (2.0, 2.5)
+    assert index.span(11, 2) == (2.5, 3.5)
+    assert index.span(13, 1) == (3.5, 4.0)
+
+
+def test_discard_before():
+    index = ByteTimeIndex()
+    index.add(0, 4, 0.0, 4.0)
+    index.discard_before(3)
+
+    assert len(index) == 1
+    assert index.base_offset == 3
+    assert index.span(3, 1) == (3.0, 4.0)
+    with pytest.raises(IndexError):
+        index.span(2, 1)
+
+    index.discard_before(10)
+    assert len(index) == 0
+    index.add(20, 1, 5.0, 6.0)
+    assert index.span(20, 1) == (5.0, 6.0)
+
+
+def test_non_contiguous_bytes():
+    index = ByteTimeIndex()
+    index.add(0, 2, 0.0, 1.0)
+
+    with pytest.raises(ValueError):
+        index.add(3, 1, 1.0, 2.0)
@@ -3,10 +3,7 @@ from typing import List, Union
 from pytest import approx
 from mavlink_definitions import MAVLinkDefinitions
 from mavlink_parser import MAVLink2Parser, MAVLink2Packet, ParseResult
-
-VIBRATION_PACKET = bytearray.fromhex(
-    "fd1400000b0101f1000003e642000000000080918c3cfa4b3b3c0b44ce3cc4be"
-)
+from mavlink_samples import VIBRATION_PACKET
 
 
 def test_vibration_raw():